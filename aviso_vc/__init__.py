@@ -1,9 +1,38 @@
-"""AvisoVC package exposing voice activity detection, transcription and API helpers."""
+"""AvisoVC package exposing voice activity detection, transcription and API helpers.
 
-from . import compat as _compat  # ensure dependency shims load before anything else
-from .config import Settings
-from .orchestrator import VoiceActivityWorkflow
-from .service import AudioEngine
-from .api import app as app
+Attributes are imported on first access, so ``from aviso_vc import Settings`` does
+not pull in torch, pyannote or the API server.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .api import app
+    from .config import Settings
+    from .orchestrator import VoiceActivityWorkflow
+    from .service import AudioEngine
+
+_LAZY_ATTRIBUTES = {
+    "Settings": ".config",
+    "VoiceActivityWorkflow": ".orchestrator",
+    "AudioEngine": ".service",
+    "app": ".api",
+}
 
 __all__ = ["Settings", "VoiceActivityWorkflow", "AudioEngine", "app"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+import math
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Set, Union
+
+from .results import ChunkResult, SessionState
+
+if TYPE_CHECKING:
+    from .config import Settings
+    from .service import AudioEngine
+
+STALE_CHUNK_POLICIES = {"off", "drop", "coalesce"}
+
+
+class Overloaded(Exception):
+    """The chunk was not admitted; the client should retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+@dataclass
+class _Chunk:
+    payload: Union[bytes, str]  # raw int16 PCM, or base64 of it
+    sample_rate: int
+    future: asyncio.Future
+    queued: float = field(default_factory=perf_counter)
+
+
+@dataclass
+class _Lane:
+    waiting: Deque[_Chunk] = field(default_factory=deque)
+    running: int = 0  # chunks currently being processed
+    draining: bool = False
+
+
+class IngestController:
+    """Admission control in front of ``AudioEngine`` for the asyncio API path.
+
+    Each session's chunks are queued in order and processed one call at a time
+    on a dedicated executor, so a slow session never holds more than one ingest
+    worker. A session with ``max_in_flight_per_session`` chunks waiting or in
+    progress, or a server with ``max_queued_chunks`` in total, gets
+    :class:`Overloaded` instead of an ever longer queue. While a session is
+    LISTENING its stale chunks are handled by ``stale_chunk_policy``:
+
+    - ``"coalesce"``: waiting chunks are merged into one engine call, so a session
+      that fell behind pays for one resample and VAD pass instead of one per chunk.
+    - ``"drop"``: over the limit, the oldest waiting chunk is answered without
+      being processed, making room for the new one.
+    - ``"off"``: chunks are processed one by one and over the limit are rejected.
+
+    Recording sessions are never coalesced or dropped, since that audio is
+    transcribed. All bookkeeping happens on the event loop thread, so no lock is
+    needed. Other blocking engine calls go through :meth:`call` on a separate
+    executor, so they cannot starve chunk ingestion.
+    """
+
+    def __init__(
+        self,
+        engine: "AudioEngine",
+        max_workers: int = 8,
+        control_workers: int = 4,
+        max_in_flight_per_session: int = 4,
+        max_queued_chunks: int = 256,
+        retry_after: float = 1.0,
+        stale_chunk_policy: str = "coalesce",
+    ) -> None:
+        if stale_chunk_policy not in STALE_CHUNK_POLICIES:
+            raise ValueError(f"stale_chunk_policy must be one of {sorted(STALE_CHUNK_POLICIES)}")
+        self.engine = engine
+        self.max_in_flight_per_session = max_in_flight_per_session
+        self.max_queued_chunks = max_queued_chunks
+        self.retry_after = retry_after
+        self.stale_chunk_policy = stale_chunk_policy
+        self._ingest = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._control = ThreadPoolExecutor(max_workers=control_workers, thread_name_prefix="control")
+        self._lanes: Dict[str, _Lane] = {}
+        self._admitted = 0
+        self._tasks: Set[asyncio.Task] = set()  # the loop only keeps weak references to tasks
+
+    @classmethod
+    def from_settings(cls, engine: "AudioEngine", settings: "Settings") -> "IngestController":
+        return cls(
+            engine,
+            max_workers=settings.ingest_workers,
+            control_workers=settings.control_workers,
+            max_in_flight_per_session=settings.max_in_flight_per_session,
+            max_queued_chunks=settings.max_queued_chunks,
+            retry_after=settings.ingest_retry_after,
+            stale_chunk_policy=settings.stale_chunk_policy,
+        )
+
+    async def submit(self, session_id: str, payload: Union[bytes, str], sample_rate: int) -> ChunkResult:
+        """Queue one chunk (raw int16 bytes or base64) and wait for its result."""
+        if self._admitted >= self.max_queued_chunks:
+            self._count("rejected")
+            raise Overloaded("Server is at capacity", self.retry_after)
+        lane = self._lanes.setdefault(session_id, _Lane())
+        if lane.running + len(lane.waiting) >= self.max_in_flight_per_session:
+            if self.stale_chunk_policy == "drop" and lane.waiting and self._listening(session_id):
+                stale = lane.waiting.popleft()
+                self._admitted -= 1
+                if not stale.future.done():
+                    stale.future.set_result(ChunkResult(state=SessionState.LISTENING, transcripts=[]))
+                self._count("dropped")
+            else:
+                self._count("rejected")
+                raise Overloaded("Too many chunks in flight for this session", self.retry_after)
+
+        chunk = _Chunk(payload=payload, sample_rate=sample_rate, future=asyncio.get_running_loop().create_future())
+        lane.waiting.append(chunk)
+        self._admitted += 1
+        if not lane.draining:
+            lane.draining = True
+            task = asyncio.ensure_future(self._drain(session_id, lane))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await chunk.future
+
+    async def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking engine call on the control executor."""
+        return await asyncio.get_running_loop().run_in_executor(self._control, fn, *args)
+
+    def gauges(self) -> Dict[str, float]:
+        return {"ingest_queued_chunks": self._admitted, "ingest_busy_sessions": len(self._lanes)}
+
+    def close(self) -> None:
+        self._ingest.shutdown(wait=True)
+        self._control.shutdown(wait=True)
+
+    async def _drain(self, session_id: str, lane: _Lane) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while lane.waiting:
+                batch = [lane.waiting.popleft()]
+                if self.stale_chunk_policy == "coalesce" and self._listening(session_id):
+                    while lane.waiting and lane.waiting[0].sample_rate == batch[0].sample_rate:
+                        batch.append(lane.waiting.popleft())
+                lane.running = len(batch)
+                started = perf_counter()
+                for chunk in batch:
+                    self.engine.metrics.wait("ingest_queue", started - chunk.queued)
+                try:
+                    result = await loop.run_in_executor(self._ingest, self._process, session_id, batch)
+                except Exception as exc:
+                    for chunk in batch:
+                        if not chunk.future.done():
+                            chunk.future.set_exception(exc)
+                else:
+                    # Transcripts and jobs are delivered once, with the newest chunk
+                    for chunk in batch[:-1]:
+                        if not chunk.future.done():
+                            chunk.future.set_result(replace(result, transcripts=[], job_id=None, failed_jobs=[]))
+                    if not batch[-1].future.done():
+                        batch[-1].future.set_result(result)
+                    self._count("processed")
+                    if len(batch) > 1:
+                        self._count("coalesced", len(batch) - 1)
+                finally:
+                    self._admitted -= len(batch)
+                    lane.running = 0
+        finally:
+            lane.draining = False
+            if self._lanes.get(session_id) is lane and not lane.waiting:
+                del self._lanes[session_id]
+
+    def _process(self, session_id: str, batch: List[_Chunk]) -> ChunkResult:
+        first = batch[0]
+        if len(batch) == 1:
+            if isinstance(first.payload, str):
+                return self.engine.process_chunk(session_id, first.payload, first.sample_rate)
+            return self.engine.process_bytes(session_id, first.payload, first.sample_rate)
+        payload = b"".join(
+            chunk.payload if isinstance(chunk.payload, bytes) else base64.b64decode(chunk.payload) for chunk in batch
+        )
+        return self.engine.process_bytes(session_id, payload, first.sample_rate)
+
+    def _listening(self, session_id: str) -> bool:
+        return self.engine.session_state(session_id) in {None, SessionState.LISTENING}
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        self.engine.metrics.increment("ingest_chunks", outcome, amount)
@@ -1,22 +1,38 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+from contextlib import asynccontextmanager
+import json
+import logging
 from pathlib import Path
 import sys
+from typing import Any, AsyncIterator, Callable
 import uuid
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
 if __package__ in {None, ""}:
     sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from aviso_vc.admission import IngestController, Overloaded
     from aviso_vc.config import Settings
-    from aviso_vc.service import AudioEngine, SessionTranscript
+    from aviso_vc.jobs import TranscriptionJob
+    from aviso_vc.metrics import server_timing
+    from aviso_vc.service import AudioEngine, ChunkResult, SessionTranscript
 else:
+    from .admission import IngestController, Overloaded
     from .config import Settings
-    from .service import AudioEngine, SessionTranscript
+    from .jobs import TranscriptionJob
+    from .metrics import server_timing
+    from .service import AudioEngine, ChunkResult, SessionTranscript
+
+logger = logging.getLogger(__name__)
 
 
 class AudioChunkPayload(BaseModel):
@@ -46,24 +62,106 @@ class TranscriptModel(BaseModel):
 class ChunkResponse(BaseModel):
     status: str
     transcript: TranscriptModel | None = None
+    transcripts: list[TranscriptModel] = Field(default_factory=list)
+    job_id: str | None = None
+    failed_jobs: list[str] = Field(default_factory=list)
     warning_active: bool = False
 
+    @classmethod
+    def from_result(cls, result: ChunkResult) -> "ChunkResponse":
+        transcripts = [TranscriptModel.from_dataclass(t) for t in result.transcripts]
+        if transcripts:
+            status = "transcribed"
+        elif result.job_id:
+            status = "transcribing"
+        else:
+            status = result.state.value
+        return cls(
+            status=status,
+            transcript=transcripts[-1] if transcripts else None,
+            transcripts=transcripts,
+            job_id=result.job_id,
+            failed_jobs=result.failed_jobs,
+            warning_active=result.warning_active,
+        )
+
 
 class TranscriptsResponse(BaseModel):
     session_id: str
     transcripts: list[TranscriptModel]
+    pending_jobs: list[str] = Field(default_factory=list)
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: str
+    transcript: TranscriptModel | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_job(cls, job: TranscriptionJob) -> "JobResponse":
+        return cls(
+            job_id=job.job_id,
+            session_id=job.session_id,
+            status=job.status.value,
+            transcript=TranscriptModel.from_dataclass(job.result) if job.result else None,
+            error=job.error,
+        )
 
 
 class SessionResponse(BaseModel):
     session_id: str
 
 
+def check_pcm16(payload: bytes) -> bytes:
+    if len(payload) % 2:
+        raise ValueError("Audio must be int16 PCM: an even number of bytes")
+    return payload
+
+
+def decode_samples(samples: str) -> bytes:
+    try:
+        return check_pcm16(base64.b64decode(samples, validate=True))
+    except binascii.Error as exc:
+        raise ValueError("samples must be base64 encoded") from exc
+
+
+def parse_control(text: str, sample_rate: int) -> int:
+    """The sample rate set by a websocket control message."""
+    try:
+        control = json.loads(text)
+        sample_rate = int(control.get("sample_rate", sample_rate))
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise ValueError('Control messages must be JSON like {"sample_rate": 48000}') from exc
+    if sample_rate <= 0:
+        raise ValueError("sample_rate must be positive")
+    return sample_rate
+
+
 def create_app() -> FastAPI:
-    settings = Settings()
-    engine = AudioEngine(settings)
-    app = FastAPI(title="AvisoVC API", version="0.2.0")
+    """Build the app; models are loaded and warmed up by its lifespan, not here."""
+    settings = Settings.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        engine = AudioEngine(settings)
+        if settings.warm_up:
+            engine.warm_up()
+        app.state.engine = engine
+        app.state.ingest = IngestController.from_settings(engine, settings)
+        timings = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in engine.startup_timings.items())
+        logger.info("AvisoVC engine ready (%s)", timings)
+        try:
+            yield
+        finally:
+            app.state.ingest.close()
+            engine.close()
+
+    app = FastAPI(title="AvisoVC API", version="0.2.0", lifespan=lifespan)
     app.state.settings = settings
-    app.state.engine = engine
+    app.state.engine = None
+    app.state.ingest = None
 
     # Add CORS middleware
     app.add_middleware(
@@ -79,6 +177,17 @@ def create_app() -> FastAPI:
     if static_dir.exists():
         app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
+    async def call(fn: Callable[..., Any], *args: Any) -> Any:
+        return await app.state.ingest.call(fn, *args)
+
+    async def submit_chunk(session_id: str, payload: bytes | str, sample_rate: int) -> ChunkResult:
+        try:
+            return await app.state.ingest.submit(session_id, payload, sample_rate)
+        except Overloaded as exc:
+            raise HTTPException(
+                status_code=429, detail=str(exc), headers={"Retry-After": exc.retry_after_header}
+            ) from exc
+
     @app.get("/", response_class=HTMLResponse)
     def serve_frontend() -> str:
         index_path = frontend_dir / "index.html"
@@ -87,63 +196,153 @@ def create_app() -> FastAPI:
         return index_path.read_text(encoding="utf-8")
 
     @app.get("/healthz")
-    def healthcheck() -> dict[str, str]:
-        return {"status": "ok"}
+    async def healthcheck() -> dict[str, str]:
+        return {"status": "ok" if app.state.engine is not None else "starting"}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """Prometheus text exposition of latency histograms, counters and gauges."""
+        if app.state.engine is None:
+            raise HTTPException(status_code=503, detail="Engine is starting")
+        text = await call(app.state.engine.render_metrics, app.state.ingest.gauges())
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    def chunk_response(result: ChunkResult, response: Response) -> ChunkResponse:
+        if settings.timing_header and result.timings:
+            response.headers["Server-Timing"] = server_timing(result.timings)
+        return ChunkResponse.from_result(result)
 
     @app.post("/api/session", response_model=SessionResponse)
-    def create_session() -> SessionResponse:
+    async def create_session() -> SessionResponse:
         """Create a new session and return the session ID."""
         session_id = str(uuid.uuid4())
-        # Initialize the session by accessing it (lazy initialization)
-        app.state.engine._get_session(session_id)
+        await call(app.state.engine.create_session, session_id)
         return SessionResponse(session_id=session_id)
 
     @app.post("/api/audio-chunk", response_model=ChunkResponse)
-    def ingest_audio(payload: AudioChunkPayload) -> ChunkResponse:
-        transcript = app.state.engine.process_chunk(
-            session_id=payload.session_id,
-            payload_b64=payload.samples,
-            sample_rate=payload.sample_rate,
-        )
-
-        # Get warning status
-        calibration_status = app.state.engine.get_calibration_status(payload.session_id)
-        warning_active = calibration_status.get("warning_active", False)
-
-        status = "transcribed" if transcript else calibration_status.get("state", "listening")
-        return ChunkResponse(
-            status=status,
-            transcript=TranscriptModel.from_dataclass(transcript) if transcript else None,
-            warning_active=warning_active,
-        )
+    async def ingest_audio(payload: AudioChunkPayload, response: Response) -> ChunkResponse:
+        try:
+            samples = decode_samples(payload.samples)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        result = await submit_chunk(payload.session_id, samples, payload.sample_rate)
+        return chunk_response(result, response)
+
+    @app.post("/api/audio-chunk/{session_id}/raw", response_model=ChunkResponse)
+    async def ingest_raw_audio(
+        session_id: str, request: Request, response: Response, sample_rate: int = Query(..., gt=0)
+    ) -> ChunkResponse:
+        """Ingest raw little-endian int16 PCM sent as application/octet-stream."""
+        try:
+            payload = check_pcm16(await request.body())
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        result = await submit_chunk(session_id, payload, sample_rate)
+        return chunk_response(result, response)
+
+    @app.websocket("/ws/audio/{session_id}")
+    async def stream_audio(websocket: WebSocket, session_id: str, sample_rate: int = Query(16000, gt=0)) -> None:
+        """Stream binary int16 PCM frames and receive chunk events on one connection.
+
+        Text frames are JSON control messages; ``{"sample_rate": 48000}`` changes the
+        rate of subsequent binary frames. An event is pushed whenever the state
+        changes, a transcription starts, finishes or fails, or the warning flag flips,
+        also when a transcription finishes after the client stopped sending. A frame
+        that is not admitted is answered with an ``overloaded`` event, and a malformed
+        one with an ``error`` event.
+        """
+        await websocket.accept()
+        last_event = None
+        sending = asyncio.Lock()
+        watchers: set[asyncio.Task] = set()
+
+        async def send(event: dict) -> None:
+            async with sending:
+                await websocket.send_json(event)
+
+        async def push(result: ChunkResult) -> None:
+            nonlocal last_event
+            event = ChunkResponse.from_result(result)
+            if event.transcripts or event.job_id or event.failed_jobs or event != last_event:
+                await send(jsonable_encoder(event))
+            last_event = event
+
+        async def watch(job_id: str) -> None:
+            job = app.state.engine.get_job(job_id)
+            if job is not None and job.future is not None:
+                await asyncio.wrap_future(job.future)
+            result = await call(app.state.engine.poll, session_id)
+            # The next frame may already have delivered it
+            if result is not None and (result.transcripts or result.failed_jobs):
+                await push(result)
+
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                try:
+                    if message.get("text") is not None:
+                        sample_rate = parse_control(message["text"], sample_rate)
+                        continue
+                    payload = check_pcm16(message.get("bytes") or b"")
+                except ValueError as exc:
+                    await send({"status": "error", "detail": str(exc)})
+                    continue
+                if not payload:
+                    continue
+                try:
+                    result = await app.state.ingest.submit(session_id, payload, sample_rate)
+                except Overloaded as exc:
+                    await send({"status": "overloaded", "detail": str(exc), "retry_after": exc.retry_after})
+                    continue
+                await push(result)
+                if result.job_id:
+                    task = asyncio.ensure_future(watch(result.job_id))
+                    watchers.add(task)
+                    task.add_done_callback(watchers.discard)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in watchers:
+                task.cancel()
 
     @app.get("/api/sessions/{session_id}", response_model=TranscriptsResponse)
-    def get_transcripts(session_id: str) -> TranscriptsResponse:
-        transcripts = app.state.engine.list_transcripts(session_id)
+    async def get_transcripts(session_id: str) -> TranscriptsResponse:
+        transcripts = await call(app.state.engine.list_transcripts, session_id)
+        pending = await call(app.state.engine.pending_jobs, session_id)
         return TranscriptsResponse(
             session_id=session_id,
             transcripts=[TranscriptModel.from_dataclass(t) for t in transcripts],
+            pending_jobs=[job.job_id for job in pending],
         )
 
+    @app.get("/api/jobs/{job_id}", response_model=JobResponse)
+    async def get_job(job_id: str) -> JobResponse:
+        job = app.state.engine.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return JobResponse.from_job(job)
+
     @app.post("/api/calibration/{session_id}/start")
-    def start_calibration(session_id: str) -> dict:
+    async def start_calibration(session_id: str) -> dict:
         """Start calibration recording for a session."""
-        return app.state.engine.start_calibration(session_id)
+        return await call(app.state.engine.start_calibration, session_id)
 
     @app.post("/api/calibration/{session_id}/finish")
-    def finish_calibration(session_id: str) -> dict:
+    async def finish_calibration(session_id: str) -> dict:
         """Finish calibration and calculate baseline."""
-        return app.state.engine.finish_calibration(session_id)
+        return await call(app.state.engine.finish_calibration, session_id)
 
     @app.get("/api/calibration/{session_id}/status")
-    def get_calibration_status(session_id: str) -> dict:
+    async def get_calibration_status(session_id: str) -> dict:
         """Get calibration status for a session."""
-        return app.state.engine.get_calibration_status(session_id)
+        return await call(app.state.engine.get_calibration_status, session_id)
 
     @app.post("/api/calibration/{session_id}/dismiss-warning")
-    def dismiss_warning(session_id: str) -> dict:
+    async def dismiss_warning(session_id: str) -> dict:
         """Dismiss the active warning."""
-        return app.state.engine.dismiss_warning(session_id)
+        return await call(app.state.engine.dismiss_warning, session_id)
 
     return app
 
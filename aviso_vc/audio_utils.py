@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+import io
 from pathlib import Path
-from typing import Tuple
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import soundfile as sf
 
 
 @dataclass
 class AudioClip:
-    path: Path
+    path: Optional[Path]  # None while the clip only exists in memory
     start: float
     end: float
 
@@ -21,10 +27,52 @@ class AudioClip:
 
 def load_audio(path: Path) -> Tuple[np.ndarray, int]:
     """Load audio file as mono waveform."""
-    data, sample_rate = sf.read(path)
+    data, sample_rate = sf.read(path, dtype="float32")
     return ensure_mono(data), sample_rate
 
 
+class AudioSource:
+    """Mono view of an audio file that decodes only the samples being asked for.
+
+    Supports ``len()`` and slicing like a waveform array, so it can stand in for
+    the output of :func:`load_audio` while keeping memory independent of file length.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = sf.SoundFile(str(self.path))
+        self._lock = Lock()
+        self.sample_rate = self._file.samplerate
+
+    def __len__(self) -> int:
+        return self._file.frames
+
+    def __getitem__(self, key: slice) -> np.ndarray:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("AudioSource only supports contiguous slices")
+        start, stop, _ = key.indices(len(self))
+        with self._lock:
+            self._file.seek(start)
+            data = self._file.read(max(0, stop - start), dtype="float32")
+        return ensure_mono(data)
+
+    @property
+    def duration(self) -> float:
+        return len(self) / float(self.sample_rate)
+
+    def windows(self, duration: float, overlap: float) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield ``(start_time, waveform)`` for consecutive overlapping windows."""
+        blocksize = int(duration * self.sample_rate)
+        overlap_samples = int(overlap * self.sample_rate)
+        offset = 0
+        for block in sf.blocks(str(self.path), blocksize=blocksize, overlap=overlap_samples, dtype="float32"):
+            yield offset / float(self.sample_rate), ensure_mono(block)
+            offset += blocksize - overlap_samples
+
+    def close(self) -> None:
+        self._file.close()
+
+
 def write_clip(
     audio: np.ndarray,
     sample_rate: int,
@@ -35,23 +83,90 @@ def write_clip(
     index: int,
 ) -> AudioClip | None:
     """Save a slice of the waveform to disk."""
+    sliced = slice_clip(audio, sample_rate, start_time, duration)
+    if sliced is None:
+        return None
+    clip, samples = sliced
+    destination.mkdir(parents=True, exist_ok=True)
+    clip.path = clip_path(destination, prefix, index)
+    sf.write(clip.path, samples, sample_rate)
+    return clip
+
+
+def slice_clip(
+    audio: np.ndarray,
+    sample_rate: int,
+    start_time: float,
+    duration: float,
+) -> Tuple[AudioClip, np.ndarray] | None:
+    """Cut a slice of the waveform without touching the disk.
+
+    Returns the in-memory clip and its samples (a view when ``audio`` is an array).
+    """
     if duration <= 0:
         return None
     start_sample = max(0, int(start_time * sample_rate))
     end_sample = min(len(audio), start_sample + int(duration * sample_rate))
     if end_sample - start_sample <= 0:
         return None
-    destination.mkdir(parents=True, exist_ok=True)
-    clip_path = destination / f"{prefix}_{index:04d}.wav"
-    sf.write(clip_path, audio[start_sample:end_sample], sample_rate)
     actual_duration = (end_sample - start_sample) / sample_rate
-    return AudioClip(path=clip_path, start=start_time, end=start_time + actual_duration)
+    clip = AudioClip(path=None, start=start_time, end=start_time + actual_duration)
+    return clip, audio[start_sample:end_sample]
+
+
+def clip_path(destination: Path, prefix: str, index: int) -> Path:
+    return destination / f"{prefix}_{index:04d}.wav"
+
+
+class ClipWriter:
+    """Writes clips to disk on a background thread.
+
+    ``close`` waits for outstanding writes and re-raises the first failure.
+    """
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clip-writer")
+        self._futures: List[Future] = []
+
+    def submit(self, samples: np.ndarray, sample_rate: int, path: Path) -> None:
+        self._futures = [future for future in self._futures if not future.done() or future.exception()]
+        self._futures.append(self._executor.submit(sf.write, path, samples, sample_rate))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+
+
+# container, subtype and file extension for each supported upload format
+UPLOAD_FORMATS = {
+    "wav": ("WAV", "PCM_16", "wav"),
+    "flac": ("FLAC", "PCM_16", "flac"),
+    "opus": ("OGG", "OPUS", "ogg"),
+}
+OPUS_SAMPLE_RATES = {8000, 12000, 16000, 24000, 48000}
+OPUS_FALLBACK_RATE = 16000  # what Whisper resamples to anyway
+
+
+def encode_audio(audio: np.ndarray, sample_rate: int, fmt: str = "wav") -> Tuple[str, bytes]:
+    """Serialize a mono waveform to an in-memory audio file, returning (filename, bytes).
+
+    Opus only supports a few sample rates; audio at any other rate is resampled to
+    16 kHz first.
+    """
+    container, subtype, extension = UPLOAD_FORMATS[fmt]
+    if fmt == "opus" and sample_rate not in OPUS_SAMPLE_RATES:
+        audio = resample_audio(audio, sample_rate, OPUS_FALLBACK_RATE)
+        sample_rate = OPUS_FALLBACK_RATE
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format=container, subtype=subtype)
+    return f"audio.{extension}", buffer.getvalue()
 
 
 def ensure_mono(data: np.ndarray) -> np.ndarray:
     if data.ndim == 1:
-        return data.astype(np.float32)
-    return data.mean(axis=1).astype(np.float32)
+        return data.astype(np.float32, copy=False)
+    return data.mean(axis=1, dtype=np.float32)
 
 
 def int16_to_float32(samples: bytes) -> np.ndarray:
@@ -61,12 +176,102 @@ def int16_to_float32(samples: bytes) -> np.ndarray:
     return (int_samples.astype(np.float32) / 32768.0).clip(-1.0, 1.0)
 
 
+# Polyphase low-pass design: zero crossings per side, passband edge relative to the
+# output Nyquist frequency, and Kaiser window shape.
+_RESAMPLE_ZERO_CROSSINGS = 16
+_RESAMPLE_ROLLOFF = 0.945
+_RESAMPLE_KAISER_BETA = 8.6
+_RESAMPLE_BLOCK = 8192
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(source_sr: int, target_sr: int) -> Tuple[np.ndarray, int, int, int]:
+    """Design the windowed-sinc filter for ``source_sr -> target_sr``.
+
+    Returns ``(phases, up, down, delay)`` where ``phases[r, k]`` is tap ``r + k * up``
+    of the prototype filter and ``delay`` is its group delay in upsampled samples.
+    """
+    divisor = gcd(source_sr, target_sr)
+    up, down = target_sr // divisor, source_sr // divisor
+    factor = max(up, down)
+    delay = _RESAMPLE_ZERO_CROSSINGS * factor
+    length = 2 * delay + 1
+    cutoff = _RESAMPLE_ROLLOFF / (2.0 * factor)
+    t = np.arange(length) - delay
+    prototype = up * 2.0 * cutoff * np.sinc(2.0 * cutoff * t) * np.kaiser(length, _RESAMPLE_KAISER_BETA)
+    taps = -(-length // up)
+    padded = np.zeros(taps * up)
+    padded[:length] = prototype
+    phases = np.ascontiguousarray(padded.reshape(taps, up).T, dtype=np.float32)
+    phases.setflags(write=False)
+    return phases, up, down, delay
+
+
+class StreamingResampler:
+    """Stateful polyphase resampler that carries filter history across chunks.
+
+    Feeding a stream chunk by chunk produces the same samples as resampling it in
+    one go, so there are no seams at chunk boundaries. Output lags the input by
+    ``latency`` source samples.
+    """
+
+    def __init__(self, source_sr: int, target_sr: int) -> None:
+        if source_sr <= 0 or target_sr <= 0:
+            raise ValueError("sample rates must be positive")
+        self.source_sr = source_sr
+        self.target_sr = target_sr
+        phases, self._up, self._down, self._delay = _polyphase_filter(source_sr, target_sr)
+        self._num_taps = phases.shape[1]
+        # Taps reversed so that a forward window of input samples can be dotted directly
+        self._kernel = np.ascontiguousarray(phases[:, ::-1])
+        # Samples before the start of the stream are zeros
+        self._history = np.zeros(self._num_taps - 1, dtype=np.float32)
+        self._offset = -(self._num_taps - 1)  # stream index of self._history[0]
+        self._next = 0  # stream index of the next output sample
+
+    @property
+    def latency(self) -> int:
+        return -(-self._delay // self._up)
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        audio = np.concatenate((self._history, np.asarray(chunk, dtype=np.float32)))
+        available = self._offset + len(audio)
+        last = ((available - 1) * self._up + self._up - 1 - self._delay) // self._down
+        count = max(0, last - self._next + 1)
+        output = np.empty(count, dtype=np.float32)
+        if count:
+            windows = sliding_window_view(audio, self._num_taps)
+            # Blocks hold whole filter-phase cycles, so the phase pattern repeats per row
+            block = self._up * max(1, _RESAMPLE_BLOCK // self._up)
+            for start in range(0, count, block):
+                index = np.arange(self._next + start, self._next + min(count, start + block))
+                position = index * self._down + self._delay
+                frames = windows[position // self._up - self._offset - (self._num_taps - 1)]
+                whole = len(index) - len(index) % self._up
+                if whole:
+                    weights = self._kernel[position[:self._up] % self._up]
+                    grouped = frames[:whole].reshape(-1, self._up, self._num_taps)
+                    output[start:start + whole] = np.einsum("jik,ik->ji", grouped, weights).reshape(-1)
+                if whole < len(index):
+                    weights = self._kernel[position[whole:] % self._up]
+                    output[start + whole:start + len(index)] = np.einsum("ij,ij->i", frames[whole:], weights)
+        self._next += count
+
+        # Keep only the inputs the next output sample still needs
+        needed = (self._next * self._down + self._delay) // self._up - (self._num_taps - 1)
+        keep_from = min(max(0, needed - self._offset), len(audio))
+        self._history = audio[keep_from:]
+        self._offset += keep_from
+        return output
+
+
 def resample_audio(audio: np.ndarray, source_sr: int, target_sr: int) -> np.ndarray:
     if source_sr == target_sr or len(audio) == 0:
         return audio.astype(np.float32)
-    duration = len(audio) / float(source_sr)
-    target_length = max(1, int(duration * target_sr))
-    source_times = np.linspace(0.0, duration, num=len(audio), endpoint=False)
-    target_times = np.linspace(0.0, duration, num=target_length, endpoint=False)
-    resampled = np.interp(target_times, source_times, audio)
-    return resampled.astype(np.float32)
+    target_length = max(1, int(len(audio) / float(source_sr) * target_sr))
+    resampler = StreamingResampler(source_sr, target_sr)
+    tail = np.zeros(resampler.latency + 1, dtype=np.float32)
+    resampled = np.concatenate((resampler.process(audio), resampler.process(tail)))
+    if len(resampled) < target_length:
+        resampled = np.pad(resampled, (0, target_length - len(resampled)))
+    return resampled[:target_length]
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
+import json
+import multiprocessing as mp
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .cache import TimelineCache
+from .config import Settings
+from .orchestrator import ProcessedSegment, VoiceActivityWorkflow, detect_file
+from .transcription import create_transcriber
+from .vad import SpeechSegment, VoiceActivityDetector
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".ogg", ".opus", ".mp3", ".aif", ".aiff"}
+MANIFEST_EXTENSIONS = {".txt", ".lst"}
+
+# Detector of the current VAD worker process, loaded once by _init_vad_worker
+_worker_detector: Optional[VoiceActivityDetector] = None
+
+
+def _init_vad_worker(model_id: str, hf_token: str, num_threads: int, hyperparameters: Dict[str, float]) -> None:
+    global _worker_detector
+    import torch
+
+    torch.set_num_threads(num_threads)
+    _worker_detector = VoiceActivityDetector.from_pretrained(model_id, hf_token, hyperparameters=hyperparameters)
+
+
+def _detect_in_worker(path: Path, settings: Settings) -> List[SpeechSegment]:
+    return detect_file(_worker_detector, path, settings)
+
+
+def collect_inputs(target: Path) -> List[Path]:
+    """Audio files under a directory, or listed one per line in a manifest file."""
+    target = Path(target)
+    if target.is_dir():
+        return sorted(p for p in target.rglob("*") if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS)
+    paths = []
+    for line in target.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            path = Path(line)
+            paths.append(path if path.is_absolute() else target.parent / path)
+    return paths
+
+
+def is_batch_input(target: Path, manifest: bool = False) -> bool:
+    """A directory, a ``.txt``/``.lst`` manifest, or any file when ``manifest`` is set.
+
+    Every other file is a single recording, whatever its extension.
+    """
+    target = Path(target)
+    return manifest or target.is_dir() or target.suffix.lower() in MANIFEST_EXTENSIONS
+
+
+@dataclass
+class FileSummary:
+    audio: str
+    output: str
+    segments: int = 0
+    words: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    files: List[FileSummary] = field(default_factory=list)
+    elapsed: float = 0.0
+    transcription_cache: Optional[dict] = None
+    vad_cache: Optional[dict] = None
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for item in self.files if item.error is not None)
+
+
+class BatchWorkflow:
+    """Runs the offline workflow over many files with models loaded once.
+
+    VAD is spread over a pool of worker processes (each loading the segmentation
+    model once); as each timeline arrives the file is handed to a thread pool that
+    transcribes through one shared transcriber, whose ``transcription_concurrency``
+    bounds the requests in flight across all files. Every file gets its own output
+    directory (journal, transcript and optional clips) and ``summary.json`` lists them all.
+    """
+
+    def __init__(self, settings: Settings, inputs: List[Path], root: Optional[Path] = None) -> None:
+        if not inputs:
+            raise ValueError("no audio files to process")
+        self.settings = settings
+        self.inputs = [Path(path) for path in inputs]
+        self.root = Path(root) if root is not None else None
+        self.transcriber = create_transcriber(settings)
+        self.timeline_cache = TimelineCache.from_settings(settings)
+        self._print_lock = Lock()
+
+    def run(self) -> BatchSummary:
+        self.settings.ensure_output_dir()
+        started = perf_counter()
+        summaries: Dict[Path, FileSummary] = {}
+        # VAD workers must fork before any threads exist: the executor is created first and
+        # every VAD job is submitted before the first transcription
+        vad_executor, detect = self._vad_executor()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.settings.transcription_concurrency, thread_name_prefix="batch"
+            ) as files:
+                timelines: Dict[Future, Path] = {}
+                keys: Dict[Path, str] = {}
+                transcriptions: Dict[Future, Path] = {}
+                cached: Dict[Path, List[SpeechSegment]] = {}
+                for path in self.inputs:
+                    if self.timeline_cache is not None:
+                        try:
+                            keys[path] = self.timeline_cache.key(path, self.settings)
+                        except OSError as exc:
+                            summaries[path] = self._failed(path, exc)
+                            continue
+                        segments = self.timeline_cache.get(keys[path])
+                        if segments is not None:
+                            cached[path] = segments
+                            continue
+                    timelines[vad_executor.submit(detect, path, self.settings)] = path
+                # VAD workers fork on the first submit above, so only now start transcription threads
+                for path, segments in cached.items():
+                    transcriptions[files.submit(self._transcribe_file, path, segments)] = path
+                for future in as_completed(timelines):
+                    path = timelines[future]
+                    try:
+                        segments = future.result()
+                    except Exception as exc:
+                        summaries[path] = self._failed(path, exc)
+                        continue
+                    if path in keys:
+                        self.timeline_cache.put(keys[path], segments)
+                    transcriptions[files.submit(self._transcribe_file, path, segments)] = path
+                for future in as_completed(transcriptions):
+                    path = transcriptions[future]
+                    try:
+                        summaries[path] = future.result()
+                    except Exception as exc:
+                        summaries[path] = self._failed(path, exc)
+        finally:
+            vad_executor.shutdown(wait=True)
+
+        cache = self.transcriber.cache
+        summary = BatchSummary(
+            files=[summaries[path] for path in self.inputs],
+            elapsed=perf_counter() - started,
+            transcription_cache=cache.stats() if cache is not None else None,
+            vad_cache=self.timeline_cache.stats() if self.timeline_cache is not None else None,
+        )
+        summary_path = self.settings.output_dir / "summary.json"
+        summary_path.write_text(json.dumps(asdict(summary), indent=2, ensure_ascii=False), encoding="utf-8")
+        print(
+            f"Processed {len(summary.files) - summary.failed} of {len(summary.files)} files "
+            f"in {summary.elapsed:.1f}s ({summary.failed} failed). Summary: {summary_path}"
+        )
+        return summary
+
+    def _vad_executor(self) -> Tuple[Executor, Callable[[Path, Settings], List[SpeechSegment]]]:
+        workers = self.settings.batch_vad_workers
+        if workers < 1:
+            detector = VoiceActivityDetector.from_pretrained(
+                self.settings.vad_model_id, self.settings.hf_token, hyperparameters=self.settings.vad_hyperparameters
+            )
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-vad"), partial(detect_file, detector)
+        method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context(method),
+            initializer=_init_vad_worker,
+            initargs=(
+                self.settings.vad_model_id,
+                self.settings.hf_token,
+                self.settings.vad_threads_per_worker,
+                self.settings.vad_hyperparameters,
+            ),
+        )
+        return executor, _detect_in_worker
+
+    def _output_dir(self, path: Path) -> Path:
+        relative = Path(path.name)
+        if self.root is not None:
+            try:
+                relative = path.relative_to(self.root)
+            except ValueError:
+                pass
+        return self.settings.output_dir / "__".join(relative.with_suffix("").parts)
+
+    def _transcribe_file(self, path: Path, segments: List[SpeechSegment]) -> FileSummary:
+        output_dir = self._output_dir(path)
+        settings = replace(self.settings, audio_path=path, output_dir=output_dir, journal_path=None)
+        workflow = VoiceActivityWorkflow(settings, transcriber=self.transcriber, verbose=False)
+        results = workflow.run(segments)
+        self._write_transcript(output_dir / "transcript.json", path, results)
+        self._log(f"[{path.name}] {len(results)} segments")
+        return FileSummary(
+            audio=str(path),
+            output=str(output_dir),
+            segments=len(results),
+            words=sum(len(item.transcription.text.split()) for item in results),
+            seconds=sum(item.clip.duration for item in results),
+        )
+
+    @staticmethod
+    def _write_transcript(destination: Path, path: Path, results: List[ProcessedSegment]) -> None:
+        segments = [
+            {
+                "start": item.clip.start,
+                "end": item.clip.end,
+                "text": item.transcription.text,
+                "words_per_second": item.transcription.words_per_second,
+            }
+            for item in results
+        ]
+        payload = {"audio": str(path), "segments": segments}
+        destination.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def _failed(self, path: Path, exc: Exception) -> FileSummary:
+        self._log(f"[{path.name}] failed: {exc!r}")
+        return FileSummary(audio=str(path), output=str(self._output_dir(path)), error=repr(exc))
+
+    def _log(self, message: str) -> None:
+        with self._print_lock:
+            print(message)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+_EMPTY = np.empty(0, dtype=np.float32)
+
+
+class AudioBuffer:
+    """Fixed-capacity float32 arena for session audio.
+
+    Chunks are copied in place into storage allocated on the first append, and
+    readers get zero-copy views. Samples that do not fit within ``capacity`` are
+    dropped. ``generation`` changes whenever the buffer starts over, so a reader
+    that remembers it and ``len()`` can tell which samples are new.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+        self._capacity = capacity
+        self._data = _EMPTY  # an empty buffer holds no storage
+        self._size = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the samples buffered, not of the storage reserved for ``capacity``."""
+        return self._size * _EMPTY.itemsize
+
+    def append(self, chunk: np.ndarray) -> int:
+        """Copy ``chunk`` into the buffer and return how many samples were kept."""
+        count = min(len(chunk), self.capacity - self._size)
+        if count and len(self._data) == 0:
+            self._data = np.empty(self.capacity, dtype=np.float32)
+        self._data[self._size:self._size + count] = chunk[:count]
+        self._size += count
+        return count
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def clear(self) -> None:
+        self._data = _EMPTY
+        self._size = 0
+        self.generation += 1
+
+    def detach(self, length: Optional[int] = None) -> np.ndarray:
+        """Hand the buffered samples off without copying and start over on fresh storage.
+
+        The returned view stays valid while the buffer keeps filling, which lets it be
+        transcribed in the background.
+        """
+        audio = self._data[:self._size if length is None else min(length, self._size)]
+        self._data = _EMPTY
+        self._size = 0
+        self.generation += 1
+        return audio
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from .segments import SpeechSegment
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+
+def audio_key(samples: np.ndarray, sample_rate: int, **params) -> str:
+    """Content hash of float32 PCM samples plus whatever else shapes the result."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(samples, dtype=np.float32).data)
+    digest.update(json.dumps({"sample_rate": sample_rate, **params}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TimelineCache:
+    """VAD timelines stored as ``(n, 2)`` float arrays of start/end seconds, one .npy per key."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.counters: Counter = Counter()
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> Optional["TimelineCache"]:
+        return cls(settings.vad_cache_dir) if settings.vad_cache else None
+
+    @staticmethod
+    def key(path: Path, settings: "Settings") -> str:
+        """Hash of the file content plus everything that shapes its timeline."""
+        params = {
+            "content": file_digest(path),
+            "model": settings.vad_model_id,
+            "hyperparameters": settings.vad_hyperparameters,
+            "window_duration": settings.vad_window_duration,
+            "window_overlap": settings.vad_window_overlap,
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[List[SpeechSegment]]:
+        try:
+            timeline = np.load(self._path(key))
+        except (OSError, ValueError):
+            timeline = None
+        with self._lock:
+            self.counters["hits" if timeline is not None else "misses"] += 1
+        if timeline is None:
+            return None
+        return [SpeechSegment(start=float(start), end=float(end)) for start, end in timeline]
+
+    def put(self, key: str, segments: List[SpeechSegment]) -> None:
+        timeline = np.array([[segment.start, segment.end] for segment in segments], dtype=np.float64).reshape(-1, 2)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(staging, timeline)
+        os.replace(staging, path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.npy"
+
+
+class TranscriptionCache:
+    """Transcripts by content key, in an in-memory LRU backed by an optional SQLite file.
+
+    The disk tier is bounded to roughly ``max_disk_bytes`` of transcript text; the
+    least recently used rows are deleted once it grows past that. Its size is kept
+    in the database by triggers, so processes sharing the file agree on it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: Optional[Path] = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.counters: Counter = Counter()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_lock = Lock()
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), timeout=30.0, check_same_thread=False)
+            with self._disk_lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS transcriptions ("
+                    "key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS transcriptions_accessed ON transcriptions (accessed)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS transcriptions_size (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                    "bytes INTEGER NOT NULL)"
+                )
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO transcriptions_size (id, bytes) "
+                    "SELECT 0, COALESCE(SUM(size), 0) FROM transcriptions"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS transcriptions_inserted AFTER INSERT ON transcriptions "
+                    "BEGIN UPDATE transcriptions_size SET bytes = bytes + NEW.size; END"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS transcriptions_updated AFTER UPDATE OF size ON transcriptions "
+                    "BEGIN UPDATE transcriptions_size SET bytes = bytes + NEW.size - OLD.size; END"
+                )
+                self._conn.execute(
+                    "CREATE TRIGGER IF NOT EXISTS transcriptions_deleted AFTER DELETE ON transcriptions "
+                    "BEGIN UPDATE transcriptions_size SET bytes = bytes - OLD.size; END"
+                )
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> Optional["TranscriptionCache"]:
+        if not settings.transcription_cache_size and not settings.transcription_cache_max_bytes:
+            return None
+        path = settings.transcription_cache_path if settings.transcription_cache_max_bytes else None
+        return cls(
+            max_entries=settings.transcription_cache_size,
+            path=path,
+            max_disk_bytes=settings.transcription_cache_max_bytes,
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return text
+        if self._conn is not None:
+            with self._disk_lock, self._conn:
+                row = self._conn.execute("SELECT text FROM transcriptions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE transcriptions SET accessed = ? WHERE key = ?", (time(), key))
+            if row is not None:
+                self._remember(key, row[0])
+                with self._lock:
+                    self.counters["disk_hits"] += 1
+                return row[0]
+        with self._lock:
+            self.counters["misses"] += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        if self._conn is None:
+            return
+        size = len(key) + len(text.encode())
+        with self._disk_lock, self._conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete would not fire the size trigger
+            self._conn.execute(
+                "INSERT INTO transcriptions (key, text, size, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET text = excluded.text, size = excluded.size, "
+                "accessed = excluded.accessed",
+                (key, text, size, time()),
+            )
+            disk_bytes = self._disk_bytes()
+            if disk_bytes > self.max_disk_bytes:
+                self._shrink_disk(disk_bytes)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            counters = dict(self.counters)
+            entries = len(self._memory)
+        hits = counters.get("memory_hits", 0) + counters.get("disk_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        disk_bytes = None
+        if self._conn is not None:
+            with self._disk_lock:
+                disk_bytes = self._disk_bytes()
+        return {
+            **counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": entries,
+            "disk_bytes": disk_bytes,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._disk_lock:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, text: str) -> None:
+        if self.max_entries < 1:
+            return
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_bytes(self) -> int:
+        return self._conn.execute("SELECT bytes FROM transcriptions_size").fetchone()[0]
+
+    def _shrink_disk(self, disk_bytes: int) -> None:
+        # Trim to 90% of the bound so eviction is not repeated on every insert
+        target = int(self.max_disk_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM transcriptions ORDER BY accessed").fetchall()
+        expired = []
+        for key, size in rows:
+            if disk_bytes <= target:
+                break
+            expired.append((key,))
+            disk_bytes -= size
+        self._conn.executemany("DELETE FROM transcriptions WHERE key = ?", expired)
+        with self._lock:
+            self.counters["disk_evictions"] += len(expired)
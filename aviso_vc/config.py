@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 
 @dataclass
@@ -12,24 +12,207 @@ class Settings:
 
     audio_path: Optional[Path] = None
     segment_duration: float = 5.0
+    endpointing: bool = False  # cut segments at speech pauses instead of fixed segment_duration
+    endpoint_pause: float = 0.5  # silence that closes a segment, in seconds
+    endpoint_merge_gap: float = 1.5  # segments shorter than min_segment_duration wait this long for more speech
+    endpoint_padding: float = 0.1  # context kept around speech, in seconds
+    min_segment_duration: float = 1.0
+    max_segment_duration: float = 15.0
     output_dir: Path = Path("speech_segments")
     vad_model_id: str = "pyannote/voice-activity-detection"
     groq_model: str = "whisper-large-v3"
     hf_token_env_var: str = "HF_TOKEN"
     groq_api_key_env_var: str = "GROQ_API_KEY"
-    whisper_task: str = "translate"  # Kept for backward compatibility, not used with Groq
+    whisper_task: str = "transcribe"  # "translate" is honoured by the local backend; Groq always transcribes
     stream_sample_rate: int = 16000
+    workflow_concurrency: int = 1  # segments transcribed in parallel by the offline workflow
+    save_clips: bool = False  # also write offline segments to output_dir
+    journal_path: Optional[Path] = None  # defaults to <output_dir>/<audio stem>.journal.jsonl
+    resume: bool = False  # continue an interrupted offline run from its journal
+    batch_vad_workers: int = 2  # VAD processes in batch mode; 0 runs VAD in the main process
+    vad_window_duration: float = 600.0  # offline VAD runs over windows this long; 0 loads whole files
+    vad_window_overlap: float = 10.0
+    vad_onset: Optional[float] = None  # pipeline hyperparameters; None keeps the model's tuned value
+    vad_offset: Optional[float] = None
+    vad_min_duration_on: Optional[float] = None
+    vad_min_duration_off: Optional[float] = None
+    vad_cache: bool = True  # reuse offline VAD timelines of unchanged files
+    vad_cache_dir: Path = Path(".vad_cache")
+    calibration_min_duration: float = 5.0
+    calibration_max_duration: float = 20.0
+    warm_up: bool = True  # run dummy inference when the server starts
+    ingest_workers: int = 8  # threads processing audio chunks for the API
+    control_workers: int = 4  # threads for the other blocking API calls (sessions, calibration, jobs)
+    max_in_flight_per_session: int = 4  # chunks queued or in progress per session before 429
+    max_queued_chunks: int = 256  # chunks queued or in progress across sessions before 429
+    ingest_retry_after: float = 1.0  # seconds suggested in Retry-After on 429
+    stale_chunk_policy: str = "coalesce"  # "coalesce", "drop" or "off" for listening sessions that fall behind
+    timing_header: bool = False  # add a Server-Timing header with per-stage latency to chunk responses
+    torch_threads: int = 0  # torch intra-op threads in the API process; 0 keeps the torch default
+    vad_streaming: bool = True
+    vad_context_duration: float = 2.0  # seconds of previous audio re-scored per chunk
+    vad_batching: bool = True  # micro-batch streaming VAD across sessions
+    vad_max_batch_size: int = 16
+    vad_max_batch_wait_ms: float = 5.0
+    vad_pool_size: int = 0  # VAD worker processes, which then run all live VAD; 0 runs it in the API process
+    vad_threads_per_worker: int = 1  # torch intra-op threads in each VAD worker
+    vad_pool_slot_duration: float = 60.0  # seconds of audio per worker shared-memory slot
+    energy_gate: bool = True  # skip the neural VAD on listening chunks that are plainly silence
+    energy_gate_frame_ms: float = 20.0
+    energy_gate_min_rms: float = 0.002  # frames quieter than this (about -54 dBFS) are never speech
+    energy_gate_snr_db: float = 6.0  # how far above the session noise floor a frame must be
+    energy_gate_max_zcr: float = 0.35  # louder frames crossing zero more often are treated as noise
+    energy_gate_min_active_frames: int = 2
+    energy_gate_adapt_rate: float = 0.05  # how fast the noise floor rises, per chunk
+    energy_gate_hangover: float = 0.5  # seconds still sent to the VAD after the last active chunk
+    async_transcription: bool = True  # transcribe live segments in background jobs
+    transcription_workers: int = 4
+    upload_format: str = "wav"  # "wav", "flac" or "opus"
+    groq_timeout: float = 30.0
+    groq_max_retries: int = 2
+    groq_max_connections: int = 16
+    transcription_concurrency: int = 8  # max Groq requests in flight per transcriber
+    transcriber: str = "groq"  # "groq" or "local" (transformers Whisper on CPU)
+    local_whisper_model: str = "openai/whisper-small"
+    local_whisper_language: str = ""  # empty lets Whisper detect the language
+    local_whisper_quantize: bool = True  # int8 dynamic quantization of linear layers
+    local_whisper_threads: int = 0  # torch intra-op threads; 0 keeps the torch default
+    local_whisper_batch_size: int = 8
+    transcription_batch_size: int = 1  # segments grouped per upload or forward pass; 1 disables batching
+    transcription_batch_wait_ms: float = 50.0
+    transcription_batch_max_duration: float = 60.0  # longest packed Groq upload, in seconds
+    transcription_batch_gap: float = 1.0  # silence between packed segments, in seconds
+    transcription_cache_size: int = 1024  # transcripts kept in memory; 0 disables the memory tier
+    transcription_cache_path: Path = Path("transcription_cache.db")
+    transcription_cache_max_bytes: int = 0  # disk tier bound; 0 (the server default) disables it
+    session_idle_ttl: float = 900.0  # seconds without activity before a session is dropped
+    session_sweep_interval: float = 30.0
+    max_sessions: int = 1000
+    max_buffered_bytes: int = 512 * 1024 * 1024  # audio buffers across all sessions
+    max_transcripts_per_session: int = 200
+    session_store: str = "local"  # "local" (no snapshots), "memory" or "sqlite"
+    session_store_path: Path = Path("sessions.db")
+    session_affinity: bool = True  # each session is always routed to the same worker; off for uvicorn workers
 
     def __post_init__(self) -> None:
         if self.audio_path is not None:
             self.audio_path = Path(self.audio_path)
+        if self.journal_path is not None:
+            self.journal_path = Path(self.journal_path)
         self.output_dir = Path(self.output_dir)
+        self.session_store_path = Path(self.session_store_path)
+        self.transcription_cache_path = Path(self.transcription_cache_path)
+        self.vad_cache_dir = Path(self.vad_cache_dir)
+        for name in ("vad_onset", "vad_offset", "vad_min_duration_on", "vad_min_duration_off"):
+            if getattr(self, name) is not None:
+                setattr(self, name, float(getattr(self, name)))
         if self.segment_duration <= 0:
             raise ValueError("segment_duration must be positive")
+        if not 0 < self.min_segment_duration <= self.max_segment_duration:
+            raise ValueError("segment durations must satisfy 0 < min_segment_duration <= max_segment_duration")
+        if self.endpoint_pause <= 0 or self.endpoint_merge_gap < self.endpoint_pause or self.endpoint_padding < 0:
+            raise ValueError("endpointing requires endpoint_pause > 0, endpoint_merge_gap >= endpoint_pause and endpoint_padding >= 0")
         if self.whisper_task not in {"translate", "transcribe"}:
             raise ValueError("whisper_task must be 'translate' or 'transcribe'")
         if self.stream_sample_rate <= 0:
             raise ValueError("stream_sample_rate must be positive")
+        if self.workflow_concurrency < 1:
+            raise ValueError("workflow_concurrency must be at least 1")
+        if self.batch_vad_workers < 0:
+            raise ValueError("batch_vad_workers must not be negative")
+        if self.vad_window_duration < 0:
+            raise ValueError("vad_window_duration must not be negative")
+        if self.vad_window_duration and not 0 <= self.vad_window_overlap < self.vad_window_duration:
+            raise ValueError("vad_window_overlap must satisfy 0 <= overlap < vad_window_duration")
+        if any(value is not None and not 0 <= value <= 1 for value in (self.vad_onset, self.vad_offset)):
+            raise ValueError("vad_onset and vad_offset must be between 0 and 1")
+        if any(value is not None and value < 0 for value in (self.vad_min_duration_on, self.vad_min_duration_off)):
+            raise ValueError("vad_min_duration_on and vad_min_duration_off must not be negative")
+        if not 0 < self.calibration_min_duration <= self.calibration_max_duration:
+            raise ValueError("calibration durations must satisfy 0 < min <= max")
+        if min(self.ingest_workers, self.control_workers, self.max_in_flight_per_session, self.max_queued_chunks) < 1:
+            raise ValueError(
+                "ingest_workers, control_workers, max_in_flight_per_session and max_queued_chunks must be at least 1"
+            )
+        if self.ingest_retry_after <= 0:
+            raise ValueError("ingest_retry_after must be positive")
+        if self.stale_chunk_policy not in {"coalesce", "drop", "off"}:
+            raise ValueError("stale_chunk_policy must be 'coalesce', 'drop' or 'off'")
+        if self.torch_threads < 0:
+            raise ValueError("torch_threads must not be negative")
+        if self.vad_context_duration < 0:
+            raise ValueError("vad_context_duration must not be negative")
+        if self.vad_max_batch_size < 1:
+            raise ValueError("vad_max_batch_size must be at least 1")
+        if self.vad_max_batch_wait_ms < 0:
+            raise ValueError("vad_max_batch_wait_ms must not be negative")
+        if self.vad_pool_size < 0 or self.vad_threads_per_worker < 1:
+            raise ValueError("vad_pool_size must not be negative and vad_threads_per_worker must be at least 1")
+        if self.vad_pool_slot_duration <= self.vad_context_duration:
+            raise ValueError("vad_pool_slot_duration must exceed vad_context_duration")
+        if self.energy_gate_frame_ms <= 0 or self.energy_gate_min_rms < 0:
+            raise ValueError("energy_gate_frame_ms must be positive and energy_gate_min_rms not negative")
+        if not 0 <= self.energy_gate_max_zcr <= 1 or not 0 <= self.energy_gate_adapt_rate <= 1:
+            raise ValueError("energy_gate_max_zcr and energy_gate_adapt_rate must be between 0 and 1")
+        if self.energy_gate_min_active_frames < 1 or self.energy_gate_hangover < 0:
+            raise ValueError("energy_gate_min_active_frames must be at least 1 and energy_gate_hangover not negative")
+        if self.transcription_workers < 1:
+            raise ValueError("transcription_workers must be at least 1")
+        if self.upload_format not in {"wav", "flac", "opus"}:
+            raise ValueError("upload_format must be 'wav', 'flac' or 'opus'")
+        if self.groq_timeout <= 0:
+            raise ValueError("groq_timeout must be positive")
+        if self.groq_max_retries < 0:
+            raise ValueError("groq_max_retries must not be negative")
+        if self.groq_max_connections < 1 or self.transcription_concurrency < 1:
+            raise ValueError("groq_max_connections and transcription_concurrency must be at least 1")
+        if self.transcriber not in {"groq", "local"}:
+            raise ValueError("transcriber must be 'groq' or 'local'")
+        if self.local_whisper_threads < 0 or self.local_whisper_batch_size < 1:
+            raise ValueError("local_whisper_threads must not be negative and local_whisper_batch_size must be at least 1")
+        if self.transcription_batch_size < 1 or self.transcription_batch_wait_ms < 0:
+            raise ValueError("transcription_batch_size must be at least 1 and transcription_batch_wait_ms not negative")
+        if self.transcription_batch_max_duration <= 0 or self.transcription_batch_gap < 0:
+            raise ValueError("transcription_batch_max_duration must be positive and transcription_batch_gap not negative")
+        if self.transcription_cache_size < 0 or self.transcription_cache_max_bytes < 0:
+            raise ValueError("transcription cache sizes must not be negative")
+        if self.session_idle_ttl <= 0 or self.session_sweep_interval <= 0:
+            raise ValueError("session_idle_ttl and session_sweep_interval must be positive")
+        if self.max_sessions < 1 or self.max_buffered_bytes <= 0:
+            raise ValueError("max_sessions and max_buffered_bytes must be positive")
+        if self.max_transcripts_per_session < 1:
+            raise ValueError("max_transcripts_per_session must be at least 1")
+        if self.session_store not in {"local", "memory", "sqlite"}:
+            raise ValueError("session_store must be 'local', 'memory' or 'sqlite'")
+
+    @classmethod
+    def from_env(cls, prefix: str = "AVISO_", **overrides) -> "Settings":
+        """Build settings from ``AVISO_<FIELD>`` environment variables, e.g. AVISO_MAX_SESSIONS."""
+        values = {}
+        for item in fields(cls):
+            raw = os.getenv(f"{prefix}{item.name.upper()}")
+            if raw is None:
+                continue
+            default = item.default
+            if isinstance(default, bool):
+                values[item.name] = raw.strip().lower() in {"1", "true", "yes", "on"}
+            elif isinstance(default, (int, float, Path)):
+                values[item.name] = type(default)(raw)
+            else:
+                values[item.name] = raw
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def vad_hyperparameters(self) -> Dict[str, float]:
+        """VAD pipeline hyperparameters set here; the others keep the model's tuned values."""
+        values = {
+            "onset": self.vad_onset,
+            "offset": self.vad_offset,
+            "min_duration_on": self.vad_min_duration_on,
+            "min_duration_off": self.vad_min_duration_off,
+        }
+        return {name: value for name, value in values.items() if value is not None}
 
     @property
     def hf_token(self) -> str:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+from .segments import SpeechSegment
+
+
+def plan_segments(
+    timeline: Sequence[SpeechSegment],
+    audio_duration: float,
+    min_duration: float = 1.0,
+    max_duration: float = 15.0,
+    pause: float = 0.5,
+    merge_gap: float = 1.5,
+    padding: float = 0.1,
+) -> List[SpeechSegment]:
+    """Turn a VAD timeline into transcription segments that start and end at speech.
+
+    Speech regions separated by less than ``pause`` are joined, and regions shorter
+    than ``min_duration`` are joined with a neighbour up to ``merge_gap`` away, as
+    long as the result stays within ``max_duration``. Longer regions are split into
+    equal parts. Each segment keeps ``padding`` seconds of context on either side,
+    without overlapping its neighbours or leaving the recording.
+    """
+    merged: List[SpeechSegment] = []
+    for region in sorted(timeline, key=lambda item: item.start):
+        if merged:
+            last = merged[-1]
+            gap = region.start - last.end
+            short = last.end - last.start < min_duration or region.end - region.start < min_duration
+            fits = region.end - last.start <= max_duration
+            if fits and (gap < pause or (short and gap <= merge_gap)):
+                last.end = max(last.end, region.end)
+                continue
+        merged.append(SpeechSegment(start=region.start, end=region.end))
+
+    segments: List[SpeechSegment] = []
+    for region in merged:
+        length = region.end - region.start
+        parts = max(1, int(-(-length // max_duration)))
+        step = length / parts
+        for i in range(parts):
+            segments.append(SpeechSegment(start=region.start + i * step, end=region.start + (i + 1) * step))
+
+    padded: List[SpeechSegment] = []
+    for i, segment in enumerate(segments):
+        lower = (segments[i - 1].end + segment.start) / 2 if i else 0.0
+        upper = (segment.end + segments[i + 1].start) / 2 if i + 1 < len(segments) else audio_duration
+        padded.append(
+            SpeechSegment(
+                start=max(lower, segment.start - padding, 0.0),
+                end=min(upper, segment.end + padding, audio_duration),
+            )
+        )
+    return padded
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+
+@dataclass
+class EnergyGateState:
+    """Per-session noise floor and hangover carried across chunks."""
+
+    noise_floor: Optional[float] = None  # frame RMS of the background
+    hangover: int = 0  # samples still forwarded after the last plausible speech
+
+    def reset(self) -> None:
+        self.noise_floor = None
+        self.hangover = 0
+
+
+class EnergyGate:
+    """Cheap check in front of the neural VAD for chunks that are plainly silence.
+
+    The chunk is cut into frames and a frame counts as active when its RMS clears
+    both ``min_rms`` and the session's noise floor by ``snr_db``, and its
+    zero-crossing rate is at most ``max_zcr`` (broadband hiss and clicks cross zero
+    far more often than voiced speech). A chunk goes to the VAD when it has at least
+    ``min_active_frames`` active frames, or while ``hangover`` seconds have not passed
+    since the last one that did. The floor follows the quietest frames of each chunk:
+    it drops immediately and rises by ``adapt_rate`` of the difference per chunk.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_duration: float = 0.02,
+        min_rms: float = 0.002,
+        snr_db: float = 6.0,
+        max_zcr: float = 0.35,
+        min_active_frames: int = 2,
+        adapt_rate: float = 0.05,
+        hangover: float = 0.5,
+    ) -> None:
+        self.frame_size = max(1, int(frame_duration * sample_rate))
+        self.min_rms = min_rms
+        self.snr = 10.0 ** (snr_db / 20.0)
+        self.max_zcr = max_zcr
+        self.min_active_frames = min_active_frames
+        self.adapt_rate = adapt_rate
+        self.hangover_samples = int(hangover * sample_rate)
+        self.counters: Counter = Counter()
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> Optional["EnergyGate"]:
+        if not settings.energy_gate:
+            return None
+        return cls(
+            settings.stream_sample_rate,
+            frame_duration=settings.energy_gate_frame_ms / 1000.0,
+            min_rms=settings.energy_gate_min_rms,
+            snr_db=settings.energy_gate_snr_db,
+            max_zcr=settings.energy_gate_max_zcr,
+            min_active_frames=settings.energy_gate_min_active_frames,
+            adapt_rate=settings.energy_gate_adapt_rate,
+            hangover=settings.energy_gate_hangover,
+        )
+
+    def admit(self, chunk: np.ndarray, state: EnergyGateState) -> bool:
+        """Whether ``chunk`` may contain speech and should be scored by the VAD."""
+        count = len(chunk) // self.frame_size
+        active = 0
+        if count:
+            frames = chunk[: count * self.frame_size].reshape(count, self.frame_size)
+            rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / self.frame_size)
+            signs = np.signbit(frames)
+            zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1 or 1)
+
+            level = float(np.percentile(rms, 10))
+            floor = level if state.noise_floor is None else state.noise_floor
+            threshold = max(self.min_rms, floor * self.snr)
+            active = int(np.count_nonzero((rms >= threshold) & (zcr <= self.max_zcr)))
+
+            if level < floor:
+                floor = level
+            else:
+                floor += self.adapt_rate * (level - floor)
+            state.noise_floor = floor
+
+        if active >= self.min_active_frames:
+            # The hangover runs from the end of this chunk
+            state.hangover = self.hangover_samples
+            forward = True
+        else:
+            forward = state.hangover > 0
+            state.hangover = max(0, state.hangover - len(chunk))
+
+        with self._lock:
+            self.counters["forwarded" if forward else "gated"] += 1
+        return forward
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            counters = dict(self.counters)
+        total = counters.get("forwarded", 0) + counters.get("gated", 0)
+        return {**counters, "gated_ratio": counters.get("gated", 0) / total if total else 0.0}
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Optional
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class TranscriptionJob:
+    job_id: str
+    session_id: str
+    status: JobStatus = JobStatus.PENDING
+    result: Any = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False, compare=False)  # done once the job finished
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {JobStatus.DONE, JobStatus.FAILED}
+
+
+class TranscriptionQueue:
+    """Runs transcription jobs on a background thread pool.
+
+    Finished jobs stay queryable until ``history`` newer jobs have finished. Failed
+    jobs are logged and kept per session until :meth:`take_failures` reports them.
+    """
+
+    def __init__(self, max_workers: int = 4, history: int = 1000) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcription")
+        self._jobs: Dict[str, TranscriptionJob] = {}
+        self._finished: Deque[str] = deque()
+        self._failures: Dict[str, List[str]] = {}  # session id -> failed job ids not reported yet
+        self._history = history
+        self._lock = Lock()
+
+    def submit(self, session_id: str, work: Callable[[], Any]) -> TranscriptionJob:
+        job = TranscriptionJob(job_id=uuid.uuid4().hex, session_id=session_id)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def pending(self, session_id: str) -> List[TranscriptionJob]:
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id and not job.finished]
+
+    def backlog(self) -> int:
+        """Jobs submitted but not finished yet, across all sessions."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def take_failures(self, session_id: str) -> List[str]:
+        """Ids of the session's jobs that failed since the previous call."""
+        with self._lock:
+            return self._failures.pop(session_id, [])
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: TranscriptionJob, work: Callable[[], Any]) -> None:
+        job.status = JobStatus.RUNNING
+        try:
+            job.result = work()
+        except Exception as exc:
+            logger.exception("Transcription job %s of session %s failed", job.job_id, job.session_id)
+            job.error = str(exc)
+            job.status = JobStatus.FAILED
+        else:
+            job.status = JobStatus.DONE
+        with self._lock:
+            if job.status == JobStatus.FAILED:
+                self._failures.setdefault(job.session_id, []).append(job.job_id)
+            self._finished.append(job.job_id)
+            while len(self._finished) > self._history:
+                expired = self._jobs.pop(self._finished.popleft(), None)
+                if expired is not None and expired.job_id in self._failures.get(expired.session_id, ()):
+                    self._failures[expired.session_id].remove(expired.job_id)
+                    if not self._failures[expired.session_id]:
+                        del self._failures[expired.session_id]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import IO, Dict, List, Optional, Tuple
+
+from .audio_utils import AudioClip
+from .transcription import TranscriptionResult
+from .segments import SpeechSegment
+
+
+def audio_fingerprint(path: Path) -> dict:
+    """Identifies an input file cheaply enough to check on every resume."""
+    stat = Path(path).stat()
+    return {"audio": str(Path(path).resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+@dataclass
+class JournalState:
+    header: dict
+    segments: List[SpeechSegment]
+    completed: Dict[int, Tuple[AudioClip, TranscriptionResult]] = field(default_factory=dict)
+
+
+class ResultsJournal:
+    """Append-only JSONL record of an offline run.
+
+    The first line holds the input fingerprint, run parameters and VAD timeline;
+    every transcribed segment is appended (and flushed to disk) as it completes,
+    so an interrupted run can pick up where it stopped.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file: Optional[IO[str]] = None
+        self._lock = Lock()
+        self._valid_bytes: Optional[int] = None
+
+    def load(self) -> Optional[JournalState]:
+        if not self.path.exists():
+            return None
+        state: Optional[JournalState] = None
+        self._valid_bytes = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write from the interrupted run
+                self._valid_bytes += len(line)
+                if record.get("type") == "timeline":
+                    state = JournalState(
+                        header=record["header"],
+                        segments=[SpeechSegment(start=start, end=end) for start, end in record["segments"]],
+                    )
+                elif record.get("type") == "segment" and state is not None:
+                    path = record.get("path")
+                    clip = AudioClip(path=Path(path) if path else None, start=record["start"], end=record["end"])
+                    result = TranscriptionResult(text=record["text"], words_per_second=record["words_per_second"])
+                    state.completed[record["index"]] = (clip, result)
+        return state
+
+    def open(self, header: dict, segments: List[SpeechSegment], append: bool = False) -> None:
+        """Start writing; unless ``append``, any previous journal is replaced."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if append and self._valid_bytes is not None:
+            # Drop a partially written last record before appending after it
+            os.truncate(self.path, self._valid_bytes)
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+        if not append:
+            self._write(
+                {
+                    "type": "timeline",
+                    "header": header,
+                    "segments": [[segment.start, segment.end] for segment in segments],
+                }
+            )
+
+    def record(self, index: int, clip: AudioClip, result: TranscriptionResult) -> None:
+        self._write(
+            {
+                "type": "segment",
+                "index": index,
+                "start": clip.start,
+                "end": clip.end,
+                "path": str(clip.path) if clip.path is not None else None,
+                "text": result.text,
+                "words_per_second": result.words_per_second,
+            }
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("journal is not open")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
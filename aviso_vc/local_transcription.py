@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+import torch
+from transformers import WhisperForConditionalGeneration, WhisperProcessor
+
+from .audio_utils import resample_audio
+from .cache import TranscriptionCache
+from .transcription import CachingTranscriber
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+class LocalWhisperTranscriber(CachingTranscriber):
+    """Whisper running in-process on CPU through ``transformers``.
+
+    The model is loaded once and, with ``quantize``, its linear layers are converted
+    to int8 with dynamic quantization. Segments are decoded in batches of up to
+    ``batch_size`` per ``generate`` call; each is truncated to Whisper's 30 s window.
+    """
+
+    def __init__(
+        self,
+        model: str = "openai/whisper-small",
+        task: str = "transcribe",
+        language: Optional[str] = None,
+        quantize: bool = True,
+        num_threads: int = 0,
+        batch_size: int = 8,
+        cache: Optional[TranscriptionCache] = None,
+    ) -> None:
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+        self.model = model
+        self.task = task
+        self.language = language
+        self.batch_size = batch_size
+        self.cache = cache
+        self.processor = WhisperProcessor.from_pretrained(model)
+        network = WhisperForConditionalGeneration.from_pretrained(model)
+        network.eval()
+        if quantize:
+            quantization = getattr(torch, "ao", torch).quantization
+            network = quantization.quantize_dynamic(network, {torch.nn.Linear}, dtype=torch.qint8)
+        self.network = network
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "LocalWhisperTranscriber":
+        return cls(
+            model=settings.local_whisper_model,
+            task=settings.whisper_task,
+            language=settings.local_whisper_language or None,
+            quantize=settings.local_whisper_quantize,
+            num_threads=settings.local_whisper_threads,
+            batch_size=settings.local_whisper_batch_size,
+            cache=TranscriptionCache.from_settings(settings),
+        )
+
+    def warm_up(self) -> None:
+        # One second of silence runs the encoder and a short decode end to end
+        self._decode([np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)])
+
+    def _transcribe_samples(self, waveform: np.ndarray, sample_rate: int) -> str:
+        return self._transcribe_many([waveform], sample_rate)[0]
+
+    def _transcribe_many(self, waveforms: List[np.ndarray], sample_rate: int) -> List[str]:
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            waveforms = [resample_audio(waveform, sample_rate, WHISPER_SAMPLE_RATE) for waveform in waveforms]
+        texts: List[str] = []
+        for start in range(0, len(waveforms), self.batch_size):
+            texts.extend(self._decode(waveforms[start:start + self.batch_size]))
+        return texts
+
+    def _decode(self, waveforms: List[np.ndarray]) -> List[str]:
+        inputs = self.processor(
+            [np.asarray(waveform, dtype=np.float32) for waveform in waveforms],
+            sampling_rate=WHISPER_SAMPLE_RATE,
+            return_tensors="pt",
+            return_attention_mask=True,
+        )
+        with self._lock, torch.inference_mode():
+            tokens = self.network.generate(
+                inputs.input_features,
+                attention_mask=inputs.attention_mask,
+                task=self.task,
+                language=self.language,
+            )
+        return [text.strip() for text in self.processor.batch_decode(tokens, skip_special_tokens=True)]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; wide enough for sub-millisecond decoding and multi-second transcriptions
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage timings of the request being handled on this thread, if one is being recorded
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+    """Latency histograms and counters for the live path, rendered as Prometheus text.
+
+    ``stage`` times a step of chunk handling and ``wait`` records time spent blocked
+    on a lock or queue. Timings observed while a ``request`` block is open on the
+    same thread are also collected for that request, e.g. for a Server-Timing header.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "aviso") -> None:
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Counter = Counter()
+        self._lock = Lock()
+
+    def observe(self, family: str, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((family, name))
+            if histogram is None:
+                histogram = self._histograms[(family, name)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+
+    def wait(self, name: str, seconds: float) -> None:
+        self.observe("wait", name, seconds)
+
+    def increment(self, name: str, outcome: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[(name, outcome)] += amount
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage", name, perf_counter() - started)
+
+    @contextmanager
+    def locked(self, lock: Lock, name: str) -> Iterator[None]:
+        started = perf_counter()
+        with lock:
+            self.wait(name, perf_counter() - started)
+            yield
+
+    @contextmanager
+    def request(self) -> Iterator[Dict[str, float]]:
+        """Collect the stage and wait timings of one request into the yielded dict."""
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        try:
+            with self.stage("request"):
+                yield timings
+        finally:
+            _request_timings.reset(token)
+
+    def render(
+        self,
+        gauges: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[Tuple[str, str], int]] = None,
+    ) -> str:
+        """Prometheus text exposition format (version 0.0.4).
+
+        ``gauges`` and ``counters`` (keyed by name and outcome) are point-in-time
+        values kept elsewhere, rendered alongside the ones recorded here. Counters
+        with an empty outcome are rendered without a label.
+        """
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum) for key, h in self._histograms.items()}
+            counters = {**self._counters, **(counters or {})}
+        prefix = self.namespace
+        lines: List[str] = []
+        for family, label, help_text in (
+            ("stage", "stage", "Time spent in each step of live chunk handling."),
+            ("wait", "resource", "Time spent waiting for a lock or queue."),
+        ):
+            metric = f"{prefix}_{family}_seconds"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (kind, name), (counts, total) in sorted(histograms.items()):
+                if kind != family:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{{label}="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label}="{name}"}} {total!r}')
+                lines.append(f'{metric}_count{{{label}="{name}"}} {cumulative}')
+        names = sorted({name for name, _ in counters})
+        for name in names:
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter, outcome), value in sorted(counters.items()):
+                if counter == name:
+                    labels = f'{{outcome="{outcome}"}}' if outcome else ""
+                    lines.append(f"{metric}{labels} {value}")
+        for name, value in sorted((gauges or {}).items()):
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {value!r}"]
+        return "\n".join(lines) + "\n"
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Format request timings as an HTTP ``Server-Timing`` header value (milliseconds)."""
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items())
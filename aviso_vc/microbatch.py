@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import BoundedSemaphore, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ProcessBatch = Callable[[Sequence[Any]], List[Any]]
+
+
+@dataclass
+class _Request:
+    item: Any
+    future: Future = field(default_factory=Future)
+
+
+class MicroBatcher:
+    """Micro-batches items from many callers into single calls of ``process_batch``.
+
+    Callers block in :meth:`call` while a background thread collects requests for at
+    most ``max_wait`` seconds (or until ``max_batch_size`` are queued), passes them to
+    ``process_batch`` in one go and fans the per-item results back out. With
+    ``max_in_flight`` > 1 several batches are processed concurrently (for example one
+    per VAD worker process); while all are busy, new requests keep accumulating.
+    Streaming VAD windows and transcription segments are both batched this way.
+    """
+
+    def __init__(
+        self,
+        process_batch: ProcessBatch,
+        max_batch_size: int = 16,
+        max_wait: float = 0.005,
+        max_in_flight: int = 1,
+        name: str = "micro-batch",
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._slots = BoundedSemaphore(max_in_flight)
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=name)
+            if max_in_flight > 1
+            else None
+        )
+        self._queue: "Queue[Optional[_Request]]" = Queue()
+        self._stats_lock = Lock()
+        self._batch_sizes: Counter = Counter()
+        self._thread = Thread(target=self._run, name=f"{name}-collector", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        request = _Request(item=item)
+        self._queue.put(request)
+        return request.future
+
+    def call(self, item: Any) -> Any:
+        """Process ``item`` as part of the next batch and return its result."""
+        return self.submit(item).result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, object]:
+        with self._stats_lock:
+            sizes = dict(self._batch_sizes)
+        batches = sum(sizes.values())
+        items = sum(size * count for size, count in sizes.items())
+        return {
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": items / batches if batches else 0.0,
+            "mean_fill": items / (batches * self.max_batch_size) if batches else 0.0,
+            "batch_sizes": sizes,
+        }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            self._slots.acquire()
+            batch = [first]
+            stopping = False
+            deadline = monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Past the deadline, still take what queued up while waiting for a slot
+                remaining = deadline - monotonic()
+                try:
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            if self._executor is not None:
+                self._executor.submit(self._dispatch, batch)
+            else:
+                self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        with self._stats_lock:
+            self._batch_sizes[len(batch)] += 1
+        try:
+            results = self.process_batch([request.item for request in batch])
+        except Exception as exc:  # propagate to every waiting caller
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        finally:
+            self._slots.release()
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from threading import BoundedSemaphore
+from typing import Dict, List, Optional, Tuple
 
-from .audio_utils import AudioClip, load_audio, write_clip
+import numpy as np
+
+from .audio_utils import AudioClip, AudioSource, ClipWriter, clip_path, load_audio, slice_clip
+from .cache import TimelineCache
 from .config import Settings
-from .transcription import TranscriptionResult, WhisperTranscriber
+from .endpointing import plan_segments
+from .journal import ResultsJournal, audio_fingerprint
+from .transcription import Transcriber, TranscriptionResult, create_transcriber
 from .vad import SpeechSegment, VoiceActivityDetector
 
 
@@ -16,57 +23,259 @@ class ProcessedSegment:
     transcription: TranscriptionResult
 
 
+def detect_file(detector: VoiceActivityDetector, path: Path, settings: Settings) -> List[SpeechSegment]:
+    """Speech timeline of a file, walking overlapping windows when it is long."""
+    window = settings.vad_window_duration
+    source = AudioSource(path)
+    try:
+        if window and source.duration > window:
+            return detector.detect_windows(source.windows(window, settings.vad_window_overlap), source.sample_rate)
+    finally:
+        source.close()
+    return detector.detect(path)
+
+
 class VoiceActivityWorkflow:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        detector: Optional[VoiceActivityDetector] = None,
+        transcriber: Optional[Transcriber] = None,
+        verbose: bool = True,
+    ) -> None:
         self.settings = settings
         if self.settings.audio_path is None:
             raise ValueError("Settings.audio_path must be set when using VoiceActivityWorkflow")
-        self.detector = VoiceActivityDetector(settings.vad_model_id, settings.hf_token)
-        self.transcriber = WhisperTranscriber(settings.groq_api_key, model=settings.groq_model)
+        self._detector = detector
+        self.transcriber = transcriber or create_transcriber(settings)
+        self.verbose = verbose
+        self.timeline_cache = TimelineCache.from_settings(settings)
+        self._clip_writer: Optional[ClipWriter] = None
+        journal_path = settings.journal_path or settings.output_dir / f"{settings.audio_path.stem}.journal.jsonl"
+        self._journal = ResultsJournal(journal_path)
+
+    @property
+    def detector(self) -> VoiceActivityDetector:
+        # Only loaded when the timeline is not supplied or journaled
+        if self._detector is None:
+            self._detector = VoiceActivityDetector.from_pretrained(
+                self.settings.vad_model_id,
+                self.settings.hf_token,
+                hyperparameters=self.settings.vad_hyperparameters,
+            )
+        return self._detector
 
-    def run(self) -> List[ProcessedSegment]:
+    def run(self, segments: Optional[List[SpeechSegment]] = None) -> List[ProcessedSegment]:
+        """Transcribe the configured file; ``segments`` skips VAD with a precomputed timeline."""
         self.settings.ensure_output_dir()
-        audio, sample_rate = load_audio(self.settings.audio_path)
+        if self.settings.save_clips:
+            self._clip_writer = ClipWriter()
+        header = self._journal_header()
+        resumed = self._journal.load() if self.settings.resume else None
+        completed: Dict[int, ProcessedSegment] = {}
+        if resumed is not None and self._same_timeline(resumed.header, header):
+            segments = resumed.segments
+            if resumed.header.get("segmentation") == header["segmentation"]:
+                completed = {
+                    idx: ProcessedSegment(clip=clip, transcription=result)
+                    for idx, (clip, result) in resumed.completed.items()
+                }
+            self._log(f"Resuming from {self._journal.path}: {len(completed)} of {len(segments)} segments done.")
+        elif self.settings.resume:
+            self._log(f"No usable journal at {self._journal.path}; starting from scratch.")
+
+        window = self.settings.vad_window_duration
+        source = AudioSource(self.settings.audio_path)
+        try:
+            if window and source.duration > window:
+                # Long recordings are never decoded whole: clips are read back from the file on demand
+                audio, sample_rate = source, source.sample_rate
+            else:
+                audio, sample_rate = load_audio(self.settings.audio_path)
+            if segments is None:
+                segments = self._detect()
+            self._journal.open(header, segments, append=bool(completed))
+            results = self._process(segments, audio, sample_rate, completed)
+        finally:
+            source.close()
+            self._journal.close()
+            if self._clip_writer is not None:
+                self._clip_writer.close()
+                self._clip_writer = None
+        cache = self.transcriber.cache
+        if cache is not None and self.verbose:
+            stats = cache.stats()
+            print(
+                f"Transcription cache: {stats.get('memory_hits', 0) + stats.get('disk_hits', 0)} hits, "
+                f"{stats.get('misses', 0)} misses"
+            )
+        return results
+
+    def _process(
+        self,
+        segments: List[SpeechSegment],
+        audio,
+        sample_rate: int,
+        completed: Dict[int, ProcessedSegment],
+    ) -> List[ProcessedSegment]:
         audio_duration = len(audio) / sample_rate
-        segments = self.detector.detect(self.settings.audio_path)
         results: List[ProcessedSegment] = []
 
         if not segments:
-            print("No speech activity detected.")
+            self._log("No speech activity detected.")
             return results
 
+        if self.settings.endpointing:
+            segments = plan_segments(
+                segments,
+                audio_duration,
+                min_duration=self.settings.min_segment_duration,
+                max_duration=self.settings.max_segment_duration,
+                pause=self.settings.endpoint_pause,
+                merge_gap=self.settings.endpoint_merge_gap,
+                padding=self.settings.endpoint_padding,
+            )
+
+        if self.settings.workflow_concurrency > 1:
+            return self._run_concurrent(segments, audio, sample_rate, audio_duration, completed)
+
         for idx, segment in enumerate(segments, start=1):
-            clip = self._save_clip(segment, audio, sample_rate, audio_duration, idx)
-            if not clip:
+            if idx in completed:
+                results.append(completed[idx])
+                self._display_result(idx, results[-1])
                 continue
-            transcription = self.transcriber.transcribe(clip)
+            cut = self._cut_clip(segment, audio, sample_rate, audio_duration, idx)
+            if not cut:
+                continue
+            clip, samples = cut
+            transcription = self._transcribe(idx, clip, samples, sample_rate)
             results.append(ProcessedSegment(clip=clip, transcription=transcription))
             self._display_result(idx, results[-1])
         return results
 
-    def _save_clip(
+    def _run_concurrent(
+        self,
+        segments: List[SpeechSegment],
+        audio,
+        sample_rate: int,
+        audio_duration: float,
+        completed: Dict[int, ProcessedSegment],
+    ) -> List[ProcessedSegment]:
+        """Cut clips ahead while a bounded pool transcribes them, emitting results in segment order."""
+        concurrency = self.settings.workflow_concurrency
+        # Clips cut but not yet transcribed are capped so the producer cannot run away
+        lookahead = BoundedSemaphore(2 * concurrency)
+        pending: Dict[int, Tuple[AudioClip, Future]] = {}
+        results: List[ProcessedSegment] = []
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="workflow") as executor:
+            for idx, segment in enumerate(segments, start=1):
+                if idx in completed:
+                    future: Future = Future()
+                    future.set_result(completed[idx].transcription)
+                    pending[idx] = (completed[idx].clip, future)
+                    self._emit_ready(pending, results, wait=False)
+                    continue
+                lookahead.acquire()
+                cut = self._cut_clip(segment, audio, sample_rate, audio_duration, idx)
+                if not cut:
+                    lookahead.release()
+                    continue
+                clip, samples = cut
+                future = executor.submit(self._transcribe, idx, clip, samples, sample_rate)
+                future.add_done_callback(lambda _: lookahead.release())
+                pending[idx] = (clip, future)
+                self._emit_ready(pending, results, wait=False)
+            self._emit_ready(pending, results, wait=True)
+        return results
+
+    def _detect(self) -> List[SpeechSegment]:
+        path = self.settings.audio_path
+        if self.timeline_cache is None:
+            return detect_file(self.detector, path, self.settings)
+        key = self.timeline_cache.key(path, self.settings)
+        segments = self.timeline_cache.get(key)
+        if segments is not None:
+            self._log(f"Reusing cached VAD timeline ({len(segments)} segments).")
+            return segments
+        segments = detect_file(self.detector, path, self.settings)
+        self.timeline_cache.put(key, segments)
+        return segments
+
+    def _transcribe(self, idx: int, clip: AudioClip, samples: np.ndarray, sample_rate: int) -> TranscriptionResult:
+        transcription = self.transcriber.transcribe_waveform(samples, sample_rate)
+        self._journal.record(idx, clip, transcription)
+        return transcription
+
+    def _journal_header(self) -> dict:
+        return {
+            **audio_fingerprint(self.settings.audio_path),
+            "vad_model_id": self.settings.vad_model_id,
+            "vad_window_duration": self.settings.vad_window_duration,
+            "vad_window_overlap": self.settings.vad_window_overlap,
+            "segmentation": self._segmentation(),
+        }
+
+    def _segmentation(self) -> dict:
+        """Settings that decide how the timeline is cut into clips."""
+        settings = self.settings
+        if not settings.endpointing:
+            return {"segment_duration": settings.segment_duration}
+        return {
+            "endpoint_pause": settings.endpoint_pause,
+            "endpoint_merge_gap": settings.endpoint_merge_gap,
+            "endpoint_padding": settings.endpoint_padding,
+            "min_segment_duration": settings.min_segment_duration,
+            "max_segment_duration": settings.max_segment_duration,
+        }
+
+    @staticmethod
+    def _same_timeline(previous: dict, current: dict) -> bool:
+        """Whether a journaled VAD timeline is still valid for the current input and settings."""
+        return all(previous.get(key) == value for key, value in current.items() if key != "segmentation")
+
+    def _emit_ready(
+        self,
+        pending: Dict[int, Tuple[AudioClip, Future]],
+        results: List[ProcessedSegment],
+        wait: bool,
+    ) -> None:
+        for idx in sorted(pending):
+            clip, future = pending[idx]
+            if not wait and not future.done():
+                return
+            del pending[idx]
+            results.append(ProcessedSegment(clip=clip, transcription=future.result()))
+            self._display_result(idx, results[-1])
+
+    def _cut_clip(
         self,
         segment: SpeechSegment,
         audio,
         sample_rate: int,
         audio_duration: float,
         idx: int,
-    ) -> AudioClip | None:
+    ) -> Tuple[AudioClip, np.ndarray] | None:
+        """Slice a segment out of the audio, queueing it for disk when clips are saved."""
         start_time = max(0.0, float(segment.start))
-        end_time = min(audio_duration, start_time + self.settings.segment_duration)
-        duration = end_time - start_time
-        return write_clip(
-            audio=audio,
-            sample_rate=sample_rate,
-            start_time=start_time,
-            duration=duration,
-            destination=self.settings.output_dir,
-            prefix="segment",
-            index=idx,
-        )
+        if self.settings.endpointing:
+            end_time = min(audio_duration, float(segment.end))
+        else:
+            end_time = min(audio_duration, start_time + self.settings.segment_duration)
+        cut = slice_clip(audio, sample_rate, start_time, end_time - start_time)
+        if cut is not None and self._clip_writer is not None:
+            clip, samples = cut
+            clip.path = clip_path(self.settings.output_dir, "segment", idx)
+            self._clip_writer.submit(samples, sample_rate, clip.path)
+        return cut
 
-    @staticmethod
-    def _display_result(idx: int, processed: ProcessedSegment) -> None:
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
+    def _display_result(self, idx: int, processed: ProcessedSegment) -> None:
+        if not self.verbose:
+            return
         clip = processed.clip
         transcription = processed.transcription
         print(
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional
+
+
+class SessionState(str, Enum):
+    LISTENING = "listening"
+    RECORDING = "recording"
+    CALIBRATING = "calibrating"
+
+
+@dataclass
+class SessionTranscript:
+    number: int
+    text: str
+    words_per_second: float
+    chars_per_second: float
+    is_below_threshold: bool = False
+
+
+@dataclass
+class ChunkResult:
+    state: SessionState
+    transcripts: List[SessionTranscript]  # finished since the previous chunk
+    job_id: Optional[str] = None  # background transcription started by this chunk
+    failed_jobs: List[str] = field(default_factory=list)  # background transcriptions failed since the previous chunk
+    warning_active: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per stage of this request
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List
+
+
+@dataclass
+class SpeechSegment:
+    start: float
+    end: float
+
+
+def merge_segments(segments: Iterable[SpeechSegment]) -> List[SpeechSegment]:
+    """Union of possibly overlapping segments, sorted by start time."""
+    merged: List[SpeechSegment] = []
+    for segment in sorted(segments, key=lambda item: item.start):
+        if merged and segment.start <= merged[-1].end:
+            merged[-1].end = max(merged[-1].end, segment.end)
+        else:
+            merged.append(SpeechSegment(start=segment.start, end=segment.end))
+    return merged
@@ -1,32 +1,30 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass, field
-from enum import Enum
+from dataclasses import asdict, dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from threading import Lock
-from typing import Dict, List, Optional
+from time import perf_counter
+from typing import Callable, ContextManager, Dict, List, Optional
 
 import numpy as np
 
-from .audio_utils import int16_to_float32, resample_audio
+from .audio_utils import StreamingResampler, int16_to_float32
+from .buffers import AudioBuffer
 from .config import Settings
-from .transcription import WhisperTranscriber
-from .vad import VoiceActivityDetector
+from .energy_gate import EnergyGate, EnergyGateState
+from .jobs import TranscriptionJob, TranscriptionQueue
+from .metrics import Metrics
+from .results import ChunkResult, SessionState, SessionTranscript
+from .sessions import SessionManager
+from .store import SessionSnapshot, create_session_store
+from .transcription import BatchingTranscriber, Transcriber, TranscriptionResult, create_transcriber
+from .vad import SpeechSegment, StreamingVADState, VoiceActivityDetector
+from .vad_pool import VADProcessPool
 
 
-class SessionState(str, Enum):
-    LISTENING = "listening"
-    RECORDING = "recording"
-    CALIBRATING = "calibrating"
-
-
-@dataclass
-class SessionTranscript:
-    number: int
-    text: str
-    words_per_second: float
-    chars_per_second: float
-    is_below_threshold: bool = False
+SAVE_ATTEMPTS = 3  # a background transcript is re-applied this often when other workers save first
 
 
 @dataclass
@@ -34,87 +32,248 @@ class AudioSession:
     session_id: str
     settings: Settings
     detector: VoiceActivityDetector
-    transcriber: WhisperTranscriber
+    transcriber: Transcriber
     state: SessionState = SessionState.LISTENING
-    buffer: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    buffer: Optional[AudioBuffer] = field(default=None, repr=False)
     transcripts: List[SessionTranscript] = field(default_factory=list)
     calibration_baseline: Optional[float] = None  # chars per second baseline
     calibration_duration: Optional[float] = None  # duration of calibration recording
     warning_active: bool = False  # True when below threshold warning is active
+    vad_state: StreamingVADState = field(default_factory=StreamingVADState, repr=False)
+    resampler: Optional[StreamingResampler] = field(default=None, repr=False)
+    jobs: Optional[TranscriptionQueue] = field(default=None, repr=False)
+    on_change: Optional[Callable[["AudioSession"], bool]] = field(default=None, repr=False)
+    on_refresh: Optional[Callable[["AudioSession"], None]] = field(default=None, repr=False)
+    gate: Optional[EnergyGate] = field(default=None, repr=False)
+    gate_state: EnergyGateState = field(default_factory=EnergyGateState, repr=False)
+    metrics: Optional[Metrics] = field(default=None, repr=False)
     _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
-    _completed: int = 0
-
-    def ingest_bytes(self, payload: bytes, sample_rate: int) -> Optional[SessionTranscript]:
-        waveform = int16_to_float32(payload)
+    _segment_count: int = 0
+    _undelivered: List[SessionTranscript] = field(default_factory=list, repr=False)
+    _version: int = 0
+    _saved_generation: int = -1  # buffer generation and length covered by the last snapshot
+    _saved_samples: int = 0
+    _transcripts_saved: bool = False
+    _speech_start: int = 0  # endpointing: buffer offsets of the speech being recorded
+    _speech_end: int = 0
+
+    def __post_init__(self) -> None:
+        if self.buffer is None:
+            # Large enough for the longest segment or calibration recording
+            max_duration = max(self.settings.segment_duration, self.settings.calibration_max_duration)
+            if self.settings.endpointing:
+                max_duration = max(max_duration, self.settings.max_segment_duration)
+            self.buffer = AudioBuffer(int(max_duration * self.settings.stream_sample_rate))
+
+    def ingest_bytes(self, payload: bytes, sample_rate: int) -> ChunkResult:
+        with self._stage("int16_to_float32"):
+            waveform = int16_to_float32(payload)
         return self.ingest_waveform(waveform, sample_rate)
 
-    def ingest_base64(self, payload: str, sample_rate: int) -> Optional[SessionTranscript]:
-        data = base64.b64decode(payload)
+    def ingest_base64(self, payload: str, sample_rate: int) -> ChunkResult:
+        with self._stage("decode_base64"):
+            data = base64.b64decode(payload)
         return self.ingest_bytes(data, sample_rate)
 
-    def ingest_waveform(self, waveform: np.ndarray, sample_rate: int) -> Optional[SessionTranscript]:
-        with self._lock:
-            chunk = resample_audio(waveform, sample_rate, self.settings.stream_sample_rate)
+    def ingest_waveform(self, waveform: np.ndarray, sample_rate: int) -> ChunkResult:
+        job_id: Optional[str] = None
+        with self._locked():
+            with self._stage("resample"):
+                chunk = self._resample(waveform, sample_rate)
             if len(chunk) == 0:
-                return None
+                return self._chunk_result(job_id)
 
             # Handle calibration mode
             if self.state == SessionState.CALIBRATING:
-                self.buffer = np.concatenate((self.buffer, chunk))
-                return None
+                self.buffer.append(chunk)
+                return self._chunk_result(job_id)
 
             # Normal listening/recording flow
             if self.state == SessionState.LISTENING:
-                segments = self.detector.detect_waveform(chunk, self.settings.stream_sample_rate)
+                segments = self._detect(chunk)
                 if segments:
                     self.state = SessionState.RECORDING
-                    self.buffer = chunk.copy()
-                return None
+                    self.buffer.clear()
+                    self.buffer.append(chunk)
+                    if self.settings.endpointing:
+                        # Keep the VAD state running: it decides where the segment ends
+                        padding = int(self.settings.endpoint_padding * self.settings.stream_sample_rate)
+                        self._speech_start = max(0, self._to_samples(segments[0].start) - padding)
+                        self._speech_end = self._speech_end_in(segments, 0, len(chunk))
+                    else:
+                        self.vad_state.reset()
+                return self._chunk_result(job_id)
 
             if self.state == SessionState.RECORDING:
-                self.buffer = np.concatenate((self.buffer, chunk))
+                if self.settings.endpointing:
+                    audio = self._endpoint(chunk)
+                else:
+                    self.buffer.append(chunk)
 
-                # Use calibration duration if available, otherwise use default segment duration
-                target_duration = self.calibration_duration if self.calibration_duration else self.settings.segment_duration
-                target_samples = int(target_duration * self.settings.stream_sample_rate)
+                    # Use calibration duration if available, otherwise use default segment duration
+                    target_duration = self.calibration_duration if self.calibration_duration else self.settings.segment_duration
+                    target_samples = int(target_duration * self.settings.stream_sample_rate)
+                    audio = self.buffer.detach(target_samples) if len(self.buffer) >= target_samples else None
 
-                if len(self.buffer) >= target_samples:
-                    audio = self.buffer[:target_samples]
-                    self.buffer = np.zeros(0, dtype=np.float32)
+                if audio is not None:
                     self.state = SessionState.LISTENING
-                    result = self.transcriber.transcribe_waveform(
-                        audio, self.settings.stream_sample_rate
-                    )
-
-                    # Calculate chars per second
-                    duration = len(audio) / self.settings.stream_sample_rate
-                    chars_per_second = len(result.text) / duration if duration > 0 else 0.0
-
-                    # Check if below threshold (50% of calibration baseline)
-                    is_below_threshold = False
-                    if self.calibration_baseline is not None and self.calibration_baseline > 0:
-                        threshold = self.calibration_baseline * 0.5
-                        if chars_per_second < threshold:
-                            is_below_threshold = True
-                            self.warning_active = True
-
-                    self._completed += 1
-                    transcript = SessionTranscript(
-                        number=self._completed,
-                        text=result.text,
-                        words_per_second=result.words_per_second,
-                        chars_per_second=chars_per_second,
-                        is_below_threshold=is_below_threshold,
-                    )
-                    self.transcripts.append(transcript)
-                    return transcript
+                    self._segment_count += 1
+                    number = self._segment_count
+
+                    if self.jobs is not None:
+                        # Transcribe in the background; the session keeps listening meanwhile
+                        queued = perf_counter()
+                        job = self.jobs.submit(
+                            self.session_id, lambda: self._transcribe_segment(number, audio, queued)
+                        )
+                        job_id = job.job_id
+                    else:
+                        result = self._transcribe(audio)
+                        self._record_transcript(number, audio, result)
+            return self._chunk_result(job_id)
+
+    def _detect(self, chunk: np.ndarray) -> List[SpeechSegment]:
+        if self.gate is not None and self.state == SessionState.LISTENING and not self.vad_state.active:
+            with self._stage("energy_gate"):
+                admitted = self.gate.admit(chunk, self.gate_state)
+            if not admitted:
+                if self.settings.vad_streaming:
+                    self.detector.skip_streaming(chunk, self.vad_state)
+                return []
+        with self._stage("vad"):
+            if self.settings.vad_streaming:
+                return self.detector.detect_streaming(chunk, self.settings.stream_sample_rate, self.vad_state)
+            return self.detector.detect_waveform(chunk, self.settings.stream_sample_rate)
+
+    def _endpoint(self, chunk: np.ndarray) -> Optional[np.ndarray]:
+        """Record ``chunk`` and return the finished segment once speech has paused long enough.
+
+        Short segments wait up to ``endpoint_merge_gap`` for more speech to join them;
+        leading and trailing silence beyond ``endpoint_padding`` is cut off.
+        """
+        settings = self.settings
+        offset = len(self.buffer)
+        kept = self.buffer.append(chunk)
+        speech_end = self._speech_end_in(self._detect(chunk), offset, kept)
+        if speech_end is not None:
+            self._speech_end = speech_end
+        silence = len(self.buffer) - self._speech_end
+        speech = self._speech_end - self._speech_start
+        full = (
+            len(self.buffer) - self._speech_start >= self._to_samples(settings.max_segment_duration)
+            or len(self.buffer) >= self.buffer.capacity
+        )
+        paused = silence >= self._to_samples(settings.endpoint_pause) and speech >= self._to_samples(
+            settings.min_segment_duration
+        )
+        if not (full or paused or silence >= self._to_samples(settings.endpoint_merge_gap)):
+            return None
+        end = min(len(self.buffer), self._speech_end + self._to_samples(settings.endpoint_padding))
+        return self.buffer.detach(end)[self._speech_start:]
+
+    def _speech_end_in(self, segments: List[SpeechSegment], offset: int, length: int) -> Optional[int]:
+        if not segments:
             return None
+        return offset + min(length, self._to_samples(max(segment.end for segment in segments)))
+
+    def _to_samples(self, seconds: float) -> int:
+        return int(seconds * self.settings.stream_sample_rate)
+
+    def _resample(self, waveform: np.ndarray, sample_rate: int) -> np.ndarray:
+        target_sr = self.settings.stream_sample_rate
+        if sample_rate == target_sr:
+            return np.asarray(waveform, dtype=np.float32)
+        if self.resampler is None or self.resampler.source_sr != sample_rate:
+            self.resampler = StreamingResampler(sample_rate, target_sr)
+        return self.resampler.process(waveform)
+
+    def _transcribe(self, audio: np.ndarray) -> TranscriptionResult:
+        try:
+            with self._stage("transcribe"):
+                result = self.transcriber.transcribe_waveform(audio, self.settings.stream_sample_rate)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.increment("transcriptions", "error")
+            raise
+        if self.metrics is not None:
+            self.metrics.increment("transcriptions", "ok")
+        return result
+
+    def _transcribe_segment(self, number: int, audio: np.ndarray, queued: float) -> SessionTranscript:
+        if self.metrics is not None:
+            self.metrics.wait("transcription_queue", perf_counter() - queued)
+        result = self._transcribe(audio)
+        # Other workers may have changed the session while this job ran: apply the
+        # transcript to the newest snapshot, and again if a concurrent save wins
+        for _ in range(SAVE_ATTEMPTS):
+            if self.on_refresh is not None:
+                self.on_refresh(self)
+            with self._locked():
+                transcript = self._record_transcript(number, audio, result)
+            if self.on_change is None or self.on_change(self):
+                break
+        return transcript
+
+    def _record_transcript(
+        self, number: int, audio: np.ndarray, result: TranscriptionResult
+    ) -> SessionTranscript:
+        # Calculate chars per second
+        duration = len(audio) / self.settings.stream_sample_rate
+        chars_per_second = len(result.text) / duration if duration > 0 else 0.0
+
+        # Check if below threshold (50% of calibration baseline)
+        is_below_threshold = False
+        if self.calibration_baseline is not None and self.calibration_baseline > 0:
+            threshold = self.calibration_baseline * 0.5
+            if chars_per_second < threshold:
+                is_below_threshold = True
+                self.warning_active = True
+
+        transcript = SessionTranscript(
+            number=number,
+            text=result.text,
+            words_per_second=result.words_per_second,
+            chars_per_second=chars_per_second,
+            is_below_threshold=is_below_threshold,
+        )
+        # A retried save records the same segment again
+        self.transcripts = [item for item in self.transcripts if item.number != number]
+        self._undelivered = [item for item in self._undelivered if item.number != number]
+        self.transcripts.append(transcript)
+        # Background jobs may finish out of order
+        self.transcripts.sort(key=lambda item: item.number)
+        del self.transcripts[:-self.settings.max_transcripts_per_session]
+        self._transcripts_saved = False
+        self._undelivered.append(transcript)
+        return transcript
+
+    def _stage(self, name: str) -> ContextManager:
+        return self.metrics.stage(name) if self.metrics is not None else nullcontext()
+
+    def _locked(self) -> ContextManager:
+        return self.metrics.locked(self._lock, "session_lock") if self.metrics is not None else self._lock
+
+    def _chunk_result(self, job_id: Optional[str]) -> ChunkResult:
+        delivered, self._undelivered = self._undelivered, []
+        return ChunkResult(
+            state=self.state,
+            transcripts=delivered,
+            job_id=job_id,
+            failed_jobs=self.jobs.take_failures(self.session_id) if self.jobs is not None else [],
+            warning_active=self.warning_active,
+        )
+
+    def poll(self) -> ChunkResult:
+        """Transcripts finished since the last chunk, without ingesting audio."""
+        with self._locked():
+            return self._chunk_result(None)
 
     def start_calibration(self) -> None:
         """Start calibration recording."""
         with self._lock:
             self.state = SessionState.CALIBRATING
-            self.buffer = np.zeros(0, dtype=np.float32)
+            self.buffer.clear()
+            self.vad_state.reset()
             self.calibration_baseline = None
             self.calibration_duration = None
 
@@ -133,7 +292,7 @@ class AudioSession:
                 self.calibration_baseline = 15.0  # Default baseline
                 self.calibration_duration = 10.0  # Default duration
                 self.state = SessionState.LISTENING
-                self.buffer = np.zeros(0, dtype=np.float32)
+                self.buffer.clear()
                 return {
                     "success": True,
                     "baseline": 15.0,
@@ -142,22 +301,22 @@ class AudioSession:
                     "character_count": 35,
                 }
 
-            # Validate duration (5-20 seconds)
-            if duration < 5.0:
+            # Validate duration (5-20 seconds by default)
+            min_duration = self.settings.calibration_min_duration
+            max_duration = self.settings.calibration_max_duration
+            if duration < min_duration:
                 self.state = SessionState.LISTENING
-                self.buffer = np.zeros(0, dtype=np.float32)
-                return {"error": "Calibration too short. Minimum 5 seconds required."}
+                self.buffer.clear()
+                return {"error": f"Calibration too short. Minimum {min_duration:g} seconds required."}
 
-            if duration > 20.0:
-                # Trim to 20 seconds
-                max_samples = int(20.0 * self.settings.stream_sample_rate)
-                self.buffer = self.buffer[:max_samples]
-                duration = 20.0
+            audio = self.buffer.view()
+            if duration > max_duration:
+                # Trim to the maximum calibration length
+                audio = audio[:int(max_duration * self.settings.stream_sample_rate)]
+                duration = max_duration
 
             # Transcribe the calibration audio
-            result = self.transcriber.transcribe_waveform(
-                self.buffer, self.settings.stream_sample_rate
-            )
+            result = self._transcribe(audio)
 
             # Calculate baseline chars per second
             chars_per_second = len(result.text) / duration if duration > 0 else 0.0
@@ -165,7 +324,7 @@ class AudioSession:
             self.calibration_baseline = chars_per_second
             self.calibration_duration = duration
             self.state = SessionState.LISTENING
-            self.buffer = np.zeros(0, dtype=np.float32)
+            self.buffer.clear()
 
             return {
                 "success": True,
@@ -180,31 +339,266 @@ class AudioSession:
         with self._lock:
             self.warning_active = False
 
+    @property
+    def version(self) -> int:
+        """Version of the latest snapshot taken or restored."""
+        return self._version
+
+    def snapshot(self, full: bool = False) -> SessionSnapshot:
+        """The changes since the previous snapshot: new samples, and transcripts if any finished.
+
+        ``full`` snapshots the whole buffer and every transcript instead.
+        """
+        with self._lock:
+            self._version += 1
+            if full or self.buffer.generation != self._saved_generation:
+                self._saved_generation, self._saved_samples = self.buffer.generation, 0
+            if full:
+                self._transcripts_saved = False
+            snapshot = SessionSnapshot(
+                session_id=self.session_id,
+                state=self.state.value,
+                calibration_baseline=self.calibration_baseline,
+                calibration_duration=self.calibration_duration,
+                warning_active=self.warning_active,
+                segment_count=self._segment_count,
+                transcripts=None if self._transcripts_saved else [asdict(t) for t in self.transcripts],
+                buffer=self.buffer.view()[self._saved_samples:].tobytes(),
+                buffer_offset=self._saved_samples,
+                version=self._version,
+            )
+            self._saved_samples = len(self.buffer)
+            self._transcripts_saved = True
+            return snapshot
+
+    def restore(self, snapshot: SessionSnapshot, force: bool = False) -> None:
+        """Adopt a snapshot saved by this or another worker, unless ours is newer.
+
+        ``force`` also adopts a snapshot of the same version, which is how a save
+        that lost to another worker's gets discarded.
+        """
+        with self._lock:
+            if snapshot.version < self._version or (snapshot.version == self._version and not force):
+                return
+            self.state = SessionState(snapshot.state)
+            self.calibration_baseline = snapshot.calibration_baseline
+            self.calibration_duration = snapshot.calibration_duration
+            self.warning_active = snapshot.warning_active
+            self._segment_count = snapshot.segment_count
+            self.transcripts = [SessionTranscript(**t) for t in snapshot.transcripts]
+            self.buffer.clear()
+            self.buffer.append(np.frombuffer(snapshot.buffer, dtype=np.float32))
+            self._saved_generation, self._saved_samples = self.buffer.generation, len(self.buffer)
+            self._transcripts_saved = True
+            # Streaming VAD and resampler history are not carried across workers
+            self.vad_state.reset()
+            self.resampler = None
+            self._speech_start, self._speech_end = 0, len(self.buffer)
+            self._version = snapshot.version
+
 
 class AudioEngine:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        detector: Optional[VoiceActivityDetector] = None,
+        transcriber: Optional[Transcriber] = None,
+    ) -> None:
+        """Load the models named by ``settings``, unless a detector or transcriber is given."""
+        started = perf_counter()
         self.settings = settings
-        self.detector = VoiceActivityDetector(settings.vad_model_id, settings.hf_token)
-        self.transcriber = WhisperTranscriber(settings.groq_api_key, model=settings.groq_model)
-        self.sessions: Dict[str, AudioSession] = {}
-        self._lock = Lock()
+        self.metrics = Metrics()
+        # Fork VAD workers before this process starts threads
+        self.vad_pool = (
+            VADProcessPool(
+                settings.vad_model_id,
+                settings.hf_token,
+                num_workers=settings.vad_pool_size,
+                threads_per_worker=settings.vad_threads_per_worker,
+                max_batch_samples=int(settings.vad_pool_slot_duration * settings.stream_sample_rate),
+                hyperparameters=settings.vad_hyperparameters,
+            )
+            if settings.vad_pool_size and detector is None
+            else None
+        )
+        if self.vad_pool is not None:
+            # The workers run all inference, so this process does not load the model
+            detector = VoiceActivityDetector(None, context_duration=settings.vad_context_duration)
+        elif detector is None:
+            detector = VoiceActivityDetector.from_pretrained(
+                settings.vad_model_id,
+                settings.hf_token,
+                context_duration=settings.vad_context_duration,
+                hyperparameters=settings.vad_hyperparameters,
+            )
+        self.detector = detector
+        self.detector.metrics = self.metrics
+        if self.vad_pool is not None:
+            self.detector.use_pool(self.vad_pool)
+        if settings.vad_streaming and settings.vad_batching:
+            self.detector.enable_batching(
+                max_batch_size=settings.vad_max_batch_size,
+                max_wait=settings.vad_max_batch_wait_ms / 1000.0,
+            )
+        self.transcriber = transcriber if transcriber is not None else create_transcriber(settings)
+        self.gate = EnergyGate.from_settings(settings)
+        self.jobs = (
+            TranscriptionQueue(max_workers=settings.transcription_workers)
+            if settings.async_transcription
+            else None
+        )
+        self.sessions = SessionManager(
+            self._new_session,
+            idle_ttl=settings.session_idle_ttl,
+            max_sessions=settings.max_sessions,
+            max_buffered_bytes=settings.max_buffered_bytes,
+            sweep_interval=settings.session_sweep_interval,
+            store=create_session_store(settings),
+            affinity=settings.session_affinity,
+        )
+        self.sessions.start()
+        self.startup_timings: Dict[str, float] = {"construct": perf_counter() - started}
+
+    def _new_session(self, session_id: str) -> AudioSession:
+        return AudioSession(
+            session_id=session_id,
+            settings=self.settings,
+            detector=self.detector,
+            transcriber=self.transcriber,
+            jobs=self.jobs,
+            on_change=self.sessions.save,
+            on_refresh=self.sessions.refresh,
+            gate=self.gate,
+            metrics=self.metrics,
+        )
 
     def _get_session(self, session_id: str) -> AudioSession:
-        with self._lock:
-            session = self.sessions.get(session_id)
-            if session is None:
-                session = AudioSession(
-                    session_id=session_id,
-                    settings=self.settings,
-                    detector=self.detector,
-                    transcriber=self.transcriber,
-                )
-                self.sessions[session_id] = session
-            return session
-
-    def process_chunk(self, session_id: str, payload_b64: str, sample_rate: int) -> Optional[SessionTranscript]:
+        return self.sessions.get_or_create(session_id)
+
+    def create_session(self, session_id: str) -> AudioSession:
         session = self._get_session(session_id)
-        return session.ingest_base64(payload_b64, sample_rate)
+        self.sessions.save(session)
+        return session
+
+    def warm_up(self) -> Dict[str, float]:
+        """Set thread counts and run dummy inference so the first request is not slow.
+
+        Returns the seconds spent per step, which are also kept in ``startup_timings``.
+        """
+        settings = self.settings
+        if settings.torch_threads:
+            import torch
+
+            torch.set_num_threads(settings.torch_threads)
+
+        started = perf_counter()
+        silence = np.zeros(int((settings.vad_context_duration + 1.0) * settings.stream_sample_rate), dtype=np.float32)
+        if settings.vad_streaming:
+            # One window per pool worker so that every process runs its first forward pass
+            workers = len(self.vad_pool) if self.vad_pool is not None else 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda _: self.detector.score_windows([silence]), range(workers)))
+        else:
+            self.detector.detect_waveform(silence, settings.stream_sample_rate)
+        self.startup_timings["vad_warm_up"] = perf_counter() - started
+
+        started = perf_counter()
+        self.transcriber.warm_up()
+        self.startup_timings["transcriber_warm_up"] = perf_counter() - started
+        return dict(self.startup_timings)
+
+    def close(self) -> None:
+        """Stop background threads."""
+        self.sessions.stop()
+        if self.jobs is not None:
+            self.jobs.shutdown(wait=False)
+        if self.detector.batcher is not None:
+            self.detector.batcher.close()
+        if self.vad_pool is not None:
+            self.vad_pool.close()
+        self.transcriber.close()
+
+    def stats(self) -> dict:
+        """Runtime statistics for monitoring."""
+        batcher = self.detector.batcher
+        cache = self.transcriber.cache
+        return {
+            "startup": dict(self.startup_timings),
+            "sessions": self.sessions.stats(),
+            "energy_gate": self.gate.stats() if self.gate is not None else None,
+            "vad_batching": batcher.stats() if batcher is not None else None,
+            "transcription_cache": cache.stats() if cache is not None else None,
+            "transcription_batching": (
+                self.transcriber.stats() if isinstance(self.transcriber, BatchingTranscriber) else None
+            ),
+        }
+
+    def process_chunk(self, session_id: str, payload_b64: str, sample_rate: int) -> ChunkResult:
+        with self.metrics.request() as timings:
+            session = self._get_session(session_id)
+            result = session.ingest_base64(payload_b64, sample_rate)
+            with self.metrics.stage("session_save"):
+                self.sessions.save(session)
+            # Growing sessions count against the byte budget, not only new ones
+            self.sessions.trim()
+        result.timings = timings
+        return result
+
+    def process_bytes(self, session_id: str, payload: bytes, sample_rate: int) -> ChunkResult:
+        with self.metrics.request() as timings:
+            session = self._get_session(session_id)
+            result = session.ingest_bytes(payload, sample_rate)
+            with self.metrics.stage("session_save"):
+                self.sessions.save(session)
+            self.sessions.trim()
+        result.timings = timings
+        return result
+
+    def render_metrics(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Latency histograms plus session, queue, gate, batching and cache figures in Prometheus text."""
+        sessions = self.sessions.stats()
+        gauges = {
+            "sessions_active": sessions["active"],
+            "buffered_bytes": sessions["buffered_bytes"],
+            "transcription_jobs_pending": self.jobs.backlog() if self.jobs is not None else 0,
+            **(gauges or {}),
+        }
+        counters = {("session_evictions", reason): count for reason, count in sessions["evictions"].items()}
+        if self.gate is not None:
+            gate = self.gate.stats()
+            for outcome in ("gated", "forwarded"):
+                counters[("energy_gate_chunks", outcome)] = gate.get(outcome, 0)
+        if self.detector.batcher is not None:
+            batching = self.detector.batcher.stats()
+            counters[("vad_batches", "")] = batching["batches"]
+            counters[("vad_batched_windows", "")] = batching["items"]
+            gauges["vad_batch_fill"] = batching["mean_fill"]
+        if isinstance(self.transcriber, BatchingTranscriber):
+            per_rate = self.transcriber.stats().values()
+            batches = sum(batching["batches"] for batching in per_rate)
+            segments = sum(batching["items"] for batching in per_rate)
+            counters[("transcription_batches", "")] = batches
+            counters[("transcription_batched_segments", "")] = segments
+            gauges["transcription_batch_size"] = segments / batches if batches else 0.0
+        cache = self.transcriber.cache
+        if cache is not None:
+            stats = cache.stats()
+            for outcome in ("memory_hits", "disk_hits", "misses"):
+                counters[("transcription_cache_lookups", outcome)] = stats.get(outcome, 0)
+            counters[("transcription_cache_evictions", "disk")] = stats.get("disk_evictions", 0)
+            if stats["disk_bytes"] is not None:
+                gauges["transcription_cache_disk_bytes"] = stats["disk_bytes"]
+        return self.metrics.render(gauges, counters)
+
+    def session_state(self, session_id: str) -> Optional[SessionState]:
+        """State of a session held by this process, or None if there is none."""
+        session = self.sessions.peek(session_id)
+        return session.state if session is not None else None
+
+    def poll(self, session_id: str) -> Optional[ChunkResult]:
+        """Deliver transcripts that finished after the session's last chunk."""
+        session = self.sessions.peek(session_id)
+        return session.poll() if session is not None else None
 
     def list_transcripts(self, session_id: str) -> List[SessionTranscript]:
         session = self.sessions.get(session_id)
@@ -212,16 +606,31 @@ class AudioEngine:
             return []
         return list(session.transcripts)
 
+    def pending_jobs(self, session_id: str) -> List[TranscriptionJob]:
+        if self.jobs is None:
+            return []
+        return self.jobs.pending(session_id)
+
+    def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        if self.jobs is None:
+            return None
+        return self.jobs.get(job_id)
+
     def start_calibration(self, session_id: str) -> dict:
         """Start calibration for a session."""
         session = self._get_session(session_id)
         session.start_calibration()
+        self.sessions.save(session)
         return {"status": "calibrating"}
 
     def finish_calibration(self, session_id: str) -> dict:
         """Finish calibration for a session."""
-        session = self._get_session(session_id)
-        return session.finish_calibration()
+        session = self.sessions.get(session_id)
+        if not session:
+            return {"error": "Not in calibration mode"}
+        result = session.finish_calibration()
+        self.sessions.save(session)
+        return result
 
     def get_calibration_status(self, session_id: str) -> dict:
         """Get calibration status for a session."""
@@ -247,4 +656,5 @@ class AudioEngine:
         if not session:
             return {"status": "session_not_found"}
         session.dismiss_warning()
+        self.sessions.save(session)
         return {"status": "dismissed"}
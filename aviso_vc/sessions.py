@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from threading import Event, Lock, Thread
+from time import monotonic, time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from .store import SessionSnapshot, SessionStore
+
+if TYPE_CHECKING:
+    from .service import AudioSession
+
+
+class SessionManager:
+    """Owns live sessions and keeps their number and memory bounded.
+
+    Sessions idle for longer than ``idle_ttl`` seconds are removed by a background
+    sweeper; going beyond ``max_sessions`` or ``max_buffered_bytes`` evicts the
+    least recently used ones first.
+
+    With a ``store`` every change is snapshotted through it and sessions missing
+    locally, including evicted ones, are restored from it until their snapshots
+    idle out. Unless ``affinity`` guarantees that a session is always served by
+    the same worker, sessions are refreshed from a shared store whenever another
+    worker has saved a newer snapshot, and a save that loses to a newer snapshot
+    is not written.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], "AudioSession"],
+        idle_ttl: float = 900.0,
+        max_sessions: int = 1000,
+        max_buffered_bytes: int = 512 * 1024 * 1024,
+        sweep_interval: float = 30.0,
+        store: Optional[SessionStore] = None,
+        affinity: bool = True,
+    ) -> None:
+        self.factory = factory
+        self.store = store
+        self.affinity = affinity
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_buffered_bytes = max_buffered_bytes
+        self.sweep_interval = sweep_interval
+        self.evictions: Counter = Counter()
+        self._sessions: "OrderedDict[str, AudioSession]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self._sweeper: Optional[Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def get(self, session_id: str) -> Optional["AudioSession"]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+        snapshot = None
+        if self.store is not None and session is None:
+            snapshot = self.store.load(session_id)
+        elif session is not None and self._shared():
+            snapshot = self._load_newer(session)
+        if snapshot is not None:
+            with self._lock:
+                session = self._sessions.get(session_id) or self._insert(session_id)
+            session.restore(snapshot)
+        if session is not None:
+            with self._lock:
+                if session_id in self._sessions:
+                    self._touch(session_id)
+        return session
+
+    def peek(self, session_id: str) -> Optional["AudioSession"]:
+        """The locally held session, without consulting the store or refreshing its idle time."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def get_or_create(self, session_id: str) -> "AudioSession":
+        session = self.get(session_id)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(session_id) or self._insert(session_id)
+                self._touch(session_id)
+        return session
+
+    def refresh(self, session: "AudioSession", force: bool = False) -> None:
+        """Adopt a newer snapshot saved by another worker, or the stored one if ``force``."""
+        if self._shared():
+            snapshot = self._load_newer(session, force=force)
+            if snapshot is not None:
+                session.restore(snapshot, force=force)
+
+    def save(self, session: "AudioSession") -> bool:
+        """Snapshot ``session``; False if the store already holds a newer version.
+
+        A session whose save lost adopts the stored snapshot, since the next
+        incremental save would not apply on top of it. One whose snapshot was
+        purged from the store is saved again in full.
+        """
+        if self.store is None:
+            return True
+        if self.store.save(session.snapshot()):
+            return True
+        if self.store.version(session.session_id) is None:
+            return self.store.save(session.snapshot(full=True))
+        self.refresh(session, force=True)
+        return False
+
+    def remove(self, session_id: str) -> Optional["AudioSession"]:
+        with self._lock:
+            self._last_seen.pop(session_id, None)
+            session = self._sessions.pop(session_id, None)
+        if self.store is not None:
+            self.store.delete(session_id)
+        return session
+
+    def buffered_bytes(self) -> int:
+        with self._lock:
+            return self._buffered_bytes()
+
+    def sweep(self) -> int:
+        """Drop sessions idle for longer than ``idle_ttl``; returns how many were removed.
+
+        Also enforces ``max_buffered_bytes`` and purges idle snapshots from the store.
+        """
+        cutoff = monotonic() - self.idle_ttl
+        with self._lock:
+            expired = [sid for sid, seen in self._last_seen.items() if seen < cutoff]
+            for session_id in expired:
+                self._evict(session_id, "idle")
+        self.trim()
+        if self.store is not None:
+            self.store.purge(time() - self.idle_ttl)
+        return len(expired)
+
+    def trim(self) -> int:
+        """Evict least recently used sessions until buffered audio fits ``max_buffered_bytes``.
+
+        The most recently used session is kept, so a session being served never
+        evicts itself. Returns how many sessions were evicted.
+        """
+        evicted = 0
+        with self._lock:
+            while len(self._sessions) > 1 and self._buffered_bytes() > self.max_buffered_bytes:
+                self._evict(next(iter(self._sessions)), "max_buffered_bytes")
+                evicted += 1
+        return evicted
+
+    def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = Thread(target=self._sweep_loop, name="session-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "buffered_bytes": self._buffered_bytes(),
+                "evictions": dict(self.evictions),
+            }
+
+    def _shared(self) -> bool:
+        return self.store is not None and self.store.shared and not self.affinity
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+
+    def _insert(self, session_id: str) -> "AudioSession":
+        session = self.factory(session_id)
+        self._make_room(session.buffer.nbytes)
+        self._sessions[session_id] = session
+        return session
+
+    def _touch(self, session_id: str) -> None:
+        self._sessions.move_to_end(session_id)
+        self._last_seen[session_id] = monotonic()
+
+    def _buffered_bytes(self) -> int:
+        return sum(session.buffer.nbytes for session in self._sessions.values())
+
+    def _make_room(self, incoming_bytes: int) -> None:
+        while self._sessions and len(self._sessions) >= self.max_sessions:
+            self._evict(next(iter(self._sessions)), "max_sessions")
+        while self._sessions and self._buffered_bytes() + incoming_bytes > self.max_buffered_bytes:
+            self._evict(next(iter(self._sessions)), "max_buffered_bytes")
+
+    def _load_newer(self, session: "AudioSession", force: bool = False) -> Optional[SessionSnapshot]:
+        # Compare versions first so that an unchanged session's audio is not read back
+        version = self.store.version(session.session_id)
+        if version is None or version < session.version or (version == session.version and not force):
+            return None
+        return self.store.load(session.session_id)
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        # The snapshot stays in the store so the session can resume; the sweeper purges it once idle
+        self._sessions.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+        self.evictions[reason] += 1
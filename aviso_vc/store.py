@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field, replace
+import json
+from pathlib import Path
+import sqlite3
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .config import Settings
+
+
+@dataclass
+class SessionSnapshot:
+    """Serializable state of an AudioSession.
+
+    Saved snapshots are incremental: ``buffer`` holds the samples from
+    ``buffer_offset`` on, and ``transcripts`` is None when unchanged since the
+    previous save. Loaded snapshots always carry the whole buffer and transcripts.
+    """
+
+    session_id: str
+    state: str
+    calibration_baseline: Optional[float] = None
+    calibration_duration: Optional[float] = None
+    warning_active: bool = False
+    segment_count: int = 0
+    transcripts: Optional[List[dict]] = field(default_factory=list)
+    buffer: bytes = b""  # float32 samples buffered from buffer_offset on
+    buffer_offset: int = 0  # 0 replaces the stored buffer, otherwise it is appended to
+    version: int = 0
+    updated_at: float = field(default_factory=time)
+
+
+class SessionStore:
+    """Persistence backend for session snapshots.
+
+    ``shared`` stores are visible to other worker processes, so snapshots there
+    outlive local eviction and are only purged once idle everywhere. Saves are
+    conditional: a snapshot only replaces a stored one with a lower version.
+    """
+
+    shared = False
+
+    def load(self, session_id: str) -> Optional[SessionSnapshot]:
+        raise NotImplementedError
+
+    def version(self, session_id: str) -> Optional[int]:
+        """Version of the stored snapshot, without reading its audio."""
+        raise NotImplementedError
+
+    def save(self, snapshot: SessionSnapshot) -> bool:
+        """Store ``snapshot`` unless a newer one is stored; returns whether it was written.
+
+        An incremental snapshot (``buffer_offset`` > 0) is not written when there
+        is no stored snapshot to append it to.
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def purge(self, older_than: float) -> int:
+        """Delete snapshots last updated before ``older_than`` (a UNIX timestamp)."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """Snapshots kept in this process, so evicted sessions resume until they idle out."""
+
+    def __init__(self) -> None:
+        self._snapshots: Dict[str, SessionSnapshot] = {}
+        self._audio: Dict[str, List[bytes]] = {}
+        self._lock = Lock()
+
+    def load(self, session_id: str) -> Optional[SessionSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(session_id)
+            if snapshot is None:
+                return None
+            return replace(snapshot, buffer=b"".join(self._audio[session_id]))
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            snapshot = self._snapshots.get(session_id)
+            return snapshot.version if snapshot is not None else None
+
+    def save(self, snapshot: SessionSnapshot) -> bool:
+        with self._lock:
+            stored = self._snapshots.get(snapshot.session_id)
+            if stored is None and snapshot.buffer_offset:
+                return False
+            if stored is not None and stored.version >= snapshot.version:
+                return False
+            transcripts = snapshot.transcripts
+            if transcripts is None:
+                transcripts = stored.transcripts if stored is not None else []
+            self._snapshots[snapshot.session_id] = replace(
+                snapshot, transcripts=transcripts, buffer=b"", buffer_offset=0
+            )
+            if snapshot.buffer_offset == 0:
+                self._audio[snapshot.session_id] = []
+            if snapshot.buffer:
+                self._audio[snapshot.session_id].append(snapshot.buffer)
+            return True
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._snapshots.pop(session_id, None)
+            self._audio.pop(session_id, None)
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            expired = [sid for sid, snap in self._snapshots.items() if snap.updated_at < older_than]
+            for session_id in expired:
+                del self._snapshots[session_id]
+                del self._audio[session_id]
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Snapshots in a local SQLite database shared by every worker on the host.
+
+    Buffered audio is kept as one row per save in ``snapshot_audio``, so a save
+    writes only the samples added since the previous one.
+    """
+
+    shared = True
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, transcripts TEXT NOT NULL, "
+                "version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshot_audio ("
+                "session_id TEXT NOT NULL, offset INTEGER NOT NULL, samples BLOB NOT NULL, "
+                "PRIMARY KEY (session_id, offset))"
+            )
+
+    def load(self, session_id: str) -> Optional[SessionSnapshot]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, transcripts, version, updated_at FROM snapshots WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            chunks = self._conn.execute(
+                "SELECT samples FROM snapshot_audio WHERE session_id = ? ORDER BY offset", (session_id,)
+            ).fetchall()
+        if row is None:
+            return None
+        data, transcripts, version, updated_at = row
+        return SessionSnapshot(
+            session_id=session_id,
+            transcripts=json.loads(transcripts),
+            buffer=b"".join(bytes(samples) for (samples,) in chunks),
+            version=version,
+            updated_at=updated_at,
+            **json.loads(data),
+        )
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM snapshots WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row is not None else None
+
+    def save(self, snapshot: SessionSnapshot) -> bool:
+        data = asdict(snapshot)
+        for key in ("session_id", "transcripts", "buffer", "buffer_offset", "version", "updated_at"):
+            del data[key]
+        transcripts = json.dumps(snapshot.transcripts) if snapshot.transcripts is not None else None
+        with self._lock, self._conn:
+            if snapshot.buffer_offset and self._conn.execute(
+                "SELECT 1 FROM snapshots WHERE session_id = ?", (snapshot.session_id,)
+            ).fetchone() is None:
+                return False
+            # Another worker may have saved a newer version since ours was loaded
+            cursor = self._conn.execute(
+                "INSERT INTO snapshots (session_id, data, transcripts, version, updated_at) "
+                "VALUES (?, ?, COALESCE(?, '[]'), ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET data = excluded.data, "
+                "transcripts = COALESCE(?, snapshots.transcripts), "
+                "version = excluded.version, updated_at = excluded.updated_at "
+                "WHERE excluded.version > snapshots.version",
+                (
+                    snapshot.session_id, json.dumps(data), transcripts, snapshot.version, snapshot.updated_at,
+                    transcripts,
+                ),
+            )
+            if cursor.rowcount == 0:
+                return False
+            if snapshot.buffer_offset == 0:
+                self._conn.execute("DELETE FROM snapshot_audio WHERE session_id = ?", (snapshot.session_id,))
+            if snapshot.buffer:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshot_audio (session_id, offset, samples) VALUES (?, ?, ?)",
+                    (snapshot.session_id, snapshot.buffer_offset, snapshot.buffer),
+                )
+        return True
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM snapshots WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM snapshot_audio WHERE session_id = ?", (session_id,))
+
+    def purge(self, older_than: float) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM snapshots WHERE updated_at < ?", (older_than,))
+            self._conn.execute(
+                "DELETE FROM snapshot_audio WHERE session_id NOT IN (SELECT session_id FROM snapshots)"
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_session_store(settings: "Settings") -> Optional[SessionStore]:
+    """Build the store selected by ``settings.session_store`` ("local" keeps no snapshots)."""
+    if settings.session_store == "memory":
+        return InMemorySessionStore()
+    if settings.session_store == "sqlite":
+        return SQLiteSessionStore(settings.session_store_path)
+    return None
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import io
-import os
-import tempfile
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional
+from threading import BoundedSemaphore, Lock
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Sequence
 
+import httpx
 import numpy as np
-import soundfile as sf
 from groq import Groq
 
-from .audio_utils import AudioClip
+from .audio_utils import AudioClip, UPLOAD_FORMATS, encode_audio, load_audio
+from .cache import TranscriptionCache, audio_key
+from .microbatch import MicroBatcher
+
+if TYPE_CHECKING:
+    from .config import Settings
 
 
 def compute_words_per_second(text: str, duration: float) -> float:
@@ -27,60 +29,330 @@ class TranscriptionResult:
     words_per_second: float
 
 
-class WhisperTranscriber:
+class Transcriber(Protocol):
+    """What sessions and workflows need from a speech-to-text backend."""
+
+    cache: Optional[TranscriptionCache]
+
+    def transcribe(self, clip: AudioClip) -> TranscriptionResult: ...
+
+    def transcribe_waveform(self, waveform: np.ndarray, sample_rate: int) -> TranscriptionResult: ...
+
+    def transcribe_batch(self, waveforms: Sequence[np.ndarray], sample_rate: int) -> List[TranscriptionResult]: ...
+
+    def warm_up(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CachingTranscriber:
+    """Shared plumbing for backends: mono float32 input, cache lookups and words/sec.
+
+    Subclasses implement ``_transcribe_samples`` and may override ``_transcribe_many``
+    when they can decode several segments at once.
+    """
+
+    model: str
+    task = "transcribe"
+    temperature = 0.0
+    cache: Optional[TranscriptionCache] = None
+
+    def transcribe(self, clip: AudioClip) -> TranscriptionResult:
+        """Transcribe audio from a file path."""
+        if clip.path is None:
+            raise ValueError("clip has no file; use transcribe_waveform for in-memory audio")
+        audio, sample_rate = load_audio(clip.path)
+        return self.transcribe_waveform(audio, sample_rate)
+
+    def transcribe_waveform(self, waveform: np.ndarray, sample_rate: int) -> TranscriptionResult:
+        """Transcribe audio from a numpy waveform array."""
+        return self.transcribe_batch([waveform], sample_rate)[0]
+
+    def transcribe_batch(self, waveforms: Sequence[np.ndarray], sample_rate: int) -> List[TranscriptionResult]:
+        """Transcribe several waveforms, sending only cache misses to the backend."""
+        waveforms = [self._as_mono(waveform) for waveform in waveforms]
+        texts: List[Optional[str]] = [None] * len(waveforms)
+        keys: List[Optional[str]] = [None] * len(waveforms)
+        if self.cache is not None:
+            for i, waveform in enumerate(waveforms):
+                keys[i] = self._cache_key(waveform, sample_rate)
+                texts[i] = self.cache.get(keys[i])
+        misses = [i for i, text in enumerate(texts) if text is None]
+        if misses:
+            decoded = self._transcribe_many([waveforms[i] for i in misses], sample_rate)
+            for i, text in zip(misses, decoded):
+                texts[i] = text
+                if keys[i] is not None:
+                    self.cache.put(keys[i], text)
+        return [
+            TranscriptionResult(
+                text=text,
+                words_per_second=compute_words_per_second(text, len(waveform) / float(sample_rate or 1)),
+            )
+            for text, waveform in zip(texts, waveforms)
+        ]
+
+    def warm_up(self) -> None:
+        """Pay one-off initialization costs before the first real request."""
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
+
+    def _transcribe_samples(self, waveform: np.ndarray, sample_rate: int) -> str:
+        raise NotImplementedError
+
+    def _transcribe_many(self, waveforms: List[np.ndarray], sample_rate: int) -> List[str]:
+        return [self._transcribe_samples(waveform, sample_rate) for waveform in waveforms]
+
+    @staticmethod
+    def _as_mono(waveform: np.ndarray) -> np.ndarray:
+        waveform = np.asarray(waveform)
+        if waveform.ndim > 1:
+            waveform = waveform.mean(axis=0)
+        return waveform.astype(np.float32, copy=False)
+
+    def _cache_key(self, waveform: np.ndarray, sample_rate: int) -> str:
+        return audio_key(waveform, sample_rate, model=self.model, temperature=self.temperature, task=self.task)
+
+
+class WhisperTranscriber(CachingTranscriber):
     """Transcriber using Groq API with whisper-large-v3 for better Portuguese support."""
 
-    def __init__(self, groq_api_key: str, model: str = "whisper-large-v3") -> None:
+    def __init__(
+        self,
+        groq_api_key: str,
+        model: str = "whisper-large-v3",
+        upload_format: str = "wav",
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        max_connections: int = 16,
+        max_concurrency: int = 8,
+        cache: Optional[TranscriptionCache] = None,
+        batch_max_duration: float = 60.0,
+        batch_gap: float = 1.0,
+    ) -> None:
         """
         Initialize Groq-based transcriber.
 
         Args:
             groq_api_key: Groq API key for authentication
             model: Groq model to use (default: whisper-large-v3)
+            upload_format: Encoding for waveform uploads ("wav", "flac" or "opus")
+            timeout: Per-request timeout in seconds
+            max_retries: Retries with exponential backoff on connection errors, 429 and 5xx
+            max_connections: Size of the shared keep-alive connection pool
+            max_concurrency: Maximum number of requests in flight at once
+            cache: Transcripts to reuse for audio that was already sent
+            batch_max_duration: Longest upload, in seconds, when packing several segments into one
+            batch_gap: Seconds of silence between packed segments
         """
-        self.client = Groq(api_key=groq_api_key)
+        if upload_format not in UPLOAD_FORMATS:
+            raise ValueError(f"upload_format must be one of {sorted(UPLOAD_FORMATS)}")
+        http_client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self.client = Groq(
+            api_key=groq_api_key,
+            timeout=timeout,
+            max_retries=max_retries,
+            http_client=http_client,
+        )
         self.model = model
+        self.upload_format = upload_format
+        self._slots = BoundedSemaphore(max_concurrency)
+        self.cache = cache
+        self.batch_max_duration = batch_max_duration
+        self.batch_gap = batch_gap
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "WhisperTranscriber":
+        return cls(
+            settings.groq_api_key,
+            model=settings.groq_model,
+            upload_format=settings.upload_format,
+            timeout=settings.groq_timeout,
+            max_retries=settings.groq_max_retries,
+            max_connections=settings.groq_max_connections,
+            max_concurrency=settings.transcription_concurrency,
+            cache=TranscriptionCache.from_settings(settings),
+            batch_max_duration=settings.transcription_batch_max_duration,
+            batch_gap=settings.transcription_batch_gap,
+        )
 
     def transcribe(self, clip: AudioClip) -> TranscriptionResult:
-        """Transcribe audio from a file path."""
+        """Transcribe audio from a file path, uploading the file as it is."""
+        if clip.path is None:
+            raise ValueError("clip has no file; use transcribe_waveform for in-memory audio")
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(*load_audio(clip.path))
+            text = self.cache.get(key)
+            if text is not None:
+                return TranscriptionResult(text=text, words_per_second=compute_words_per_second(text, clip.duration))
         with open(clip.path, "rb") as file:
-            transcription = self.client.audio.transcriptions.create(
-                file=(clip.path.name, file.read()),
+            text = self._request(clip.path.name, file.read())
+        if key is not None:
+            self.cache.put(key, text)
+        wps = compute_words_per_second(text, clip.duration)
+        return TranscriptionResult(text=text, words_per_second=wps)
+
+    def close(self) -> None:
+        super().close()
+        self.client.close()
+
+    def _transcribe_samples(self, waveform: np.ndarray, sample_rate: int) -> str:
+        # Encode in memory instead of round-tripping through a temporary file
+        filename, data = encode_audio(waveform, sample_rate, self.upload_format)
+        return self._request(filename, data)
+
+    def _transcribe_many(self, waveforms: List[np.ndarray], sample_rate: int) -> List[str]:
+        """Pack consecutive segments into uploads of at most ``batch_max_duration`` seconds."""
+        texts: List[str] = []
+        pack: List[np.ndarray] = []
+        pack_duration = 0.0
+        for waveform in waveforms + [None]:
+            duration = len(waveform) / float(sample_rate) if waveform is not None else 0.0
+            if pack and (waveform is None or pack_duration + self.batch_gap + duration > self.batch_max_duration):
+                texts.extend(self._request_packed(pack, sample_rate))
+                pack, pack_duration = [], 0.0
+            if waveform is not None:
+                pack_duration += duration + (self.batch_gap if pack else 0.0)
+                pack.append(waveform)
+        return texts
+
+    def _request_packed(self, waveforms: List[np.ndarray], sample_rate: int) -> List[str]:
+        """One upload for several segments, split back using the verbose_json segment timings."""
+        if len(waveforms) == 1:
+            return [self._transcribe_samples(waveforms[0], sample_rate)]
+        gap = np.zeros(int(self.batch_gap * sample_rate), dtype=np.float32)
+        spans = []
+        parts = []
+        offset = 0
+        for waveform in waveforms:
+            if parts:
+                parts.append(gap)
+                offset += len(gap)
+            spans.append((offset / sample_rate, (offset + len(waveform)) / sample_rate))
+            parts.append(waveform)
+            offset += len(waveform)
+        filename, data = encode_audio(np.concatenate(parts), sample_rate, self.upload_format)
+        segments = getattr(self._create(filename, data), "segments", None)
+        if not segments:
+            # Without timings the text cannot be attributed, so fall back to one request each
+            return [self._transcribe_samples(waveform, sample_rate) for waveform in waveforms]
+        pieces: List[List[str]] = [[] for _ in waveforms]
+        for segment in segments:
+            start, end, text = (_field(segment, name) for name in ("start", "end", "text"))
+            overlaps = [min(end, span_end) - max(start, span_start) for span_start, span_end in spans]
+            best = int(np.argmax(overlaps))
+            if overlaps[best] <= 0:
+                # Entirely inside a gap: attribute to the nearest segment
+                middle = (start + end) / 2
+                best = int(np.argmin([min(abs(middle - a), abs(middle - b)) for a, b in spans]))
+            pieces[best].append(str(text).strip())
+        return [" ".join(piece for piece in piece_list if piece) for piece_list in pieces]
+
+    def _request(self, filename: str, data: bytes) -> str:
+        return self._create(filename, data).text.strip()
+
+    def _create(self, filename: str, data: bytes):
+        with self._slots:
+            return self.client.audio.transcriptions.create(
+                file=(filename, data),
                 model=self.model,
-                temperature=0.0,
+                temperature=self.temperature,
                 response_format="verbose_json",
             )
-        text = transcription.text.strip()
-        wps = compute_words_per_second(text, clip.duration)
-        return TranscriptionResult(text=text, words_per_second=wps)
+
+
+def _field(item, name: str):
+    """verbose_json segments arrive as dicts or attribute objects depending on the SDK version."""
+    return item[name] if isinstance(item, dict) else getattr(item, name)
+
+
+class BatchingTranscriber:
+    """Collects concurrent ``transcribe_waveform`` calls into ``transcribe_batch`` calls.
+
+    Callers block while requests arriving within ``max_wait`` seconds (up to
+    ``max_batch_size``) are grouped and handed to the wrapped backend, which packs
+    them into one upload or decodes them in one forward pass.
+    """
+
+    def __init__(
+        self,
+        inner: Transcriber,
+        max_batch_size: int = 8,
+        max_wait: float = 0.05,
+        max_in_flight: int = 1,
+    ) -> None:
+        self.inner = inner
+        self.cache = inner.cache
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_in_flight = max_in_flight
+        self._batchers: Dict[int, MicroBatcher] = {}
+        self._lock = Lock()
+
+    def transcribe(self, clip: AudioClip) -> TranscriptionResult:
+        return self.inner.transcribe(clip)
 
     def transcribe_waveform(self, waveform: np.ndarray, sample_rate: int) -> TranscriptionResult:
-        """Transcribe audio from a numpy waveform array."""
-        # Ensure mono audio
-        if waveform.ndim > 1:
-            waveform = waveform.mean(axis=0)
-        waveform = np.asarray(waveform, dtype=np.float32)
-        duration = len(waveform) / float(sample_rate or 1)
-
-        # Create a temporary WAV file for Groq API
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            # Write audio data to temporary WAV file
-            sf.write(tmp_path, waveform, sample_rate)
-
-        try:
-            # Transcribe using Groq API
-            with open(tmp_path, "rb") as file:
-                transcription = self.client.audio.transcriptions.create(
-                    file=(Path(tmp_path).name, file.read()),
-                    model=self.model,
-                    temperature=0.0,
-                    response_format="verbose_json",
+        return self._batcher(sample_rate).call(waveform)
+
+    def transcribe_batch(self, waveforms: Sequence[np.ndarray], sample_rate: int) -> List[TranscriptionResult]:
+        return self.inner.transcribe_batch(waveforms, sample_rate)
+
+    def warm_up(self) -> None:
+        self.inner.warm_up()
+
+    def stats(self) -> Dict[int, Dict[str, object]]:
+        with self._lock:
+            return {sample_rate: batcher.stats() for sample_rate, batcher in self._batchers.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            batchers, self._batchers = list(self._batchers.values()), {}
+        for batcher in batchers:
+            batcher.close()
+        self.inner.close()
+
+    def _batcher(self, sample_rate: int) -> MicroBatcher:
+        # Only same-rate segments can be packed together
+        with self._lock:
+            batcher = self._batchers.get(sample_rate)
+            if batcher is None:
+                batcher = MicroBatcher(
+                    lambda waveforms: self.inner.transcribe_batch(waveforms, sample_rate),
+                    max_batch_size=self.max_batch_size,
+                    max_wait=self.max_wait,
+                    max_in_flight=self.max_in_flight,
+                    name="transcription-batch",
                 )
-            text = transcription.text.strip()
-            wps = compute_words_per_second(text, duration)
-            return TranscriptionResult(text=text, words_per_second=wps)
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+                self._batchers[sample_rate] = batcher
+            return batcher
+
+
+def create_transcriber(settings: "Settings") -> Transcriber:
+    """Build the backend selected by ``settings.transcriber``, batched when configured."""
+    if settings.transcriber == "local":
+        # transformers is only imported when the local backend is actually used
+        from .local_transcription import LocalWhisperTranscriber
+
+        transcriber: Transcriber = LocalWhisperTranscriber.from_settings(settings)
+        max_in_flight = 1  # the model runs one forward pass at a time
+    else:
+        transcriber = WhisperTranscriber.from_settings(settings)
+        max_in_flight = settings.transcription_concurrency
+    if settings.transcription_batch_size > 1:
+        transcriber = BatchingTranscriber(
+            transcriber,
+            max_batch_size=settings.transcription_batch_size,
+            max_wait=settings.transcription_batch_wait_ms / 1000.0,
+            max_in_flight=max_in_flight,
+        )
+    return transcriber
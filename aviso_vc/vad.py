@@ -1,28 +1,82 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
-from typing import List
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterable, List, Optional, Sequence, Tuple
 import inspect
 
 import numpy as np
+
+from . import compat as _compat  # noqa: F401  # patches torchaudio/numpy before pyannote loads
 import torch
 from pyannote.audio import Pipeline
 
+from .microbatch import MicroBatcher
+from .segments import SpeechSegment, merge_segments
+
+if TYPE_CHECKING:
+    from .metrics import Metrics
+    from .vad_pool import VADProcessPool
+
 
 @dataclass
-class SpeechSegment:
-    start: float
-    end: float
+class StreamingVADState:
+    """Per-session state carried across chunks by the streaming detector."""
+
+    context: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    active: bool = False
+
+    def reset(self) -> None:
+        self.context = np.zeros(0, dtype=np.float32)
+        self.active = False
 
 
 class VoiceActivityDetector:
-    def __init__(self, model_id: str, hf_token: str) -> None:
-        self.pipeline = Pipeline.from_pretrained(
-            model_id, **self._auth_kwargs(hf_token)
-        )
+    """Speech detection with a pyannote pipeline, on whole files or streamed in chunks.
+
+    Usually built with :meth:`from_pretrained`. ``pipeline`` may also be one that is
+    already loaded, or None for a detector that runs everything in a
+    :class:`VADProcessPool` or a subclass that overrides :meth:`score_windows` and
+    :meth:`detect_waveform`, neither of which needs a model in this process.
+    """
+
+    def __init__(self, pipeline: Optional[Pipeline], context_duration: float = 2.0) -> None:
+        self.pipeline = pipeline
+        self.context_duration = context_duration
+        self.batcher: Optional[MicroBatcher] = None
+        self.pool: Optional[VADProcessPool] = None
+        self.metrics: Optional[Metrics] = None  # records waits on the model lock when set
         self._lock = Lock()
+        self.model = self._conversion = None
+        self.sample_rate = 16000
+        self.onset = self.offset = 0.5
+        if pipeline is None:
+            return
+
+        # The streaming path talks to the segmentation model directly instead of going
+        # through the pipeline, which pads every call to the model's full window.
+        segmentation = self.pipeline._segmentation
+        self.model = segmentation.model
+        self.model.eval()
+        self._conversion = getattr(segmentation, "conversion", None)
+        self.sample_rate = int(getattr(getattr(self.model, "audio", None), "sample_rate", 16000))
+        self.onset = float(getattr(self.pipeline, "onset", 0.5))
+        self.offset = float(getattr(self.pipeline, "offset", self.onset))
+
+    @classmethod
+    def from_pretrained(
+        cls,
+        model_id: str,
+        hf_token: str,
+        context_duration: float = 2.0,
+        hyperparameters: Optional[Dict[str, float]] = None,
+    ) -> "VoiceActivityDetector":
+        """Load ``model_id``, overriding some of its tuned ``hyperparameters`` (onset, offset, ...)."""
+        pipeline = Pipeline.from_pretrained(model_id, **cls._auth_kwargs(hf_token))
+        if hyperparameters:
+            pipeline.instantiate({**pipeline.parameters(instantiated=True), **hyperparameters})
+        return cls(pipeline, context_duration=context_duration)
 
     def detect(self, audio_path: Path) -> List[SpeechSegment]:
         with self._lock:
@@ -40,8 +94,126 @@ class VoiceActivityDetector:
     def detect_waveform(self, waveform: np.ndarray, sample_rate: int) -> List[SpeechSegment]:
         if len(waveform) == 0:
             return []
+        if self.pool is not None:
+            spans = self.pool.detect_waveform(waveform, sample_rate)
+            return [SpeechSegment(start=start, end=end) for start, end in spans]
         tensor = torch.from_numpy(waveform.astype(np.float32)).unsqueeze(0)
-        with self._lock:
+        with self._model_lock():
             result = self.pipeline({"waveform": tensor, "sample_rate": sample_rate})
         timeline = result.get_timeline().support()
         return [SpeechSegment(start=float(segment.start), end=float(segment.end)) for segment in timeline]
+
+    def detect_windows(
+        self, windows: Iterable[Tuple[float, np.ndarray]], sample_rate: int
+    ) -> List[SpeechSegment]:
+        """Detect speech over ``(start_time, waveform)`` windows of a long recording.
+
+        Windows should overlap so that speech crossing a boundary is seen whole by
+        at least one of them; detections are shifted to absolute time and merged.
+        """
+        segments: List[SpeechSegment] = []
+        for offset, waveform in windows:
+            for segment in self.detect_waveform(waveform, sample_rate):
+                segments.append(SpeechSegment(start=offset + segment.start, end=offset + segment.end))
+        return merge_segments(segments)
+
+    def detect_streaming(
+        self, waveform: np.ndarray, sample_rate: int, state: StreamingVADState
+    ) -> List[SpeechSegment]:
+        """Detect speech in the next chunk of a stream.
+
+        Only the last ``context_duration`` seconds of previous audio are re-scored as
+        receptive-field context, and onset/offset hysteresis continues from ``state``.
+        Segment times are relative to the start of ``waveform``.
+        """
+        if len(waveform) == 0:
+            return []
+        if sample_rate != self.sample_rate:
+            return self.detect_waveform(waveform, sample_rate)
+
+        chunk = np.asarray(waveform, dtype=np.float32)
+        window = np.concatenate((state.context, chunk))
+        scores = self._score_window(window)
+        new_frames = max(1, int(round(len(scores) * len(chunk) / len(window))))
+        context_samples = int(self.context_duration * sample_rate)
+        state.context = window[len(window) - context_samples:] if context_samples else window[:0]
+
+        frame_duration = len(chunk) / float(sample_rate) / new_frames
+        return self._hysteresis(scores[-new_frames:], frame_duration, state)
+
+    def skip_streaming(self, waveform: np.ndarray, state: StreamingVADState) -> None:
+        """Carry an unscored chunk into the streaming context, as if it held no speech."""
+        context_samples = int(self.context_duration * self.sample_rate)
+        if not context_samples:
+            return
+        window = np.concatenate((state.context, np.asarray(waveform, dtype=np.float32)))
+        state.context = window[len(window) - context_samples:]
+
+    def enable_batching(self, max_batch_size: int, max_wait: float) -> MicroBatcher:
+        """Route streaming windows through a cross-session micro-batcher."""
+        if self.batcher is None:
+            self.batcher = MicroBatcher(
+                self.score_windows,
+                max_batch_size=max_batch_size,
+                max_wait=max_wait,
+                max_in_flight=len(self.pool) if self.pool is not None else 1,
+                name="vad-batch",
+            )
+        return self.batcher
+
+    def use_pool(self, pool: VADProcessPool) -> None:
+        """Score streaming windows and detect speech in worker processes instead of this one."""
+        self.pool = pool
+        if self.pipeline is None:
+            self.sample_rate, self.onset, self.offset = pool.sample_rate, pool.onset, pool.offset
+
+    def score_windows(self, windows: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """Return per-frame speech probabilities for each mono window in one forward pass.
+
+        Windows are left-padded to a common length so that each one ends on the last
+        output frame; the frames covering the padding are dropped from its result.
+        """
+        if self.pool is not None:
+            return self.pool.score_windows(windows)
+        longest = max(len(window) for window in windows)
+        batch = np.zeros((len(windows), 1, longest), dtype=np.float32)
+        for row, window in zip(batch, windows):
+            row[0, longest - len(window):] = window
+        with self._model_lock(), torch.inference_mode():
+            scores = self.model(torch.from_numpy(batch))
+            if self._conversion is not None:
+                scores = self._conversion(scores)
+        # Speech probability is the max over speaker classes, as in the pipeline.
+        speech = scores.max(dim=-1).values.cpu().numpy()
+        num_frames = speech.shape[1]
+        results = []
+        for row, window in zip(speech, windows):
+            frames = max(1, int(round(num_frames * len(window) / longest)))
+            results.append(row[num_frames - frames:])
+        return results
+
+    def _model_lock(self) -> ContextManager:
+        if self.metrics is not None:
+            return self.metrics.locked(self._lock, "vad_model_lock")
+        return self._lock
+
+    def _score_window(self, window: np.ndarray) -> np.ndarray:
+        if self.batcher is not None:
+            return self.batcher.call(window)
+        return self.score_windows([window])[0]
+
+    def _hysteresis(
+        self, scores: np.ndarray, frame_duration: float, state: StreamingVADState
+    ) -> List[SpeechSegment]:
+        segments: List[SpeechSegment] = []
+        start = 0.0
+        for index, score in enumerate(scores):
+            if state.active and score < self.offset:
+                segments.append(SpeechSegment(start=start, end=index * frame_duration))
+                state.active = False
+            elif not state.active and score > self.onset:
+                start = index * frame_duration
+                state.active = True
+        if state.active:
+            segments.append(SpeechSegment(start=start, end=len(scores) * frame_duration))
+        return segments
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Output frames are never denser than one per this many input samples
+_MIN_FRAME_STEP = 64
+
+
+def _worker_main(
+    model_id: str,
+    hf_token: str,
+    num_threads: int,
+    hyperparameters: Dict[str, float],
+    input_name: str,
+    output_name: str,
+    capacity: int,
+    conn,
+) -> None:
+    import torch
+
+    from .vad import VoiceActivityDetector
+
+    try:
+        torch.set_num_threads(num_threads)
+        detector = VoiceActivityDetector.from_pretrained(model_id, hf_token, hyperparameters=hyperparameters)
+    except Exception as exc:
+        conn.send(("error", repr(exc)))
+        return
+    input_shm = SharedMemory(name=input_name)
+    output_shm = SharedMemory(name=output_name)
+    audio = np.ndarray((capacity,), dtype=np.float32, buffer=input_shm.buf)
+    frames = np.ndarray((capacity // _MIN_FRAME_STEP,), dtype=np.float32, buffer=output_shm.buf)
+    conn.send(("ready", {"sample_rate": detector.sample_rate, "onset": detector.onset, "offset": detector.offset}))
+    try:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            try:
+                if request[0] == "detect":
+                    _, length, sample_rate = request
+                    segments = detector.detect_waveform(audio[:length], sample_rate)
+                    conn.send(("ok", [(segment.start, segment.end) for segment in segments]))
+                    continue
+                bounds = np.cumsum([0] + list(request[1]))
+                windows = [audio[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+                scores = detector.score_windows(windows)
+                offset = 0
+                for row in scores:
+                    frames[offset:offset + len(row)] = row
+                    offset += len(row)
+            except Exception as exc:
+                conn.send(("error", repr(exc)))
+            else:
+                conn.send(("ok", [len(row) for row in scores]))
+    finally:
+        del audio, frames
+        input_shm.close()
+        output_shm.close()
+
+
+class _Worker:
+    def __init__(self, input_shm: SharedMemory, output_shm: SharedMemory, capacity: int) -> None:
+        self.process = None
+        self.conn = None
+        self.input_shm = input_shm
+        self.output_shm = output_shm
+        self.audio = np.ndarray((capacity,), dtype=np.float32, buffer=input_shm.buf)
+        self.frames = np.ndarray((capacity // _MIN_FRAME_STEP,), dtype=np.float32, buffer=output_shm.buf)
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class VADProcessPool:
+    """Runs VAD in worker processes that each load the segmentation model once.
+
+    Audio is written into a shared-memory slot per worker and scores come back the
+    same way; only window lengths and speech segments travel over the pipe. Workers
+    are forked where the platform allows it, so create the pool before starting
+    threads in the parent. A worker found dead is replaced by a spawned one.
+
+    ``sample_rate``, ``onset`` and ``offset`` are those of the workers' model, so
+    the parent can run streaming hysteresis without loading the model itself.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        hf_token: str,
+        num_workers: int,
+        threads_per_worker: int = 1,
+        max_batch_samples: int = 60 * 16000,
+        hyperparameters: Optional[Dict[str, float]] = None,
+    ) -> None:
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        self.capacity = max_batch_samples
+        self.sample_rate = 16000
+        self.onset = self.offset = 0.5
+        self.restarts = 0
+        self._worker_args = (model_id, hf_token, threads_per_worker, dict(hyperparameters or {}))
+        self._workers: List[_Worker] = []
+        self._idle: "Queue[_Worker]" = Queue()
+        self._closed = False
+        self._close_lock = Lock()
+        for _ in range(num_workers):
+            worker = _Worker(
+                SharedMemory(create=True, size=self.capacity * 4),
+                SharedMemory(create=True, size=(self.capacity // _MIN_FRAME_STEP) * 4),
+                self.capacity,
+            )
+            self._workers.append(worker)
+            self._launch(worker, mp.get_context(method))
+        for worker in self._workers:
+            try:
+                self._await_ready(worker)
+            except RuntimeError:
+                self.close()
+                raise
+            self._idle.put(worker)
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    def score_windows(self, windows: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """Same contract as ``VoiceActivityDetector.score_windows``, run on an idle worker."""
+        if max(len(window) for window in windows) > self.capacity:
+            raise ValueError(f"VAD window longer than the pool capacity of {self.capacity} samples")
+        results: List[np.ndarray] = []
+        batch: List[np.ndarray] = []
+        total = 0
+        for window in windows:
+            if total + len(window) > self.capacity:
+                results.extend(self._score(batch))
+                batch, total = [], 0
+            batch.append(window)
+            total += len(window)
+        results.extend(self._score(batch))
+        return results
+
+    def detect_waveform(self, waveform: np.ndarray, sample_rate: int) -> List[Tuple[float, float]]:
+        """Speech ``(start, end)`` times from the full pipeline, run on an idle worker."""
+        if len(waveform) > self.capacity:
+            raise ValueError(f"waveform longer than the pool capacity of {self.capacity} samples")
+        return self._run([waveform], ("detect", len(waveform), sample_rate))
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.stop()
+            del worker.audio, worker.frames
+            for shm in (worker.input_shm, worker.output_shm):
+                shm.close()
+                shm.unlink()
+
+    def _score(self, windows: List[np.ndarray]) -> List[np.ndarray]:
+        with self._borrow() as worker:
+            counts = self._send(worker, windows, ("score", [len(window) for window in windows]))
+            results = []
+            offset = 0
+            for count in counts:
+                results.append(worker.frames[offset:offset + count].copy())
+                offset += count
+            return results
+
+    def _run(self, windows: List[np.ndarray], request: Tuple[Any, ...]) -> Any:
+        with self._borrow() as worker:
+            return self._send(worker, windows, request)
+
+    @contextmanager
+    def _borrow(self) -> Iterator[_Worker]:
+        worker = self._idle.get()
+        try:
+            yield worker
+        finally:
+            self._idle.put(worker)
+
+    def _send(self, worker: _Worker, windows: List[np.ndarray], request: Tuple[Any, ...]) -> Any:
+        if not worker.process.is_alive():
+            self._restart(worker)
+        offset = 0
+        for window in windows:
+            worker.audio[offset:offset + len(window)] = window
+            offset += len(window)
+        try:
+            worker.conn.send(request)
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError) as exc:
+            # The process died mid-request (killed, out of memory); replace it for the next caller
+            self._restart(worker)
+            raise RuntimeError("VAD worker exited mid-request; it has been restarted") from exc
+        if status != "ok":
+            raise RuntimeError(f"VAD worker failed: {payload}")
+        return payload
+
+    def _restart(self, worker: _Worker) -> None:
+        worker.stop()
+        self.restarts += 1
+        # Threads are running in this process by now, so never fork here
+        self._launch(worker, mp.get_context("spawn"))
+        self._await_ready(worker)
+
+    def _launch(self, worker: _Worker, context) -> None:
+        parent_conn, child_conn = context.Pipe()
+        worker.process = context.Process(
+            target=_worker_main,
+            args=(*self._worker_args, worker.input_shm.name, worker.output_shm.name, self.capacity, child_conn),
+            name="vad-worker",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+
+    def _await_ready(self, worker: _Worker) -> None:
+        try:
+            status, detail = worker.conn.recv()
+        except EOFError:
+            status, detail = "error", "worker exited"
+        if status != "ready":
+            raise RuntimeError(f"VAD worker failed to start: {detail}")
+        self.sample_rate, self.onset, self.offset = detail["sample_rate"], detail["onset"], detail["offset"]
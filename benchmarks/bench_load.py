@@ -0,0 +1,200 @@
+"""Drive AudioEngine, or the FastAPI app around it, with simulated concurrent sessions.
+
+Each session streams synthetic speech and silence as int16 chunks at one of the
+configured sample rates, through stub VAD and transcription models with fixed
+latencies. The report covers throughput, chunk latency percentiles, CPU time and
+resident memory per session, and the engine's own counters.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import sys
+from threading import Barrier, local
+import time
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aviso_vc.config import Settings  # noqa: E402
+from aviso_vc.service import AudioEngine  # noqa: E402
+from report import cpu_seconds, rss_bytes, summarize, write_report  # noqa: E402
+from stubs import StubDetector, StubTranscriber  # noqa: E402
+from synthetic import synthetic_speech, to_pcm16  # noqa: E402
+
+
+@dataclass
+class SessionRun:
+    sample_rate: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class EngineTarget:
+    def __init__(self, engine: AudioEngine) -> None:
+        self.engine = engine
+
+    def send(self, session_id: str, payload: bytes, sample_rate: int) -> None:
+        self.engine.process_bytes(session_id, payload, sample_rate)
+
+    def close(self) -> None:
+        pass
+
+
+class AppTarget:
+    """Posts raw chunks through the ASGI app in-process; models are the engine's stubs."""
+
+    def __init__(self, engine: AudioEngine) -> None:
+        from fastapi.testclient import TestClient
+
+        from aviso_vc.admission import IngestController
+        from aviso_vc.api import create_app
+
+        self.app = create_app()
+        # The lifespan only runs for a TestClient used as a context manager, so the stub engine stays
+        self.app.state.engine = engine
+        self.app.state.ingest = IngestController.from_settings(engine, engine.settings)
+        self._client_class = TestClient
+        self._local = local()
+
+    def send(self, session_id: str, payload: bytes, sample_rate: int) -> None:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_class(self.app)
+        response = client.post(
+            f"/api/audio-chunk/{session_id}/raw",
+            params={"sample_rate": sample_rate},
+            content=payload,
+            headers={"content-type": "application/octet-stream"},
+        )
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self.app.state.ingest.close()
+
+
+def stream(
+    target, index: int, chunks: List[bytes], run: SessionRun, chunk_seconds: float, realtime: bool, start: Barrier
+) -> None:
+    session_id = f"bench-{index}"
+    start.wait()
+    deadline = time.perf_counter()
+    for payload in chunks:
+        began = time.perf_counter()
+        try:
+            target.send(session_id, payload, run.sample_rate)
+        except Exception:
+            run.errors += 1
+        run.latencies.append(time.perf_counter() - began)
+        if realtime:
+            deadline += chunk_seconds
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["engine", "app"], default="engine")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of audio per session")
+    parser.add_argument("--chunk-ms", type=float, default=250.0)
+    parser.add_argument("--sample-rates", default="16000,44100,48000", help="Assigned to sessions in turn")
+    parser.add_argument("--realtime", action="store_true", help="Pace each session at real time")
+    parser.add_argument("--vad-latency", type=float, default=0.005, help="Seconds per stub VAD forward pass")
+    parser.add_argument("--transcribe-latency", type=float, default=0.2, help="Seconds per stub transcription")
+    parser.add_argument("--no-energy-gate", action="store_true")
+    parser.add_argument("--sync-transcription", action="store_true", help="Transcribe inside the chunk request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    args = parser.parse_args()
+
+    rates = [int(rate) for rate in args.sample_rates.split(",")]
+    settings = Settings(
+        energy_gate=not args.no_energy_gate,
+        async_transcription=not args.sync_transcription,
+        max_sessions=max(args.sessions, 1),
+    )
+    runs: List[SessionRun] = []
+    payloads: List[List[bytes]] = []
+    for index in range(args.sessions):
+        rate = rates[index % len(rates)]
+        audio = synthetic_speech(rate, args.duration, offset=1.3 * index, seed=args.seed + index)
+        size = int(rate * args.chunk_ms / 1000.0)
+        payloads.append([to_pcm16(audio[i:i + size]) for i in range(0, len(audio), size)])
+        runs.append(SessionRun(sample_rate=rate))
+
+    rss_before = rss_bytes()
+    engine = AudioEngine(
+        settings,
+        detector=StubDetector(latency=args.vad_latency, context_duration=settings.vad_context_duration),
+        transcriber=StubTranscriber(latency=args.transcribe_latency),
+    )
+    target = EngineTarget(engine) if args.target == "engine" else AppTarget(engine)
+    start = Barrier(args.sessions + 1)
+    try:
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            futures = [
+                executor.submit(stream, target, i, payloads[i], runs[i], args.chunk_ms / 1000.0, args.realtime, start)
+                for i in range(args.sessions)
+            ]
+            start.wait()
+            cpu_start, wall_start = cpu_seconds(), time.perf_counter()
+            for future in futures:
+                future.result()
+            streamed = time.perf_counter() - wall_start
+        while engine.jobs is not None and engine.jobs.backlog():
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - wall_start
+        cpu = cpu_seconds() - cpu_start
+        rss_after = rss_bytes()
+        transcripts = sum(len(engine.list_transcripts(f"bench-{i}")) for i in range(args.sessions))
+        stats = engine.stats()
+    finally:
+        target.close()
+        engine.close()
+
+    chunks = sum(len(run.latencies) for run in runs)
+    audio_seconds = args.sessions * args.duration
+    by_rate: Dict[str, List[float]] = {}
+    for run in runs:
+        by_rate.setdefault(str(run.sample_rate), []).extend(run.latencies)
+    results = {
+        "chunks": chunks,
+        "errors": sum(run.errors for run in runs),
+        "transcripts": transcripts,
+        "stream_seconds": streamed,
+        "drain_seconds": elapsed - streamed,
+        "chunks_per_second": chunks / streamed,
+        "realtime_factor": audio_seconds / streamed,
+        "latency": summarize([latency for run in runs for latency in run.latencies]),
+        "latency_by_sample_rate": {rate: summarize(values) for rate, values in by_rate.items()},
+        "cpu_seconds": cpu,
+        "cpu_seconds_per_session": cpu / max(args.sessions, 1),
+        "cpu_per_audio_second": cpu / audio_seconds,
+        "rss_bytes": rss_after,
+        "rss_bytes_per_session": (rss_after - rss_before) / max(args.sessions, 1) if rss_before and rss_after else None,
+        "engine": {key: stats[key] for key in ("sessions", "energy_gate", "vad_batching")},
+    }
+
+    latency = results["latency"]
+    print(f"{args.sessions} sessions x {args.duration:g}s via {args.target}, {chunks} chunks in {streamed:.2f}s")
+    print(f"  throughput   {results['chunks_per_second']:.1f} chunks/s, {results['realtime_factor']:.1f}x real time")
+    print(
+        f"  latency      p50 {latency['p50_ms']:.2f} ms, p95 {latency['p95_ms']:.2f} ms, "
+        f"p99 {latency['p99_ms']:.2f} ms, max {latency['max_ms']:.2f} ms"
+    )
+    for rate, summary in sorted(results["latency_by_sample_rate"].items(), key=lambda item: int(item[0])):
+        print(f"  {rate:>7} Hz   p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+    print(f"  cpu          {cpu:.2f}s ({results['cpu_per_audio_second'] * 1000:.1f} ms per audio second)")
+    if results["rss_bytes_per_session"] is not None:
+        per_session = results["rss_bytes_per_session"] / 2**10
+        print(f"  rss          {rss_after / 2**20:.1f} MiB, {per_session:.0f} KiB per session")
+    print(f"  transcripts  {transcripts} ({results['errors']} errors), drained in {results['drain_seconds']:.2f}s")
+    if args.json:
+        write_report(args.json, "load", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Micro-benchmarks for the per-chunk hot spots of the live path.
+
+Times ``resample_audio`` and ``StreamingResampler`` on chunks at common browser
+sample rates, ``int16_to_float32`` on typical payload sizes, and segment buffering
+with ``AudioBuffer`` against growing a list of chunks and concatenating it.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aviso_vc.audio_utils import StreamingResampler, int16_to_float32, resample_audio  # noqa: E402
+from aviso_vc.buffers import AudioBuffer  # noqa: E402
+from report import summarize, write_report  # noqa: E402
+from synthetic import synthetic_speech, to_pcm16  # noqa: E402
+
+TARGET_SR = 16000
+
+
+def measure(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    fn()  # filter design, allocations and other first-call costs
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+def bench_resample(chunk_ms: float, repeats: int) -> Dict[str, dict]:
+    results = {}
+    for source_sr in (44100, 48000, 22050):
+        chunk = synthetic_speech(source_sr, chunk_ms / 1000.0)
+        resampler = StreamingResampler(source_sr, TARGET_SR)
+        results[f"resample_audio/{source_sr}"] = measure(lambda: resample_audio(chunk, source_sr, TARGET_SR), repeats)
+        results[f"streaming_resampler/{source_sr}"] = measure(lambda: resampler.process(chunk), repeats)
+    return results
+
+
+def bench_int16(repeats: int) -> Dict[str, dict]:
+    results = {}
+    for chunk_ms in (20, 250, 1000):
+        payload = to_pcm16(synthetic_speech(48000, chunk_ms / 1000.0))
+        results[f"int16_to_float32/{chunk_ms}ms@48k"] = measure(lambda: int16_to_float32(payload), repeats)
+    return results
+
+
+def bench_buffer(chunk_ms: float, segment: float, repeats: int) -> Dict[str, dict]:
+    """Record one ``segment``-second segment chunk by chunk and hand it off."""
+    size = int(TARGET_SR * chunk_ms / 1000.0)
+    chunks = [synthetic_speech(TARGET_SR, chunk_ms / 1000.0, seed=i) for i in range(int(segment * 1000 / chunk_ms))]
+    buffer = AudioBuffer(int(segment * TARGET_SR) + size)
+
+    def arena() -> np.ndarray:
+        for chunk in chunks:
+            buffer.append(chunk)
+        return buffer.detach()
+
+    def concatenate() -> np.ndarray:
+        audio = np.zeros(0, dtype=np.float32)
+        for chunk in chunks:
+            audio = np.concatenate((audio, chunk))
+        return audio
+
+    def chunk_list() -> np.ndarray:
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+        return np.concatenate(parts)
+
+    return {
+        f"audio_buffer/{segment:g}s": measure(arena, repeats),
+        f"concatenate_per_chunk/{segment:g}s": measure(concatenate, repeats),
+        f"chunk_list/{segment:g}s": measure(chunk_list, repeats),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--chunk-ms", type=float, default=250.0)
+    parser.add_argument("--segment", type=float, default=15.0, help="Seconds of audio buffered per segment")
+    parser.add_argument("--json", type=Path, help="Write the report to this file")
+    args = parser.parse_args()
+
+    results = {
+        **bench_resample(args.chunk_ms, args.repeats),
+        **bench_int16(args.repeats),
+        **bench_buffer(args.chunk_ms, args.segment, max(1, args.repeats // 10)),
+    }
+    print(f"{'benchmark':<36} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+    for name, summary in results.items():
+        print(
+            f"{name:<36} {summary['p50_ms'] * 1000:>10.1f} "
+            f"{summary['p95_ms'] * 1000:>10.1f} {summary['p99_ms'] * 1000:>10.1f}"
+        )
+    if args.json:
+        write_report(args.json, "micro", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
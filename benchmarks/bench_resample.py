@@ -0,0 +1,95 @@
+"""Compare the polyphase resampler against the previous np.interp implementation.
+
+Reports throughput (input samples per second) and the error against an ideal
+band-limited reference for tones below and above the target Nyquist frequency.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aviso_vc.audio_utils import StreamingResampler, resample_audio  # noqa: E402
+
+TARGET_SR = 16000
+IN_BAND_TONES = (440.0, 1000.0, 3000.0)  # below every tested Nyquist frequency
+ALIAS_TONE = 10000.0  # above 8 kHz, must be filtered out before decimation
+
+
+def resample_linear(audio: np.ndarray, source_sr: int, target_sr: int) -> np.ndarray:
+    """The np.interp resampler this benchmark is measured against."""
+    if source_sr == target_sr or len(audio) == 0:
+        return audio.astype(np.float32)
+    duration = len(audio) / float(source_sr)
+    target_length = max(1, int(duration * target_sr))
+    source_times = np.linspace(0.0, duration, num=len(audio), endpoint=False)
+    target_times = np.linspace(0.0, duration, num=target_length, endpoint=False)
+    return np.interp(target_times, source_times, audio).astype(np.float32)
+
+
+def tones(frequencies, sample_rate: int, length: int) -> np.ndarray:
+    t = np.arange(length) / sample_rate
+    return sum(0.2 * np.sin(2 * np.pi * f * t) for f in frequencies)
+
+
+def error_db(output: np.ndarray, reference: np.ndarray, margin: int = 256) -> float:
+    """Residual power relative to the reference power, in dB (lower is better)."""
+    length = min(len(output), len(reference)) - margin
+    residual = output[margin:length] - reference[margin:length]
+    return 10 * np.log10(np.mean(residual ** 2) / np.mean(reference[margin:length] ** 2))
+
+
+def throughput(fn, audio: np.ndarray, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(audio)
+    return len(audio) * repeats / (time.perf_counter() - start)
+
+
+def streaming(source_sr: int, chunk: int):
+    def run(audio: np.ndarray) -> np.ndarray:
+        resampler = StreamingResampler(source_sr, TARGET_SR)
+        return np.concatenate([resampler.process(audio[i:i + chunk]) for i in range(0, len(audio), chunk)])
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="Length of the test signal")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=4096, help="Chunk size for the streaming run")
+    args = parser.parse_args()
+
+    print(f"{'source':>8} {'method':>10} {'Msamples/s':>11} {'in-band dB':>11} {'alias dB':>9}")
+    for source_sr in (44100, 48000, 22050, 8000):
+        length = int(args.seconds * source_sr)
+        in_band = tones(IN_BAND_TONES, source_sr, length).astype(np.float32)
+        alias = tones([ALIAS_TONE], source_sr, length).astype(np.float32) if source_sr > 2 * ALIAS_TONE else None
+        reference = tones(IN_BAND_TONES, TARGET_SR, int(args.seconds * TARGET_SR))
+
+        methods = {
+            "interp": lambda audio, sr=source_sr: resample_linear(audio, sr, TARGET_SR),
+            "polyphase": lambda audio, sr=source_sr: resample_audio(audio, sr, TARGET_SR),
+            "streaming": streaming(source_sr, args.chunk),
+        }
+        for name, fn in methods.items():
+            rate = throughput(fn, in_band, args.repeats) / 1e6
+            in_band_error = error_db(fn(in_band), reference)
+            if alias is None:
+                alias_text = "n/a"
+            else:
+                # Everything left of the out-of-band tone is aliasing
+                leaked = fn(alias)[256:-256]
+                alias_text = f"{10 * np.log10(np.mean(leaked ** 2) / 0.02):.1f}"
+            print(f"{source_sr:>8} {name:>10} {rate:>11.2f} {in_band_error:>11.1f} {alias_text:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Helpers shared by the benchmarks for summarising timings and writing JSON reports."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def summarize(seconds: Sequence[float]) -> Dict[str, float]:
+    """Count, mean and tail percentiles of a list of durations, in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+    values = np.asarray(seconds) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(values),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(values.max()),
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def cpu_seconds() -> float:
+    return time.process_time()
+
+
+def environment() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_report(path: Path, name: str, config: dict, results: dict) -> None:
+    payload = {"benchmark": name, "environment": environment(), "config": config, "results": results}
+    Path(path).write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    print(f"\nReport written to {path}")
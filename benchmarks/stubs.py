@@ -0,0 +1,64 @@
+"""Deterministic stand-ins for the VAD and Whisper models.
+
+The stubs keep the real streaming, batching and locking code paths and replace only
+the model calls with an energy score or canned text after a configurable delay, so
+load runs need neither model downloads nor network access.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+from typing import List, Sequence
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aviso_vc.transcription import CachingTranscriber  # noqa: E402
+from aviso_vc.vad import SpeechSegment, StreamingVADState, VoiceActivityDetector  # noqa: E402
+
+FRAME_DURATION = 0.017  # about the frame step of the pyannote segmentation model
+
+
+class StubDetector(VoiceActivityDetector):
+    """Scores each frame by its RMS after holding the model lock for ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.005, context_duration: float = 2.0, sample_rate: int = 16000) -> None:
+        super().__init__(None, context_duration=context_duration)
+        self.latency = latency
+        self.sample_rate = sample_rate
+
+    def score_windows(self, windows: Sequence[np.ndarray]) -> List[np.ndarray]:
+        with self._model_lock():
+            time.sleep(self.latency)
+        frame = int(FRAME_DURATION * self.sample_rate)
+        scores = []
+        for window in windows:
+            count = max(1, len(window) // frame)
+            frames = np.resize(np.asarray(window, dtype=np.float32)[-count * frame:], (count, frame))
+            scores.append(np.clip(np.sqrt((frames ** 2).mean(axis=1)) / 0.05, 0.0, 1.0))
+        return scores
+
+    def detect_waveform(self, waveform: np.ndarray, sample_rate: int) -> List[SpeechSegment]:
+        if len(waveform) == 0:
+            return []
+        scores = self.score_windows([waveform])[0]
+        return self._hysteresis(scores, len(waveform) / sample_rate / len(scores), StreamingVADState())
+
+
+class StubTranscriber(CachingTranscriber):
+    """Sleeps ``latency`` seconds per segment and returns ``words_per_second`` words per second of audio."""
+
+    model = "stub"
+
+    def __init__(self, latency: float = 0.2, words_per_second: float = 2.5) -> None:
+        self.latency = latency
+        self.words_per_second = words_per_second
+        self.cache = None
+
+    def _transcribe_samples(self, waveform: np.ndarray, sample_rate: int) -> str:
+        time.sleep(self.latency)
+        words = max(1, int(round(len(waveform) / sample_rate * self.words_per_second)))
+        return " ".join(f"word{i}" for i in range(words))
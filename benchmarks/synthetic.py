@@ -0,0 +1,32 @@
+"""Deterministic synthetic audio for the benchmarks."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def synthetic_speech(
+    sample_rate: int,
+    duration: float,
+    speech: float = 3.0,
+    silence: float = 5.0,
+    offset: float = 0.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """Alternating bursts of voiced, syllable-modulated harmonics and quiet room noise.
+
+    ``offset`` shifts the speech/silence pattern so that concurrent sessions do not
+    all start talking at once.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 110.0 + 40.0 * rng.random()
+    voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+    syllables = 0.5 * (1.0 + np.sin(2 * np.pi * 4.0 * t))
+    talking = ((t + offset) % (speech + silence)) < speech
+    audio = 0.15 * voiced * syllables * talking + 0.003 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def to_pcm16(audio: np.ndarray) -> bytes:
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
@@ -16,6 +16,7 @@ const calibrationTimer = document.getElementById("calibration-timer");
 
 let audioContext;
 let processor;
+let socket;
 let mediaStream;
 let source;
 let sampleBuffer = [];
@@ -41,6 +42,7 @@ async function startStreaming() {
     processor.onaudioprocess = handleAudioProcess;
     source.connect(processor);
     processor.connect(audioContext.destination);
+    openSocket();
     running = true;
     startBtn.disabled = true;
     stopBtn.disabled = false;
@@ -70,6 +72,10 @@ async function stopStreaming() {
     mediaStream.getTracks().forEach((track) => track.stop());
     mediaStream = undefined;
   }
+  if (socket) {
+    socket.close();
+    socket = undefined;
+  }
   startBtn.disabled = false;
   stopBtn.disabled = true;
   updateStatus("Parado", "idle");
@@ -107,8 +113,24 @@ function maybeUpload() {
     });
 }
 
+// Streams binary PCM over one WebSocket; sendChunk falls back to HTTP while it is not open.
+function openSocket() {
+  if (socket || !("WebSocket" in window)) return;
+  const protocol = window.location.protocol === "https:" ? "wss" : "ws";
+  socket = new WebSocket(`${protocol}://${window.location.host}/ws/audio/${SESSION_ID}?sample_rate=${SAMPLE_RATE}`);
+  socket.binaryType = "arraybuffer";
+  socket.onmessage = (event) => handleChunkResponse(JSON.parse(event.data));
+  socket.onclose = () => {
+    socket = undefined;
+  };
+}
+
 async function sendChunk(floatSamples) {
   const pcm = floatTo16BitPCM(floatSamples);
+  if (socket?.readyState === WebSocket.OPEN) {
+    socket.send(pcm.buffer);
+    return;
+  }
   const base64 = bytesToBase64(new Uint8Array(pcm.buffer));
   const payload = {
     session_id: SESSION_ID,
@@ -123,16 +145,20 @@ async function sendChunk(floatSamples) {
   if (!response.ok) {
     throw new Error(`API respondeu ${response.status}`);
   }
-  const data = await response.json();
+  handleChunkResponse(await response.json());
+}
 
+function handleChunkResponse(data) {
   // Handle warning
   if (data.warning_active) {
     showWarning();
   }
 
-  if (data.status === "transcribed" && data.transcript) {
-    appendTranscript(data.transcript);
+  if (data.status === "transcribed" && data.transcripts?.length) {
+    data.transcripts.forEach(appendTranscript);
     updateStatus("Transcrição pronta", "active");
+  } else if (data.status === "transcribing") {
+    updateStatus("Transcrevendo…", "active");
   } else if (data.status === "calibrating") {
     updateStatus("Calibrando…", "active");
   } else {
@@ -227,6 +253,7 @@ async function startCalibration() {
       source.connect(processor);
       processor.connect(audioContext.destination);
     }
+    openSocket();
 
     // Call API to start calibration
     const response = await fetch(`/api/calibration/${SESSION_ID}/start`, {
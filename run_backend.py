@@ -3,26 +3,70 @@
 
 from __future__ import annotations
 
+import argparse
+import copy
+import os
+
 import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the AvisoVC API server.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("AVISO_WORKERS", "1")),
+        help="Number of uvicorn worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--session-store",
+        choices=["local", "memory", "sqlite"],
+        default=None,
+        help="Session store backend; defaults to sqlite when running several workers",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
     """Start the AvisoVC API server."""
+    args = parse_args()
+    if args.workers > 1 and args.session_store in {"local", "memory"}:
+        # Each worker would hold its own sessions, so chunks routed to another worker start over
+        raise SystemExit(f"--session-store {args.session_store} cannot be shared by {args.workers} workers; use sqlite")
+    session_store = args.session_store or ("sqlite" if args.workers > 1 else None)
+    if session_store:
+        # Settings.from_env() picks this up in every worker process
+        os.environ["AVISO_SESSION_STORE"] = session_store
+    if args.workers > 1:
+        # Uvicorn workers share one socket, so a session's chunks can reach any of them;
+        # every worker must reload shared snapshots instead of trusting its local copy
+        os.environ["AVISO_SESSION_AFFINITY"] = "0"
+
     print("=" * 60)
     print("Starting AvisoVC Backend Server")
     print("=" * 60)
     print("\nServer will be available at:")
-    print("  - Local:   http://localhost:8000")
-    print("  - Network: http://0.0.0.0:8000")
+    print(f"  - Local:   http://localhost:{args.port}")
+    print(f"  - Network: http://0.0.0.0:{args.port}")
+    if args.workers > 1:
+        print(f"\nWorkers: {args.workers} (session store: {session_store}, no session affinity)")
     print("\nPress Ctrl+C to stop the server\n")
     print("=" * 60)
 
+    # Route the package's log records (engine startup, failed jobs) through uvicorn's handler
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config["loggers"]["aviso_vc"] = {"handlers": ["default"], "level": "INFO", "propagate": False}
+
     uvicorn.run(
         "aviso_vc.api:app",
         host="0.0.0.0",
-        port=8000,
+        port=args.port,
         reload=False,
-        log_level="info"
+        workers=args.workers,
+        log_level="info",
+        log_config=log_config,
     )
 
 
@@ -4,42 +4,124 @@ import argparse
 from pathlib import Path
 
 from aviso_vc import Settings, VoiceActivityWorkflow
+from aviso_vc.batch import BatchWorkflow, collect_inputs, is_batch_input
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Detect speech with pyannote VAD, save 5-second clips, and transcribe with Whisper.",
+        description="Detect speech with pyannote VAD and transcribe 5-second clips with Whisper.",
+    )
+    parser.add_argument(
+        "audio",
+        type=Path,
+        help="Source audio file (wav recommended), a directory of audio files, or a .txt/.lst manifest of them",
+    )
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help="Read AUDIO as a manifest of audio paths whatever its extension",
     )
-    parser.add_argument("audio", type=Path, help="Path to the source audio file (wav recommended)")
     parser.add_argument(
         "--segment-duration",
         type=float,
         default=5.0,
         help="Length of each saved speech segment in seconds (default: 5)",
     )
+    parser.add_argument(
+        "--endpointing",
+        action="store_true",
+        help="Cut segments at speech pauses (trimming silence) instead of fixed --segment-duration clips",
+    )
+    parser.add_argument(
+        "--max-segment-duration",
+        type=float,
+        default=15.0,
+        help="Longest segment with --endpointing, in seconds (default: 15)",
+    )
     parser.add_argument(
         "--output-dir",
         type=Path,
         default=Path("speech_segments"),
-        help="Directory where speech clips will be stored",
+        help="Directory where speech clips are stored with --save-clips",
+    )
+    parser.add_argument(
+        "--save-clips",
+        action="store_true",
+        help="Also write each speech segment to --output-dir (in the background)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its journal, skipping segments already transcribed",
+    )
+    parser.add_argument(
+        "--vad-workers",
+        type=int,
+        default=2,
+        help="VAD worker processes in directory/manifest mode; 0 runs VAD in the main process (default: 2)",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help="Results journal path (default: <output-dir>/<audio name>.journal.jsonl)",
     )
     parser.add_argument(
         "--whisper-task",
         choices=["translate", "transcribe"],
-        default="translate",
-        help="Whether Whisper should translate to English or just transcribe",
+        default="transcribe",
+        help="Whether the local backend translates to English or just transcribes; Groq always transcribes",
+    )
+    parser.add_argument(
+        "--transcriber",
+        choices=["groq", "local"],
+        default="groq",
+        help="Transcription backend: the Groq API or a local Whisper model (default: groq)",
+    )
+    parser.add_argument(
+        "--transcription-cache-mb",
+        type=int,
+        default=256,
+        help="Size of the on-disk transcription cache reused across runs; 0 disables it (default: 256)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Segments grouped into one upload or forward pass; needs --concurrency of at least this (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of segments transcribed in parallel (default: 1)",
     )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
+    batch = is_batch_input(args.audio, manifest=args.manifest)
     settings = Settings(
-        audio_path=args.audio,
+        audio_path=None if batch else args.audio,
         segment_duration=args.segment_duration,
+        endpointing=args.endpointing,
+        max_segment_duration=args.max_segment_duration,
         output_dir=args.output_dir,
+        save_clips=args.save_clips,
+        journal_path=args.journal,
+        resume=args.resume,
         whisper_task=args.whisper_task,
+        workflow_concurrency=args.concurrency,
+        transcriber=args.transcriber,
+        transcription_cache_max_bytes=args.transcription_cache_mb * 1024 * 1024,
+        transcription_batch_size=args.batch_size,
+        batch_vad_workers=args.vad_workers,
     )
+    if batch:
+        root = args.audio if args.audio.is_dir() else None
+        BatchWorkflow(settings, collect_inputs(args.audio), root=root).run()
+        return
     workflow = VoiceActivityWorkflow(settings)
     workflow.run()
 
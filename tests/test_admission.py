@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from threading import Event
+from typing import List
+
+import pytest
+
+from aviso_vc.admission import IngestController, Overloaded
+from aviso_vc.results import ChunkResult, SessionState, SessionTranscript
+
+
+class FakeMetrics:
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+
+    def wait(self, name: str, seconds: float) -> None:
+        pass
+
+    def increment(self, name: str, outcome: str, amount: int = 1) -> None:
+        self.counts[outcome] += amount
+
+
+class FakeEngine:
+    """Blocks every chunk until ``release`` is set and records the payloads it got."""
+
+    def __init__(self, state: SessionState = SessionState.LISTENING) -> None:
+        self.state = state
+        self.metrics = FakeMetrics()
+        self.release = Event()
+        self.calls: List[bytes] = []
+
+    def session_state(self, session_id: str) -> SessionState:
+        return self.state
+
+    def process_bytes(self, session_id: str, payload: bytes, sample_rate: int) -> ChunkResult:
+        self.calls.append(payload)
+        assert self.release.wait(5)
+        transcript = SessionTranscript(number=len(self.calls), text="x", words_per_second=1.0, chars_per_second=1.0)
+        return ChunkResult(state=self.state, transcripts=[transcript])
+
+
+async def until(condition, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.001)
+
+
+def run(engine: FakeEngine, scenario, **options):
+    controller = IngestController(engine, **options)
+
+    async def main():
+        try:
+            return await scenario(controller)
+        finally:
+            engine.release.set()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        controller.close()
+
+
+def test_rejects_chunks_beyond_the_session_limit():
+    engine = FakeEngine()
+
+    async def scenario(controller):
+        first = asyncio.ensure_future(controller.submit("a", b"1", 16000))
+        await until(lambda: len(engine.calls) == 1)
+        second = asyncio.ensure_future(controller.submit("a", b"2", 16000))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as error:
+            await controller.submit("a", b"3", 16000)
+        assert error.value.retry_after_header == "2"
+        engine.release.set()
+        await asyncio.gather(first, second)
+
+    run(engine, scenario, max_in_flight_per_session=2, stale_chunk_policy="off", retry_after=1.5)
+    assert engine.calls == [b"1", b"2"]
+    assert engine.metrics.counts == {"processed": 2, "rejected": 1}
+
+
+def test_rejects_chunks_beyond_the_server_limit():
+    engine = FakeEngine()
+
+    async def scenario(controller):
+        first = asyncio.ensure_future(controller.submit("a", b"1", 16000))
+        await until(lambda: len(engine.calls) == 1)
+        with pytest.raises(Overloaded):
+            await controller.submit("b", b"2", 16000)
+        engine.release.set()
+        await first
+
+    run(engine, scenario, max_queued_chunks=1)
+    assert engine.calls == [b"1"]
+
+
+def test_drop_answers_the_oldest_waiting_chunk_unprocessed():
+    engine = FakeEngine()
+
+    async def scenario(controller):
+        first = asyncio.ensure_future(controller.submit("a", b"1", 16000))
+        await until(lambda: len(engine.calls) == 1)
+        second = asyncio.ensure_future(controller.submit("a", b"2", 16000))
+        await asyncio.sleep(0)
+        third = asyncio.ensure_future(controller.submit("a", b"3", 16000))
+        dropped = await second
+        engine.release.set()
+        await asyncio.gather(first, third)
+        return dropped
+
+    dropped = run(engine, scenario, max_in_flight_per_session=2, stale_chunk_policy="drop")
+    assert dropped.state == SessionState.LISTENING and dropped.transcripts == []
+    assert engine.calls == [b"1", b"3"]
+    assert engine.metrics.counts["dropped"] == 1
+
+
+def test_coalesce_merges_waiting_chunks_into_one_call():
+    engine = FakeEngine()
+
+    async def scenario(controller):
+        first = asyncio.ensure_future(controller.submit("a", b"1", 16000))
+        await until(lambda: len(engine.calls) == 1)
+        waiting = [asyncio.ensure_future(controller.submit("a", payload, 16000)) for payload in (b"2", b"3")]
+        await asyncio.sleep(0)
+        engine.release.set()
+        await first
+        return await asyncio.gather(*waiting)
+
+    older, newest = run(engine, scenario, max_in_flight_per_session=4, stale_chunk_policy="coalesce")
+    assert engine.calls == [b"1", b"23"]
+    # Transcripts are delivered once, with the newest chunk
+    assert older.transcripts == [] and len(newest.transcripts) == 1
+    assert engine.metrics.counts["coalesced"] == 1
+
+
+def test_recording_sessions_are_not_coalesced():
+    engine = FakeEngine(state=SessionState.RECORDING)
+
+    async def scenario(controller):
+        first = asyncio.ensure_future(controller.submit("a", b"1", 16000))
+        await until(lambda: len(engine.calls) == 1)
+        waiting = [asyncio.ensure_future(controller.submit("a", payload, 16000)) for payload in (b"2", b"3")]
+        await asyncio.sleep(0)
+        engine.release.set()
+        await asyncio.gather(first, *waiting)
+
+    run(engine, scenario, max_in_flight_per_session=4, stale_chunk_policy="coalesce")
+    assert engine.calls == [b"1", b"2", b"3"]
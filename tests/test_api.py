@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("pyannote.audio")
+
+from fastapi.testclient import TestClient
+
+from aviso_vc.admission import IngestController
+from aviso_vc.api import create_app
+from aviso_vc.jobs import JobStatus, TranscriptionJob
+from aviso_vc.results import ChunkResult, SessionState, SessionTranscript
+
+
+class FakeMetrics:
+    def wait(self, name: str, seconds: float) -> None:
+        pass
+
+    def increment(self, name: str, outcome: str, amount: int = 1) -> None:
+        pass
+
+
+def transcript(number: int) -> SessionTranscript:
+    return SessionTranscript(number=number, text="hello", words_per_second=2.0, chars_per_second=10.0)
+
+
+class ScriptedEngine:
+    """Answers each chunk with the next scripted result and records what it was sent."""
+
+    def __init__(self, *results: ChunkResult) -> None:
+        self.results = list(results)
+        self.metrics = FakeMetrics()
+        self.chunks: List[Tuple[bytes, int]] = []
+        self.jobs = {}
+        self.polled: Optional[ChunkResult] = None
+
+    def session_state(self, session_id: str) -> SessionState:
+        return SessionState.RECORDING
+
+    def process_bytes(self, session_id: str, payload: bytes, sample_rate: int) -> ChunkResult:
+        self.chunks.append((payload, sample_rate))
+        return self.results.pop(0)
+
+    def get_job(self, job_id: str) -> Optional[TranscriptionJob]:
+        return self.jobs.get(job_id)
+
+    def poll(self, session_id: str) -> Optional[ChunkResult]:
+        return self.polled
+
+
+@pytest.fixture
+def connect():
+    clients = []
+
+    def connect(engine: ScriptedEngine, path: str = "/ws/audio/s1"):
+        app = create_app()
+        app.state.engine = engine
+        app.state.ingest = IngestController(engine, stale_chunk_policy="off")
+        clients.append(app.state.ingest)
+        return TestClient(app).websocket_connect(path)
+
+    yield connect
+    for ingest in clients:
+        ingest.close()
+
+
+def test_unchanged_state_is_not_pushed_again(connect):
+    listening = ChunkResult(state=SessionState.LISTENING, transcripts=[])
+    recording = ChunkResult(state=SessionState.RECORDING, transcripts=[])
+    engine = ScriptedEngine(listening, listening, recording)
+    with connect(engine) as websocket:
+        for _ in range(3):
+            websocket.send_bytes(b"\x00\x00" * 160)
+        assert websocket.receive_json()["status"] == "listening"
+        assert websocket.receive_json()["status"] == "recording"
+    assert len(engine.chunks) == 3
+
+
+def test_control_messages_set_the_sample_rate_of_later_frames(connect):
+    engine = ScriptedEngine(*[ChunkResult(state=SessionState.LISTENING, transcripts=[])] * 2)
+    with connect(engine, "/ws/audio/s1?sample_rate=8000") as websocket:
+        websocket.send_bytes(b"\x00\x00")
+        websocket.receive_json()
+        websocket.send_text('{"sample_rate": 48000}')
+        websocket.send_bytes(b"\x00\x00")
+        websocket.send_text("not json")
+        assert websocket.receive_json()["status"] == "error"
+    assert [rate for _, rate in engine.chunks] == [8000, 48000]
+
+
+def test_odd_length_frames_are_rejected(connect):
+    engine = ScriptedEngine()
+    with connect(engine) as websocket:
+        websocket.send_bytes(b"\x00\x00\x00")
+        event = websocket.receive_json()
+    assert event["status"] == "error"
+    assert "even number of bytes" in event["detail"]
+    assert engine.chunks == []
+
+
+def test_transcript_finishing_later_is_pushed(connect):
+    job = TranscriptionJob(job_id="j1", session_id="s1", status=JobStatus.DONE, future=Future())
+    engine = ScriptedEngine(ChunkResult(state=SessionState.LISTENING, transcripts=[], job_id="j1"))
+    engine.jobs["j1"] = job
+    engine.polled = ChunkResult(state=SessionState.LISTENING, transcripts=[transcript(1)])
+    with connect(engine) as websocket:
+        websocket.send_bytes(b"\x00\x00")
+        started = websocket.receive_json()
+        job.future.set_result(None)
+        finished = websocket.receive_json()
+    assert started["status"] == "transcribing" and started["job_id"] == "j1"
+    assert finished["status"] == "transcribed"
+    assert finished["transcript"]["text"] == "hello"
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from aviso_vc.audio_utils import StreamingResampler, encode_audio, resample_audio
+
+
+@pytest.mark.parametrize("source_sr", [8000, 22050, 44100, 48000])
+def test_streaming_resampler_matches_one_shot(source_sr):
+    audio = np.random.default_rng(0).uniform(-0.5, 0.5, source_sr).astype(np.float32)
+    expected = StreamingResampler(source_sr, 16000).process(audio)
+
+    resampler = StreamingResampler(source_sr, 16000)
+    bounds = [0, 1, 7, 400, 401, 4096, 9000, len(audio)]
+    chunked = np.concatenate([resampler.process(audio[start:end]) for start, end in zip(bounds, bounds[1:])])
+
+    assert len(chunked) == len(expected)
+    np.testing.assert_allclose(chunked, expected, atol=1e-6)
+
+
+def test_resample_audio_keeps_duration():
+    audio = np.zeros(44100, dtype=np.float32)
+    assert len(resample_audio(audio, 44100, 16000)) == 16000
+
+
+def test_streaming_resampler_rejects_non_positive_rates():
+    with pytest.raises(ValueError):
+        StreamingResampler(0, 16000)
+
+
+def test_opus_encoding_resamples_unsupported_rates():
+    if "OPUS" not in sf.available_subtypes("OGG"):
+        pytest.skip("libsndfile was built without Opus")
+    audio = (0.1 * np.sin(np.arange(44100) / 10.0)).astype(np.float32)
+    filename, data = encode_audio(audio, 44100, "opus")
+    decoded, sample_rate = sf.read(io.BytesIO(data))
+    assert filename == "audio.ogg"
+    assert sample_rate == 16000 and len(decoded) == 16000
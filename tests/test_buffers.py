@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import numpy as np
+
+from aviso_vc.buffers import AudioBuffer
+
+
+def test_append_drops_samples_beyond_capacity():
+    buffer = AudioBuffer(5)
+    assert buffer.append(np.ones(3, dtype=np.float32)) == 3
+    assert buffer.append(np.ones(3, dtype=np.float32)) == 2
+    assert len(buffer) == 5
+
+
+def test_nbytes_counts_buffered_samples_only():
+    buffer = AudioBuffer(16000)
+    assert buffer.nbytes == 0
+    buffer.append(np.ones(100, dtype=np.float32))
+    assert buffer.nbytes == 400
+    buffer.clear()
+    assert buffer.nbytes == 0
+
+
+def test_detach_hands_off_samples_and_starts_over():
+    buffer = AudioBuffer(10)
+    buffer.append(np.arange(6, dtype=np.float32))
+    generation = buffer.generation
+
+    audio = buffer.detach(4)
+    buffer.append(np.full(10, -1.0, dtype=np.float32))
+
+    # The detached view is not overwritten by later appends
+    np.testing.assert_array_equal(audio, [0, 1, 2, 3])
+    np.testing.assert_array_equal(buffer.view(), np.full(10, -1.0))
+    assert buffer.generation != generation
+
+
+def test_detach_without_length_returns_everything():
+    buffer = AudioBuffer(10)
+    buffer.append(np.arange(3, dtype=np.float32))
+    np.testing.assert_array_equal(buffer.detach(), [0, 1, 2])
+    assert len(buffer) == 0
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from aviso_vc.cache import TimelineCache, TranscriptionCache, audio_key
+from aviso_vc.config import Settings
+from aviso_vc.segments import SpeechSegment
+
+
+def test_key_depends_on_samples_and_parameters():
+    samples = np.zeros(160, dtype=np.float32)
+    key = audio_key(samples, 16000, model="m", task="transcribe")
+    assert key == audio_key(samples.copy(), 16000, model="m", task="transcribe")
+    assert key != audio_key(samples, 16000, model="m", task="translate")
+    assert key != audio_key(samples + 0.1, 16000, model="m", task="transcribe")
+
+
+def test_memory_tier_keeps_the_most_recently_used_entries():
+    cache = TranscriptionCache(max_entries=2)
+    cache.put("a", "one")
+    cache.put("b", "two")
+    assert cache.get("a") == "one"
+    cache.put("c", "three")
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "three"
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (2, 1)
+    assert stats["disk_bytes"] is None
+
+
+def test_disk_tier_outlives_the_process(tmp_path: Path):
+    first = TranscriptionCache(max_entries=0, path=tmp_path / "cache.db")
+    first.put("a", "hello")
+    first.close()
+
+    second = TranscriptionCache(max_entries=0, path=tmp_path / "cache.db")
+    assert second.get("a") == "hello"
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+
+def test_disk_size_is_shared_by_every_connection(tmp_path: Path):
+    first = TranscriptionCache(max_entries=0, path=tmp_path / "cache.db")
+    second = TranscriptionCache(max_entries=0, path=tmp_path / "cache.db")
+    first.put("a", "x" * 100)
+    second.put("b", "y" * 100)
+    second.put("b", "y" * 50)
+
+    assert first.stats()["disk_bytes"] == second.stats()["disk_bytes"] == 2 + 150
+    first.close()
+    second.close()
+
+
+def test_disk_tier_evicts_least_recently_used_rows(tmp_path: Path):
+    cache = TranscriptionCache(max_entries=0, path=tmp_path / "cache.db", max_disk_bytes=250)
+    for key in "abc":
+        cache.put(key, key * 99)
+    # c pushes the tier past its bound, so a, the oldest row, goes
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.stats()["disk_bytes"] == 200
+    cache.close()
+
+
+def test_timeline_key_covers_content_and_detection_settings(tmp_path: Path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"first")
+    key = TimelineCache.key(audio, Settings())
+    assert key == TimelineCache.key(audio, Settings())
+    assert key != TimelineCache.key(audio, Settings(vad_onset=0.7))
+    assert key != TimelineCache.key(audio, Settings(vad_min_duration_off=0.2))
+    assert key != TimelineCache.key(audio, Settings(vad_window_duration=300.0))
+
+    audio.write_bytes(b"second")
+    assert key != TimelineCache.key(audio, Settings())
+
+
+def test_timelines_round_trip(tmp_path: Path):
+    cache = TimelineCache(tmp_path / "timelines")
+    assert cache.get("ab12") is None
+    cache.put("ab12", [SpeechSegment(0.5, 1.25), SpeechSegment(3.0, 4.0)])
+    cache.put("cd34", [])
+
+    assert cache.get("ab12") == [SpeechSegment(0.5, 1.25), SpeechSegment(3.0, 4.0)]
+    assert cache.get("cd34") == []
+    assert cache.stats() == {"misses": 1, "hits": 2}
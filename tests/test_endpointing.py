@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from aviso_vc.endpointing import plan_segments
+from aviso_vc.segments import SpeechSegment
+
+
+def spans(segments):
+    return [(segment.start, segment.end) for segment in segments]
+
+
+def plan(regions, duration=30.0, **options):
+    return spans(plan_segments([SpeechSegment(start, end) for start, end in regions], duration, **options))
+
+
+def test_short_pauses_are_joined_and_padded():
+    assert plan([(1.0, 2.0), (2.3, 4.0)]) == pytest.approx([(0.9, 4.1)])
+
+
+def test_short_regions_merge_with_a_near_neighbour():
+    assert plan([(1.0, 1.5), (2.5, 5.0)]) == pytest.approx([(0.9, 5.1)])
+
+
+def test_short_regions_stay_apart_beyond_the_merge_gap():
+    assert plan([(1.0, 1.5), (3.5, 5.0)]) == pytest.approx([(0.9, 1.6), (3.4, 5.1)])
+
+
+def test_merging_never_exceeds_the_maximum_duration():
+    # Padding stops halfway between neighbours
+    assert plan([(0.0, 10.0), (10.2, 20.0)]) == pytest.approx([(0.0, 10.1), (10.1, 20.1)])
+
+
+def test_long_regions_are_split_into_equal_parts():
+    assert plan([(0.0, 40.0)], duration=40.0) == pytest.approx(
+        [(0.0, 40.0 / 3), (40.0 / 3, 80.0 / 3), (80.0 / 3, 40.0)]
+    )
+
+
+def test_padding_stays_within_the_recording():
+    assert plan([(0.05, 2.0)], duration=2.02) == pytest.approx([(0.0, 2.02)])
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy as np
+
+from aviso_vc.energy_gate import EnergyGate, EnergyGateState
+
+RATE = 16000
+
+
+def tone(seconds: float, amplitude: float, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def noise(seconds: float, amplitude: float, seed: int = 0) -> np.ndarray:
+    return (amplitude * np.random.default_rng(seed).standard_normal(int(seconds * RATE))).astype(np.float32)
+
+
+def test_digital_silence_is_gated():
+    gate = EnergyGate(RATE)
+    state = EnergyGateState()
+    assert not gate.admit(np.zeros(RATE // 4, dtype=np.float32), state)
+    assert gate.stats()["gated"] == 1
+
+
+def test_voiced_sound_above_the_noise_floor_is_forwarded():
+    gate = EnergyGate(RATE)
+    state = EnergyGateState()
+    assert not gate.admit(noise(0.25, 0.001), state)
+    chunk = noise(0.25, 0.001, seed=1)
+    chunk[RATE // 8:] += tone(0.125, 0.3)
+    assert gate.admit(chunk, state)
+
+
+def test_loud_hiss_is_not_mistaken_for_speech():
+    gate = EnergyGate(RATE)
+    assert not gate.admit(noise(0.25, 0.1), EnergyGateState())
+
+
+def test_hangover_keeps_forwarding_after_speech():
+    gate = EnergyGate(RATE, hangover=0.5)
+    state = EnergyGateState(noise_floor=0.001)
+    assert gate.admit(tone(0.25, 0.3), state)
+    # Half a second of hangover covers the next two quarter-second chunks, not the third
+    assert gate.admit(np.zeros(RATE // 4, dtype=np.float32), state)
+    assert gate.admit(np.zeros(RATE // 4, dtype=np.float32), state)
+    assert not gate.admit(np.zeros(RATE // 4, dtype=np.float32), state)
+    assert gate.stats()["gated_ratio"] == 0.25
+
+
+def test_noise_floor_drops_at_once_and_rises_slowly():
+    gate = EnergyGate(RATE, adapt_rate=0.1)
+    state = EnergyGateState()
+    gate.admit(noise(0.25, 0.01), state)
+    loud_floor = state.noise_floor
+    gate.admit(noise(0.25, 0.001, seed=1), state)
+    quiet_floor = state.noise_floor
+    assert quiet_floor < loud_floor / 5
+
+    gate.admit(noise(0.25, 0.01, seed=2), state)
+    assert quiet_floor < state.noise_floor < quiet_floor + 0.2 * (loud_floor - quiet_floor)
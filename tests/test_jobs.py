@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from aviso_vc.jobs import JobStatus, TranscriptionQueue
+
+
+@pytest.fixture
+def queue():
+    queue = TranscriptionQueue(max_workers=2, history=2)
+    yield queue
+    queue.shutdown()
+
+
+def fail():
+    raise RuntimeError("upload rejected")
+
+
+def test_finished_job_keeps_its_result(queue):
+    job = queue.submit("a", lambda: "hello")
+    queue.shutdown()
+    assert queue.get(job.job_id).status == JobStatus.DONE
+    assert job.result == "hello"
+    assert queue.pending("a") == []
+
+
+def test_failed_job_is_logged_and_reported_once(queue, caplog):
+    with caplog.at_level(logging.ERROR, logger="aviso_vc.jobs"):
+        job = queue.submit("a", fail)
+        queue.shutdown()
+    assert job.status == JobStatus.FAILED
+    assert job.error == "upload rejected"
+    assert job.job_id in caplog.text
+    assert queue.take_failures("b") == []
+    assert queue.take_failures("a") == [job.job_id]
+    assert queue.take_failures("a") == []
+
+
+def test_history_prunes_old_jobs_and_their_failures():
+    # One worker, so jobs finish in submission order
+    queue = TranscriptionQueue(max_workers=1, history=2)
+    failed = queue.submit("a", fail)
+    for _ in range(2):
+        queue.submit("b", lambda: None)
+    queue.shutdown()
+    assert queue.get(failed.job_id) is None
+    assert queue.take_failures("a") == []
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from aviso_vc.audio_utils import AudioClip
+from aviso_vc.journal import ResultsJournal
+from aviso_vc.segments import SpeechSegment
+from aviso_vc.transcription import TranscriptionResult
+
+SEGMENTS = [SpeechSegment(0.0, 1.0), SpeechSegment(2.0, 3.0), SpeechSegment(4.0, 5.0)]
+
+
+def record(journal: ResultsJournal, index: int) -> None:
+    segment = SEGMENTS[index]
+    clip = AudioClip(path=None, start=segment.start, end=segment.end)
+    journal.record(index, clip, TranscriptionResult(text=f"segment {index}", words_per_second=2.0))
+
+
+def test_resume_after_a_torn_last_line(tmp_path: Path):
+    path = tmp_path / "run.journal.jsonl"
+    journal = ResultsJournal(path)
+    journal.open({"audio": "a.wav"}, SEGMENTS)
+    record(journal, 0)
+    record(journal, 1)
+    journal.close()
+    # The interrupted run died halfway through writing a third record
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"type": "segment", "index": 2, "te')
+
+    resumed = ResultsJournal(path)
+    state = resumed.load()
+    assert state.header == {"audio": "a.wav"}
+    assert [(segment.start, segment.end) for segment in state.segments] == [(0.0, 1.0), (2.0, 3.0), (4.0, 5.0)]
+    assert sorted(state.completed) == [0, 1]
+    assert state.completed[1][1].text == "segment 1"
+
+    resumed.open(state.header, state.segments, append=True)
+    record(resumed, 2)
+    resumed.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert sorted(ResultsJournal(path).load().completed) == [0, 1, 2]
+
+
+def test_missing_journal_loads_as_none(tmp_path: Path):
+    assert ResultsJournal(tmp_path / "missing.jsonl").load() is None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from aviso_vc.cache import TranscriptionCache
+from aviso_vc.config import Settings
+from aviso_vc.metrics import Metrics, server_timing
+from aviso_vc.microbatch import MicroBatcher
+from aviso_vc.transcription import BatchingTranscriber, CachingTranscriber
+
+
+class EchoTranscriber(CachingTranscriber):
+    model = "echo"
+
+    def __init__(self, cache: TranscriptionCache) -> None:
+        self.cache = cache
+
+    def _transcribe_samples(self, waveform: np.ndarray, sample_rate: int) -> str:
+        return "hello"
+
+
+class FakeDetector:
+    metrics = None
+    batcher = None
+
+    def enable_batching(self, max_batch_size: int, max_wait: float) -> MicroBatcher:
+        self.batcher = MicroBatcher(lambda windows: [[] for _ in windows], max_batch_size, max_wait)
+        return self.batcher
+
+
+def test_stage_timings_are_rendered_as_histograms_and_collected_per_request():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    with metrics.request() as timings:
+        metrics.observe("stage", "vad", 0.5)
+        metrics.wait("detector", 0.05)
+    metrics.increment("ingest_chunks", "accepted", 2)
+
+    text = metrics.render(gauges={"sessions_active": 3}, counters={("vad_batches", ""): 7})
+    assert 'aviso_stage_seconds_bucket{stage="vad",le="0.1"} 0' in text
+    assert 'aviso_stage_seconds_bucket{stage="vad",le="1.0"} 1' in text
+    assert 'aviso_wait_seconds_count{resource="detector"} 1' in text
+    assert 'aviso_ingest_chunks_total{outcome="accepted"} 2' in text
+    assert "aviso_vad_batches_total 7" in text
+    assert "aviso_sessions_active 3" in text
+    assert set(timings) == {"request", "vad", "detector"}
+    assert server_timing({"vad": 0.5}) == "vad;dur=500.000"
+
+
+def test_engine_exports_batching_and_cache_figures():
+    pytest.importorskip("pyannote.audio")
+    from aviso_vc.service import AudioEngine
+
+    transcriber = BatchingTranscriber(EchoTranscriber(TranscriptionCache()), max_batch_size=4, max_wait=0.001)
+    engine = AudioEngine(Settings(async_transcription=False), detector=FakeDetector(), transcriber=transcriber)
+    try:
+        engine.detector.batcher.call(np.zeros(16000, dtype=np.float32))
+        for _ in range(2):
+            transcriber.transcribe_waveform(np.zeros(1600, dtype=np.float32), 16000)
+        text = engine.render_metrics()
+    finally:
+        engine.close()
+
+    assert "aviso_vad_batches_total 1" in text
+    assert "aviso_vad_batched_windows_total 1" in text
+    assert "aviso_vad_batch_fill 0.0625" in text
+    assert "aviso_transcription_batches_total 2" in text
+    assert 'aviso_transcription_cache_lookups_total{outcome="memory_hits"} 1' in text
+    assert 'aviso_transcription_cache_lookups_total{outcome="misses"} 1' in text
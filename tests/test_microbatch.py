@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+from typing import List, Sequence
+
+import pytest
+
+from aviso_vc.microbatch import MicroBatcher
+
+
+class Recorder:
+    """Doubles every item and records the batches it was called with."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[int]] = []
+        self._lock = Lock()
+
+    def __call__(self, items: Sequence[int]) -> List[int]:
+        with self._lock:
+            self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+def test_concurrent_calls_share_a_batch():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait=0.5)
+    try:
+        futures = [batcher.submit(item) for item in range(8)]
+        assert [future.result(timeout=5) for future in futures] == [item * 2 for item in range(8)]
+    finally:
+        batcher.close()
+    assert recorder.batches == [list(range(8))]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["mean_fill"] == 1.0
+
+
+def test_batches_are_capped_at_max_batch_size():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=3, max_wait=0.5)
+    try:
+        futures = [batcher.submit(item) for item in range(7)]
+        assert [future.result(timeout=5) for future in futures] == [item * 2 for item in range(7)]
+    finally:
+        batcher.close()
+    assert [len(batch) for batch in recorder.batches] == [3, 3, 1]
+    assert batcher.stats()["items"] == 7
+
+
+def test_call_returns_its_own_result_across_threads():
+    batcher = MicroBatcher(Recorder(), max_batch_size=4, max_wait=0.01)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(batcher.call, range(32))) == [item * 2 for item in range(32)]
+    finally:
+        batcher.close()
+
+
+def test_failed_batch_reaches_every_caller():
+    def fail(items):
+        raise RuntimeError("backend down")
+
+    batcher = MicroBatcher(fail, max_batch_size=4, max_wait=0.5)
+    try:
+        futures = [batcher.submit(item) for item in range(2)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="backend down"):
+                future.result(timeout=5)
+        # The slot is released, so later batches still run
+        with pytest.raises(RuntimeError):
+            batcher.call(3)
+    finally:
+        batcher.close()
+
+
+def test_requests_accumulate_while_a_batch_is_processed():
+    started, release = Event(), Event()
+    recorder = Recorder()
+
+    def slow(items):
+        started.set()
+        release.wait(timeout=5)
+        return recorder(items)
+
+    batcher = MicroBatcher(slow, max_batch_size=8, max_wait=0.0)
+    try:
+        first = batcher.submit(0)
+        assert started.wait(timeout=5)
+        rest = [batcher.submit(item) for item in range(1, 5)]
+        release.set()
+        assert first.result(timeout=5) == 0
+        assert [future.result(timeout=5) for future in rest] == [2, 4, 6, 8]
+    finally:
+        batcher.close()
+    assert recorder.batches == [[0], [1, 2, 3, 4]]
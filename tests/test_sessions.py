@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from time import time
+from types import SimpleNamespace
+
+import pytest
+
+from aviso_vc import sessions as sessions_module
+from aviso_vc.sessions import SessionManager
+from aviso_vc.store import InMemorySessionStore, SessionSnapshot
+
+
+class FakeSession:
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.buffer = SimpleNamespace(nbytes=0)
+        self.state = "listening"
+        self.version = 0
+
+    def snapshot(self, full: bool = False) -> SessionSnapshot:
+        self.version += 1
+        # Every snapshot after the first is incremental unless ``full``
+        offset = 0 if full or self.version == 1 else self.version
+        return SessionSnapshot(self.session_id, self.state, buffer_offset=offset, version=self.version)
+
+    def restore(self, snapshot: SessionSnapshot, force: bool = False) -> None:
+        if snapshot.version > self.version or (force and snapshot.version == self.version):
+            self.state, self.version = snapshot.state, snapshot.version
+
+
+class SharedStore(InMemorySessionStore):
+    """Counts full loads, standing in for a store that other workers write to."""
+
+    shared = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    def load(self, session_id: str):
+        self.loads += 1
+        return super().load(session_id)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(sessions_module, "monotonic", lambda: now.value)
+    return now
+
+
+def test_least_recently_used_session_is_evicted_beyond_max_sessions():
+    manager = SessionManager(FakeSession, max_sessions=2)
+    manager.get_or_create("a")
+    manager.get_or_create("b")
+    manager.get("a")
+    manager.get_or_create("c")
+
+    assert sorted(manager.ids()) == ["a", "c"]
+    assert manager.evictions["max_sessions"] == 1
+
+
+def test_sweep_drops_idle_sessions(clock):
+    manager = SessionManager(FakeSession, idle_ttl=60.0)
+    manager.get_or_create("old")
+    clock.value += 45.0
+    manager.get_or_create("new")
+    clock.value += 30.0
+
+    assert manager.sweep() == 1
+    assert manager.ids() == ["new"]
+    assert manager.evictions["idle"] == 1
+
+
+def test_growing_sessions_are_trimmed_to_the_byte_budget():
+    manager = SessionManager(FakeSession, max_buffered_bytes=100)
+    manager.get_or_create("a").buffer.nbytes = 60
+    busy = manager.get_or_create("b")
+    assert manager.trim() == 0
+
+    busy.buffer.nbytes = 60
+    assert manager.trim() == 1
+    assert manager.ids() == ["b"]
+    assert manager.evictions["max_buffered_bytes"] == 1
+
+    # The session being served is kept even when it alone exceeds the budget
+    busy.buffer.nbytes = 200
+    assert manager.trim() == 0
+    assert manager.ids() == ["b"]
+
+
+def test_evicted_sessions_resume_from_the_store():
+    manager = SessionManager(FakeSession, max_sessions=1, store=InMemorySessionStore())
+    session = manager.get_or_create("a")
+    session.state = "recording"
+    manager.save(session)
+    manager.get_or_create("b")
+
+    resumed = manager.get("a")
+    assert resumed is not session
+    assert resumed.state == "recording"
+
+
+def test_sessions_purged_from_the_store_are_saved_in_full():
+    store = InMemorySessionStore()
+    manager = SessionManager(FakeSession, store=store)
+    session = manager.get_or_create("a")
+    manager.save(session)
+    store.purge(older_than=time() + 1)
+
+    session.state = "recording"
+    assert manager.save(session)
+    assert store.load("a").state == "recording"
+
+
+def test_shared_sessions_are_reloaded_only_when_another_worker_saved():
+    store = SharedStore()
+    manager = SessionManager(FakeSession, store=store, affinity=False)
+    session = manager.get_or_create("a")
+    manager.save(session)
+    store.loads = 0
+
+    assert manager.get("a") is session
+    assert store.loads == 0
+
+    store.save(SessionSnapshot("a", "recording", version=session.version + 1))
+    assert manager.get("a").state == "recording"
+    assert store.loads == 1
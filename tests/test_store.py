@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aviso_vc.store import InMemorySessionStore, SessionSnapshot, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path: Path):
+    store = InMemorySessionStore() if request.param == "memory" else SQLiteSessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def samples(*values: float) -> bytes:
+    return np.array(values, dtype=np.float32).tobytes()
+
+
+def test_older_versions_do_not_overwrite_newer_ones(store):
+    assert store.save(SessionSnapshot("a", "recording", version=2))
+    assert not store.save(SessionSnapshot("a", "listening", version=2))
+    assert not store.save(SessionSnapshot("a", "listening", version=1))
+    assert store.load("a").state == "recording"
+    assert store.save(SessionSnapshot("a", "listening", version=3))
+    assert store.load("a").state == "listening"
+
+
+def test_incremental_snapshots_are_reassembled(store):
+    transcripts = [{"number": 1, "text": "hi"}]
+    store.save(SessionSnapshot("a", "recording", transcripts=transcripts, buffer=samples(1, 2), version=1))
+    store.save(SessionSnapshot("a", "recording", transcripts=None, buffer=samples(3), buffer_offset=2, version=2))
+
+    loaded = store.load("a")
+    np.testing.assert_array_equal(np.frombuffer(loaded.buffer, dtype=np.float32), [1, 2, 3])
+    assert loaded.transcripts == transcripts
+    assert loaded.version == 2
+
+    # Offset 0 starts the buffer over
+    store.save(SessionSnapshot("a", "recording", transcripts=None, buffer=samples(9), version=3))
+    assert np.frombuffer(store.load("a").buffer, dtype=np.float32).tolist() == [9]
+
+
+def test_rejected_saves_leave_the_buffer_alone(store):
+    store.save(SessionSnapshot("a", "recording", buffer=samples(1), version=2))
+    assert not store.save(SessionSnapshot("a", "recording", buffer=samples(5), buffer_offset=1, version=2))
+    assert np.frombuffer(store.load("a").buffer, dtype=np.float32).tolist() == [1]
+
+
+def test_incremental_saves_need_a_stored_snapshot(store):
+    assert not store.save(SessionSnapshot("a", "recording", buffer=samples(5), buffer_offset=3, version=1))
+    assert store.load("a") is None
+    assert store.version("a") is None
+
+
+def test_purge_removes_idle_snapshots(store):
+    store.save(SessionSnapshot("old", "listening", buffer=samples(1), updated_at=10.0, version=1))
+    store.save(SessionSnapshot("new", "listening", updated_at=30.0, version=1))
+    assert store.purge(older_than=20.0) == 1
+    assert store.load("old") is None
+    assert store.load("new") is not None
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import List
+
+import numpy as np
+import pytest
+
+from aviso_vc.transcription import WhisperTranscriber
+
+
+class FakeUploads:
+    """Stands in for the Groq API: answers each upload with the next canned response."""
+
+    def __init__(self, *responses) -> None:
+        self.responses = list(responses)
+        self.uploads: List[str] = []
+
+    def __call__(self, filename: str, data: bytes):
+        self.uploads.append(filename)
+        return self.responses.pop(0)
+
+
+def segment(start: float, end: float, text: str) -> dict:
+    return {"start": start, "end": end, "text": text}
+
+
+@pytest.fixture
+def transcriber():
+    transcriber = WhisperTranscriber("key", batch_max_duration=10.0, batch_gap=1.0)
+    yield transcriber
+    transcriber.close()
+
+
+def seconds(duration: float) -> np.ndarray:
+    return np.zeros(int(duration * 16000), dtype=np.float32)
+
+
+def test_packed_upload_is_split_by_segment_timings(transcriber):
+    # Segments of 2 s and 3 s are packed as [0, 2] and [3, 6] around a 1 s gap
+    transcriber._create = FakeUploads(
+        SimpleNamespace(segments=[segment(0.1, 1.9, " one "), segment(3.2, 4.0, "two"), segment(4.0, 5.8, "three")])
+    )
+    assert transcriber._request_packed([seconds(2), seconds(3)], 16000) == ["one", "two three"]
+    assert len(transcriber._create.uploads) == 1
+
+
+def test_text_inside_a_gap_goes_to_the_nearest_segment(transcriber):
+    transcriber._create = FakeUploads(SimpleNamespace(segments=[segment(2.05, 2.3, "late"), segment(3.5, 4.0, "next")]))
+    assert transcriber._request_packed([seconds(2), seconds(3)], 16000) == ["late", "next"]
+
+
+def test_upload_without_timings_falls_back_to_one_request_each(transcriber):
+    transcriber._create = FakeUploads(
+        SimpleNamespace(segments=None), SimpleNamespace(text=" one "), SimpleNamespace(text="two")
+    )
+    assert transcriber._request_packed([seconds(2), seconds(3)], 16000) == ["one", "two"]
+    assert len(transcriber._create.uploads) == 3
+
+
+def test_segments_are_packed_up_to_the_longest_upload(transcriber):
+    packs = []
+    transcriber._request_packed = lambda waveforms, rate: packs.append(len(waveforms)) or ["x"] * len(waveforms)
+    # 4 + 1 + 4 fits in 10 s, adding the last one would not
+    texts = transcriber._transcribe_many([seconds(4), seconds(4), seconds(4)], 16000)
+    assert packs == [2, 1]
+    assert texts == ["x", "x", "x"]
+
+
+def test_close_releases_the_connection_pool():
+    transcriber = WhisperTranscriber("key")
+    transcriber.close()
+    assert transcriber.client._client.is_closed